@@ -1,21 +1,40 @@
-import { NextResponse } from 'next/server'
+import { NextRequest, NextResponse } from 'next/server'
 
-export async function GET() {
+export async function GET(request: NextRequest) {
   try {
-    // Forward request to Flask backend
+    // Forward request to Flask backend; If-None-Match lets it answer 304 when nothing changed
+    const headers: Record<string, string> = { 'Content-Type': 'application/json',  'Cache-Control': 'no-cache' }
+    const ifNoneMatch = request.headers.get('If-None-Match')
+    if (ifNoneMatch) {
+      headers['If-None-Match'] = ifNoneMatch
+    }
+    // The backend scopes every query to this tenant (its default when absent)
+    const tenant = request.headers.get('X-Tenant-ID')
+    if (tenant) {
+      headers['X-Tenant-ID'] = tenant
+    }
     const flaskResponse = await fetch('http://localhost:5000/api/dashboard', {
       method: 'GET',
-      headers: { 'Content-Type': 'application/json',  'Cache-Control': 'no-cache' },
+      headers,
       cache: 'no-store'
     })
     
+    if (flaskResponse.status === 304) {
+      return new NextResponse(null, { status: 304, headers: { ETag: flaskResponse.headers.get('ETag') || '' } })
+    }
+    
     if (!flaskResponse.ok) {
       console.error('Flask dashboard error:', flaskResponse.status)
       throw new Error('Flask backend error')
     }
     
     const data = await flaskResponse.json()
-    return NextResponse.json(data)
+    const response = NextResponse.json(data)
+    const etag = flaskResponse.headers.get('ETag')
+    if (etag) {
+      response.headers.set('ETag', etag)
+    }
+    return response
   } catch (error) {
     return NextResponse.json(
       { error: 'Failed to fetch dashboard data' },
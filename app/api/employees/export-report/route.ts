@@ -1,6 +1,7 @@
 export const runtime = 'nodejs'
 
 import { NextResponse } from 'next/server'
+import { fetchAllEmployees } from '../../../../lib/employees'
 
 export async function POST(req: Request) {
   try {
@@ -10,9 +11,8 @@ export async function POST(req: Request) {
     const dashRes = await fetch('http://localhost:3000/api/dashboard', { cache: 'no-store' })
     const dashboardData = await dashRes.json()
 
-    // Fetch filtered employees
-    const empRes = await fetch('http://localhost:3000/api/employees', { cache: 'no-store' })
-    const employees = await empRes.json()
+    // Fetch every employee (the list endpoint is paginated), then filter
+    const employees = await fetchAllEmployees('http://localhost:3000')
 
     const filteredEmployees = riskFilter
       ? employees.filter((e: any) => e.latest_risk_label === riskFilter)
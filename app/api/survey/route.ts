@@ -5,10 +5,15 @@ export async function POST(request: Request) {
   try {
     const data = await request.json()
     
-    // Forward to Flask backend
+    // Forward to Flask backend, in the caller's tenant
+    const headers: Record<string, string> = { 'Content-Type': 'application/json' }
+    const tenant = request.headers.get('X-Tenant-ID')
+    if (tenant) {
+      headers['X-Tenant-ID'] = tenant
+    }
     const flaskResponse = await fetch('http://localhost:5000/api/survey', {
       method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
+      headers,
       body: JSON.stringify(data)
     })
     
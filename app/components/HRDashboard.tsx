@@ -3,6 +3,7 @@
 import { useState, useEffect } from 'react'
 import NotificationToast, { Toast } from './NotificationToast'
 import ConfirmModal from './ConfirmModal'
+import { fetchAllEmployees } from '../../lib/employees'
 
 interface DashboardData {
   summary: {
@@ -63,9 +64,7 @@ export default function HRDashboard() {
 
   const fetchEmployees = async () => {
     try {
-      const res = await fetch('/api/employees')
-      const data = await res.json()
-      setEmployees(data)
+      setEmployees(await fetchAllEmployees<Employee>())
     } catch (error) {
       console.error('Error fetching employees:', error)
     } finally {
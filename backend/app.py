@@ -1,225 +1,719 @@
 # app.py
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Response, current_app, g, request, jsonify, stream_with_context
 from flask_cors import CORS
-from database import db, BurnoutResult, Employee
-from services.watsonx_service import analyze_text_responses
-from services.hedera_service import store_hash_on_hedera
-from services.orchestrate_service import trigger_workflow
-from datetime import datetime
+import click
+from sqlalchemy.engine import make_url
+from database import (
+    db, BurnoutResult, Employee, DepartmentRiskAggregate, DepartmentRiskRollup, EmployeeRiskState,
+    DEFAULT_TENANT, TENANTS, current_tenant, each_tenant, ensure_schema, init_database, tenant_context
+)
+from services.watsonx_service import analyze_text_responses, get_watsonx_client
+from services.hedera_service import store_hash_on_hedera, get_client_pool, hash_record
+from services.merkle import verify_proof
+from services.anchor_queue import AnchorQueue
+from services.cache import TTLCache
+from services.http_cache import ResponseCache, bump_data_version, current_data_version
+from services.dashboard_service import build_dashboard
+from services.aggregate_service import record_new_employee, record_result, reconcile_aggregates
+from services.employee_service import (
+    list_employees_page, backfill_latest_results, iter_history, history_rollup,
+    parse_history_cursor, parse_timestamp, HISTORY_BUCKETS
+)
+from services.streaming import json_stream
+from services.trend_service import GRANULARITIES, backfill_rollups, department_trends, record_rollup
+from services.escalation_service import list_alerts, rebuild_states, record_escalation
+from services.export_service import EXPORT_FORMATS, ResultExport
+from services.survey_service import parse_survey, SurveyValidationError, rescore_results
+from services.bulk_ingest import BulkIngestor, iter_csv, iter_ndjson
+from services.scoring import SURVEY_MODEL, get_model
+from services.workflow_dispatcher import WorkflowDispatcher
+from services.verification_service import AnchorVerifier
+from services.scheduler import Scheduler
+from services.maintenance_jobs import reconcile_aggregates_job, requeue_simulated_anchors, sweep_pending_workflows
+from services.log import SAMPLED, configure_logging
+from services.metrics import init_metrics, registry
+from services.tenancy import TENANT_ISOLATION, init_tenancy, tenant_command
+from datetime import datetime, timedelta
+import atexit
+import io
+import json
+import logging
 import os
 
-app = Flask(__name__)
-CORS(app, origins=["http://localhost:3000"], supports_credentials=True)
+configure_logging()
+logger = logging.getLogger('wellmind')
 
-# Database config
-# Use absolute path for SQLite database
-db_path = 'sqlite:///' + os.path.join(os.path.dirname(__file__), 'instance', 'wellmind.db')
-app.config['SQLALCHEMY_DATABASE_URI'] = db_path
-print(f"📁 [DATABASE] Using: {db_path}")
-print(f"[DATABASE] Connecting to: {db_path}")
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
+# Routes and CLI commands live on one blueprint; create_app() wires it to an app
+api = Blueprint('api', __name__, cli_group=None)
 
-with app.app_context():
-    db.create_all()
-    print(f"[DATABASE] Tables created. Employee count: {Employee.query.count()}, Results count: {BurnoutResult.query.count()}")
+# Hedera anchoring runs on background workers fed by the anchor_outbox table
+anchor_queue = AnchorQueue()
 
-@app.route('/api/health', methods=['GET'])
+# Anchored hashes are checked against the mirror node and re-checked in the background
+anchor_verifier = AnchorVerifier()
+
+# HR workflow alerts are batched and sent to Orchestrate by a background dispatcher
+workflow_dispatcher = WorkflowDispatcher()
+
+# Periodic maintenance; each job runs in one worker at a time (run lock in scheduled_job)
+scheduler = Scheduler()
+scheduler.register('reanchor-simulated', lambda: requeue_simulated_anchors(anchor_queue),
+                   interval=float(os.getenv('JOB_REANCHOR_INTERVAL', 900)))
+scheduler.register('sweep-pending-workflows', lambda: sweep_pending_workflows(workflow_dispatcher),
+                   interval=float(os.getenv('JOB_WORKFLOW_SWEEP_INTERVAL', 600)))
+scheduler.register('reconcile-aggregates', reconcile_aggregates_job,
+                   interval=float(os.getenv('JOB_RECONCILE_INTERVAL', 86400)))
+
+# Dashboard aggregates are cached briefly per tenant and data version, so any committed write
+# (surveys, anchoring, verification, workflow status) in any worker starts a new entry
+dashboard_cache = TTLCache(ttl=float(os.getenv('DASHBOARD_CACHE_TTL', 10)))
+
+# Read endpoints answer If-None-Match with 304 until the next write bumps the data version;
+# serialized bodies are replayed from a size-bounded LRU (RESPONSE_CACHE_ENTRIES=0 keeps only ETags)
+response_cache = ResponseCache(
+    max_entries=int(os.getenv('RESPONSE_CACHE_ENTRIES', 256)),
+    max_bytes=int(float(os.getenv('RESPONSE_CACHE_MAX_MB', 32)) * 1024 * 1024)
+)
+
+EMPLOYEES_PAGE_SIZE = int(os.getenv('EMPLOYEES_PAGE_SIZE', 500))
+EMPLOYEES_MAX_PAGE_SIZE = 1000
+HISTORY_MAX_PAGE_SIZE = 5000
+BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', 1000))
+ALERTS_MAX_PAGE_SIZE = 1000
+VERIFY_MAX_IDS = int(os.getenv('VERIFY_MAX_IDS', 10000))
+# Escalation alerts start an Orchestrate workflow even below ORCHESTRATE_MIN_RISK
+ALERT_DISPATCH = os.getenv('ALERT_DISPATCH', '1') == '1'
+PREDICT_BATCH_LIMIT = int(os.getenv('PREDICT_BATCH_LIMIT', 100000))
+
+
+def create_app(start_background=True):
+    """
+    Build the Flask app: database engine, metrics, routes and background
+    services. Nothing touches the database here; run prepare_database()
+    (flask init-db, or the gunicorn on_starting hook) once per deployment.
+
+    Args:
+        start_background (bool): start the anchoring, verification and
+            workflow threads (off for CLI commands and the gunicorn master)
+    """
+    app = Flask(__name__)
+    CORS(app, origins=["http://localhost:3000"], supports_credentials=True, expose_headers=["X-Next-Cursor", "ETag", "X-Export-Watermark"])
+
+    # DATABASE_URL selects the backend (e.g. postgresql://...); defaults to instance/wellmind.db
+    db_path = init_database(app)
+    logger.info("Using database %s", make_url(db_path).render_as_string(hide_password=True))
+
+    with app.app_context():
+        # Route latency, per-request SQL counts and external call metrics on /metrics
+        init_metrics(app, db.engine)
+
+    # X-Tenant-ID picks the tenant; TENANT_ISOLATION=database also gives each tenant its own database
+    init_tenancy(app)
+    logger.info("Serving %d tenant(s) with %s isolation", len(TENANTS), TENANT_ISOLATION)
+
+    app.register_blueprint(api)
+    anchor_queue.init_app(app, start=start_background)
+    anchor_verifier.init_app(app, start=start_background)
+    workflow_dispatcher.init_app(app, start=start_background)
+    scheduler.init_app(app, start=start_background)
+    return app
+
+
+def prepare_database():
+    """
+    Create / upgrade the schema and build derived tables that are still
+    empty, for every tenant. Must run inside an app context, before
+    workers start serving.
+    """
+    for tenant in each_tenant():
+        _prepare_tenant(tenant)
+        # A fresh session per tenant: ids repeat across tenant databases
+        db.session.remove()
+
+
+def _prepare_tenant(tenant):
+    ensure_schema()
+    logger.info("Tenant %s tables ready. Employee count: %d, Results count: %d",
+                tenant, Employee.query.count(), BurnoutResult.query.count())
+    
+    # Databases created before the aggregate table existed need one full build
+    if DepartmentRiskAggregate.query.first() is None and Employee.query.first() is not None:
+        reconcile_aggregates(apply=True)
+        logger.info("Built department risk aggregates from existing results")
+    
+    if DepartmentRiskRollup.query.first() is None and BurnoutResult.query.first() is not None:
+        summary = backfill_rollups()
+        logger.info("Built %d trend rollup buckets from %d existing results", summary['buckets'], summary['results'])
+    
+    if EmployeeRiskState.query.first() is None and BurnoutResult.query.first() is not None:
+        summary = rebuild_states()
+        logger.info("Built risk state for %d employees from %d existing results", summary['employees'], summary['results'])
+    
+    backfilled = backfill_latest_results()
+    if backfilled:
+        logger.info("Set latest_result_id for %d employees", backfilled)
+
+
+def shutdown_app(app, timeout=None):
+    """
+    Stop background work gracefully: let a running maintenance job finish,
+    finish in-flight and due anchoring (the outbox keeps anything left for
+    the next start), send queued workflow alerts and stop the verification
+    sweep.
+    """
+    timeout = timeout if timeout is not None else float(os.getenv('SHUTDOWN_TIMEOUT', 20))
+    extensions = app.extensions
+    if 'scheduler' in extensions:
+        extensions['scheduler'].stop(timeout)
+    if 'anchor_verifier' in extensions:
+        extensions['anchor_verifier'].stop(timeout)
+    if 'anchor_queue' in extensions:
+        extensions['anchor_queue'].stop(timeout, drain=True)
+    if 'workflow_dispatcher' in extensions:
+        extensions['workflow_dispatcher'].stop(timeout)
+    if 'tenant_router' in extensions:
+        extensions['tenant_router'].dispose()
+    with app.app_context():
+        db.engine.dispose()
+    logger.info("Background services stopped")
+
+
+def _service_gauges():
+    """Background service counters exposed on /metrics"""
+    for tenant in each_tenant():
+        with current_app.app_context():
+            for status, count in anchor_queue.stats().items():
+                yield ('wellmind_anchor_outbox_rows', 'Anchor outbox rows by tenant and status',
+                       {'tenant': tenant, 'status': status}, count)
+    for stat, value in get_client_pool().stats().items():
+        yield 'wellmind_hedera_client_pool', 'Hedera client pool counters', {'stat': stat}, value
+    for stat, value in workflow_dispatcher.stats().items():
+        yield 'wellmind_workflow_dispatcher', 'Orchestrate dispatcher counters', {'stat': stat}, value
+    for stat, value in scheduler.stats().items():
+        yield 'wellmind_scheduler', 'Maintenance job runs in this process', {'stat': stat}, value
+    for stat, value in anchor_verifier.stats().items():
+        yield 'wellmind_anchor_verifier', 'Anchor verification counters', {'stat': stat}, value
+    for stat, value in response_cache.stats().items():
+        yield 'wellmind_response_cache', 'Conditional GET / response cache counters', {'stat': stat}, value
+    for stat, value in get_watsonx_client().stats().items():
+        yield 'wellmind_watsonx_client', 'watsonx.ai client counters', {'stat': stat}, value
+
+
+registry.register_gauges(_service_gauges)
+
+@api.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint"""
     return jsonify({'status': 'ok', 'service': 'VorteX WellMind Backend'})
 
-@app.route('/api/predict', methods=['POST'])
+@api.route('/api/anchor/status', methods=['GET'])
+def anchor_status():
+    """Hedera anchoring queue depth and client pool metrics"""
+    return jsonify({
+        'outbox': anchor_queue.stats(),
+        'client_pool': get_client_pool().stats()
+    })
+
+@api.route('/api/results/<int:result_id>/verify', methods=['GET'])
+def verify_result(result_id):
+    """
+    Recompute a result's audit hash, check it against its Merkle inclusion
+    proof and against the anchored message on the mirror node (?refresh=1
+    re-reads the mirror node instead of the cached anchored hash).
+    """
+    result = BurnoutResult.query.get_or_404(result_id)
+    anchor = anchor_verifier.verify_ids([result.id], refresh=request.args.get('refresh') == '1')[result.id]
+    # The hash in the version the anchor was checked with (legacy anchors use the original hash)
+    record_hash = anchor['record_hash'] or hash_record(result.to_dict())
+    
+    if not result.merkle_proof:
+        return jsonify({
+            'result_id': result.id,
+            'hedera_txid': result.hedera_txid,
+            'record_hash': record_hash,
+            'mode': 'single',
+            'verified': anchor['verified'],
+            'anchor': anchor
+        })
+    
+    proof = json.loads(result.merkle_proof)
+    return jsonify({
+        'result_id': result.id,
+        'hedera_txid': result.hedera_txid,
+        'record_hash': record_hash,
+        'mode': 'merkle',
+        'merkle_root': proof.get('root'),
+        'leaf_index': proof.get('leaf_index'),
+        'leaf_count': proof.get('leaf_count'),
+        'proof_valid': verify_proof(record_hash, proof.get('path', []), proof.get('root')),
+        'verified': anchor['verified'],
+        'anchor': anchor
+    })
+
+@api.route('/api/verify/batch', methods=['POST'])
+def verify_batch():
+    """
+    Bulk anchor verification for auditors.
+    
+    Body: { "result_ids": [1, 2, ...], "refresh": false }
+    """
+    data = request.get_json(silent=True) or {}
+    result_ids = data.get('result_ids')
+    if not isinstance(result_ids, list) or not result_ids:
+        return jsonify({'error': 'result_ids must be a non-empty list'}), 400
+    if len(result_ids) > VERIFY_MAX_IDS:
+        return jsonify({'error': f'At most {VERIFY_MAX_IDS} result_ids per request'}), 400
+    try:
+        result_ids = [int(i) for i in result_ids]
+    except (TypeError, ValueError):
+        return jsonify({'error': 'result_ids must be integers'}), 400
+    
+    verified = anchor_verifier.verify_ids(result_ids, refresh=bool(data.get('refresh')))
+    summary = {}
+    for item in verified.values():
+        summary[item['status']] = summary.get(item['status'], 0) + 1
+    return jsonify({
+        'summary': summary,
+        'missing': [i for i in result_ids if i not in verified],
+        'results': list(verified.values())
+    })
+
+@api.route('/api/workflows/status', methods=['GET'])
+def workflow_status():
+    """Orchestrate dispatcher queue and delivery counters"""
+    return jsonify(workflow_dispatcher.stats())
+
+@api.route('/api/jobs', methods=['GET'])
+def jobs_status():
+    """Maintenance job schedule, lock holders and recent runs"""
+    return jsonify(scheduler.status())
+
+@api.route('/api/predict', methods=['POST'])
 def predict():
     """Predict burnout risk based on form data"""
     data = request.json or {}
-    hours = int(data.get('work_hours') or 40)
-    stress = int(data.get('stress') or 5)
-    score = round((hours / 40) * 50 + (stress / 10) * 50)
-    risk = 'High' if score >= 70 else 'Medium' if score >= 40 else 'Low'
-    return jsonify({'risk': risk, 'score': score})
+    result = SURVEY_MODEL.score(data)
+    return jsonify({'risk': result['label'], 'score': result['risk']})
 
-@app.route('/api/survey', methods=['POST'])
+@api.route('/api/predict/batch', methods=['POST'])
+def predict_batch():
+    """
+    Score many records in one vectorized call.
+    
+    Body: {"records": [{...}, ...]} or {"columns": {"work_hours": [...], "stress": [...]}},
+    optionally with "model" ('survey' | 'weighted'), "weights" and "thresholds" overrides.
+    """
+    data = request.json or {}
+    try:
+        model = get_model(data.get('model'), data.get('weights'), data.get('thresholds'))
+        if 'columns' in data:
+            columns = data['columns']
+            length = len(next(iter(columns.values()), []))
+            if length > PREDICT_BATCH_LIMIT:
+                raise ValueError(f'At most {PREDICT_BATCH_LIMIT} records per batch')
+            features = model.columns_from_lists(columns, length)
+        else:
+            records = data.get('records')
+            if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+                raise ValueError('records must be a list of objects')
+            if len(records) > PREDICT_BATCH_LIMIT:
+                raise ValueError(f'At most {PREDICT_BATCH_LIMIT} records per batch')
+            features = model.columns_from_records(records)
+    except (ValueError, TypeError, AttributeError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    scores, labels = model.score_columns(features)
+    return jsonify({
+        'model': model.name,
+        'count': len(scores),
+        'scores': scores.tolist(),
+        'labels': labels.tolist()
+    })
+
+@api.route('/api/survey', methods=['POST'])
 def submit_survey():
     """Accept employee burnout survey data and store in database"""
     try:
         data = request.json
         
-        if not data:
-            return jsonify({'error': 'No data provided'}), 400
-        
-        # Validate required fields
-        required_fields = ['name', 'email', 'department']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({'error': f'Missing required field: {field}'}), 400
+        # Validate required fields and score the survey
+        try:
+            survey = parse_survey(data)
+        except SurveyValidationError as e:
+            return jsonify({'error': str(e)}), 400
         
         # Find or create employee
-        employee = Employee.query.filter_by(email=data.get('email')).first()
+        employee = Employee.query.filter_by(email=survey['email']).first()
         if not employee:
             employee = Employee(
-                name=data.get('name'),
-                department=data.get('department', 'General'),
-                email=data.get('email')
+                name=survey['name'],
+                department=survey['department'],
+                email=survey['email']
             )
             db.session.add(employee)
             db.session.flush()  # Flush to get the ID without committing
+            record_new_employee(employee)
         
-        # Calculate burnout risk with safe conversion
-        try:
-            hours = int(data.get('work_hours') or 40)
-        except (ValueError, TypeError):
-            hours = 40
-        
-        try:
-            stress = int(data.get('stress') or 5)
-        except (ValueError, TypeError):
-            stress = 5
-        
-        score = round((hours / 40) * 50 + (stress / 10) * 50)
-        risk = 'High' if score >= 70 else 'Medium' if score >= 40 else 'Low'
+        score = survey['risk_score']
+        risk = survey['label']
         
         # Create burnout result
         burnout_result = BurnoutResult(
             employee_id=employee.id,
             risk_score=score,
             label=risk,
-            work_hours=hours,
-            stress_level=stress,
-            orchestrate_status='pending',
+            work_hours=survey['work_hours'],
+            stress_level=survey['stress_level'],
+            orchestrate_status='pending' if workflow_dispatcher.should_dispatch(score, risk) else 'not_required',
             watson_timestamp=datetime.utcnow()
         )
         db.session.add(burnout_result)
+        db.session.flush()
+        record_result(employee.department, burnout_result)
+        record_rollup(employee.department, burnout_result)
+        alert = record_escalation(employee.id, burnout_result)
+        if alert and ALERT_DISPATCH:
+            burnout_result.orchestrate_status = 'pending'
+        if burnout_result.orchestrate_status == 'pending':
+            burnout_result.orchestrate_requested_at = burnout_result.watson_timestamp
+        employee.latest_result_id = burnout_result.id
+        
+        # Queue Hedera anchoring in the same transaction; workers pick it up after commit
+        anchor_queue.enqueue(burnout_result)
+        bump_data_version()
         db.session.commit()
         
-        print(f"✓ Survey saved: Employee {employee.id}, Result {burnout_result.id}")
+        logger.debug("Survey saved: employee %s, result %s", employee.id, burnout_result.id, extra=SAMPLED)
     except Exception as e:
         db.session.rollback()
-        print(f"✗ Survey submission error: {str(e)}")
+        logger.exception("Survey submission error: %s", e)
         return jsonify({'error': f'Database error: {str(e)}'}), 500
     
-    # Store hash on Hedera
-    try:
-        tx_id = store_hash_on_hedera(burnout_result.to_dict())
-        burnout_result.hedera_txid = tx_id
-        db.session.commit()
-    except Exception as e:
-        print(f"Hedera error: {e}")
-        burnout_result.hedera_txid = 'SIMULATED_TX'
-        db.session.commit()
+    anchor_queue.notify()
+    if burnout_result.orchestrate_status == 'pending':
+        workflow_dispatcher.submit({
+            'id': burnout_result.id,
+            'employee_id': employee.id,
+            'employee_name': employee.name,
+            'risk_score': score,
+            'label': risk,
+            'timestamp': burnout_result.watson_timestamp.isoformat()
+        })
     
     return jsonify({
         'employee_id': employee.id,
         'result_id': burnout_result.id,
         'risk': risk,
         'score': score,
+        'anchor_status': 'pending',
+        'escalation': alert.reason if alert else None,
         'message': 'Survey submitted successfully'
     })
 
-@app.route('/api/dashboard', methods=['GET'])
+@api.route('/api/survey/bulk', methods=['POST'])
+def bulk_submit_surveys():
+    """
+    Import many surveys from a streamed NDJSON (default) or CSV body.
+    
+    Send Content-Type text/csv or ?format=csv for CSV with a header row.
+    Rows use the same fields as /api/survey plus an optional ISO
+    'timestamp'; invalid rows are reported in the summary, not fatal.
+    """
+    fmt = request.args.get('format') or ('csv' if request.mimetype == 'text/csv' else 'ndjson')
+    stream = io.TextIOWrapper(request.stream, encoding='utf-8', newline='' if fmt == 'csv' else None)
+    records = iter_csv(stream) if fmt == 'csv' else iter_ndjson(stream)
+    
+    ingestor = BulkIngestor(anchor_queue=anchor_queue, chunk_size=BULK_CHUNK_SIZE,
+                            dispatcher=workflow_dispatcher, alert_dispatch=ALERT_DISPATCH)
+    summary = ingestor.ingest(records)
+    
+    logger.info("Bulk import: %d inserted, %d failed in %ss", summary['inserted'], summary['failed'], summary['elapsed_seconds'])
+    return jsonify(summary)
+
+@api.route('/api/dashboard', methods=['GET'])
+@response_cache.conditional
 def dashboard():
     """Provide risk and blockchain data for HR dashboard"""
-    # DEBUG: Show database info
-    db_uri = app.config['SQLALCHEMY_DATABASE_URI']
-    print(f"🔍 [DATABASE DEBUG] Using database: {db_uri}")
-    
-    # DEBUG: Show all employees and their departments
-    all_employees = Employee.query.all()
-    print(f"🔍 [DATABASE DEBUG] Total employees: {len(all_employees)}")
-    for emp in all_employees:
-        print(f"🔍 [DATABASE DEBUG] Employee: {emp.name}, Dept: {emp.department}, ID: {emp.id}")
-    
-    # DEBUG: Show all burnout results
-    all_results = BurnoutResult.query.all()
-    print(f"🔍 [DATABASE DEBUG] Total survey results: {len(all_results)}")
-    for result in all_results:
-        print(f"🔍 [DATABASE DEBUG] Result: ID {result.id}, Employee ID {result.employee_id}, Score: {result.risk_score}")
-
-    total_employees = Employee.query.count()
-    total_surveys = BurnoutResult.query.count()
-    
-    high_risk = BurnoutResult.query.filter(BurnoutResult.risk_score >= 70).count()
-    medium_risk = BurnoutResult.query.filter(BurnoutResult.risk_score >= 40, BurnoutResult.risk_score < 70).count()
-    low_risk = BurnoutResult.query.filter(BurnoutResult.risk_score < 40).count()
-    
-    avg_risk = db.session.query(db.func.avg(BurnoutResult.risk_score)).scalar() or 0
-    avg_hours = db.session.query(db.func.avg(BurnoutResult.work_hours)).scalar() or 0
-    avg_stress = db.session.query(db.func.avg(BurnoutResult.stress_level)).scalar() or 0
-    
-    # FIXED: Department breakdown - count employees per department directly
-    departments = db.session.query(
-        Employee.department,
-        db.func.count(Employee.id),  # Count all employees in department
-        db.func.avg(BurnoutResult.risk_score)
-    ).outerjoin(BurnoutResult, Employee.id == BurnoutResult.employee_id).group_by(Employee.department).all()
-    
-    department_data = [
-        {'department': dept, 'count': count, 'avg_risk': round(dept_avg_risk or 0, 1)}
-        for dept, count, dept_avg_risk in departments
-    ]
-    
-    # Recent submissions
-    recent_results = BurnoutResult.query.order_by(BurnoutResult.watson_timestamp.desc()).limit(10).all()
-    
-    # DEBUG: Check all employees
-    all_employees = Employee.query.all()
-    print(f"[DEBUG] Total employees in DB: {len(all_employees)}")
-    for emp in all_employees:
-        submissions = BurnoutResult.query.filter_by(employee_id=emp.id).count()
-        print(f"[DEBUG] Employee: {emp.name}, Dept: {emp.department}, Submissions: {submissions}")
+    return jsonify(dashboard_cache.get_or_set(_dashboard_key(), build_dashboard))
 
-    return jsonify({
-        'summary': {
-            'total_employees': total_employees,
-            'total_surveys': total_surveys,
-            'high_risk_count': high_risk,
-            'medium_risk_count': medium_risk,
-            'low_risk_count': low_risk,
-            'average_risk': round(avg_risk, 1),
-            'average_hours': round(avg_hours, 1),
-            'average_stress': round(avg_stress, 1)
-        },
-        'departments': department_data,
-        'recent_submissions': [r.to_dict() for r in recent_results]
-    })
+def _dashboard_key():
+    # Same version the ETag was built from: a cached body never outlives the data it shows
+    version = g.get('data_version')
+    if version is None:
+        version = current_data_version()
+    return f'dashboard:{current_tenant()}:{version}'
+
+@api.route('/api/trends', methods=['GET'])
+@response_cache.conditional
+def trends():
+    """
+    Risk trends per department and for the whole organisation, read from
+    the daily / weekly rollup buckets.
+    
+    Query params:
+        granularity: 'day' or 'week' (default 'week')
+        since, until: ISO dates (default: the last 12 weeks, until exclusive)
+        department: only this department
+    """
+    granularity = request.args.get('granularity', 'week')
+    if granularity not in GRANULARITIES:
+        return jsonify({'error': f"granularity must be one of: {', '.join(GRANULARITIES)}"}), 400
+    try:
+        until = parse_timestamp(request.args.get('until')) or datetime.utcnow() + timedelta(days=1)
+        since = parse_timestamp(request.args.get('since')) or until - timedelta(weeks=12)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    data = department_trends(granularity, since.date(), until.date(), request.args.get('department'))
+    return jsonify(dict(data, granularity=granularity, since=since.date().isoformat(), until=until.date().isoformat()))
 
-@app.route('/api/employees', methods=['GET'])
+@api.route('/api/alerts', methods=['GET'])
+@response_cache.conditional
+def alerts():
+    """
+    Risk escalation alerts, newest first.
+    
+    Query params: limit, cursor (from X-Next-Cursor), employee_id, department, since (ISO timestamp)
+    """
+    limit = min(max(request.args.get('limit', 100, type=int), 1), ALERTS_MAX_PAGE_SIZE)
+    try:
+        since = parse_timestamp(request.args.get('since'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    data, next_cursor = list_alerts(
+        limit,
+        cursor=request.args.get('cursor', type=int),
+        employee_id=request.args.get('employee_id', type=int),
+        department=request.args.get('department'),
+        since=since
+    )
+    response = jsonify(data)
+    if next_cursor is not None:
+        response.headers['X-Next-Cursor'] = str(next_cursor)
+    return response
+
+@api.route('/api/employees', methods=['GET'])
+@response_cache.conditional
 def list_employees():
-    """List all employees with their latest burnout status"""
-    employees = Employee.query.all()
-    print(f"[DEBUG] Employees endpoint: returning {len(employees)} employees")  # Debug line
-    data = []
-    for emp in employees:
-        latest = BurnoutResult.query.filter_by(employee_id=emp.id).order_by(BurnoutResult.watson_timestamp.desc()).first()
-        data.append({
-            'id': emp.id,
-            'name': emp.name,
-            'department': emp.department,
-            'email': emp.email,
-            'latest_risk_score': latest.risk_score if latest else None,
-            'latest_risk_label': latest.label if latest else 'No data',
-            'work_hours': latest.work_hours if latest else None,
-            'stress_level': latest.stress_level if latest else None,
-            'last_submission': latest.watson_timestamp.isoformat() if latest else None,
-            'hedera_verified': bool(latest.hedera_txid) if latest else False
-        })
-    return jsonify(data)
+    """
+    List employees with their latest burnout status, one page at a time.
+    
+    Query params: limit, cursor, department, risk. The body stays a JSON
+    array; the cursor for the next page is sent in X-Next-Cursor.
+    """
+    try:
+        limit = min(max(int(request.args.get('limit', EMPLOYEES_PAGE_SIZE)), 1), EMPLOYEES_MAX_PAGE_SIZE)
+        cursor = request.args.get('cursor', type=int)
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    
+    data, next_cursor = list_employees_page(
+        limit,
+        cursor=cursor,
+        department=request.args.get('department'),
+        risk=request.args.get('risk')
+    )
+    response = jsonify(data)
+    if next_cursor is not None:
+        response.headers['X-Next-Cursor'] = str(next_cursor)
+    return response
 
-@app.route('/api/employee/<int:employee_id>/history', methods=['GET'])
+@api.route('/api/employee/<int:employee_id>/history', methods=['GET'])
+@response_cache.conditional
 def employee_history(employee_id):
-    """Get submission history for a specific employee"""
+    """
+    Get submission history for a specific employee, streamed as chunked JSON.
+    
+    Query params:
+        since, until: ISO timestamps (since inclusive, until exclusive)
+        limit, cursor: keyset pages, newest first; the next cursor is returned in X-Next-Cursor
+        bucket: 'week' or 'month' returns per-period and rolling averages instead of submissions
+        window: number of periods in the rolling average (default 4)
+    """
     employee = Employee.query.get_or_404(employee_id)
-    submissions = BurnoutResult.query.filter_by(employee_id=employee_id).order_by(BurnoutResult.watson_timestamp.desc()).all()
+    try:
+        since = parse_timestamp(request.args.get('since'))
+        until = parse_timestamp(request.args.get('until'))
+        cursor = parse_history_cursor(request.args.get('cursor'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    return jsonify({
+    envelope = {
         'employee': {
             'id': employee.id,
             'name': employee.name,
             'department': employee.department,
             'email': employee.email
-        },
-        'submissions': [s.to_dict() for s in submissions]
-    })
+        }
+    }
+    
+    bucket = request.args.get('bucket')
+    if bucket:
+        if bucket not in HISTORY_BUCKETS:
+            return jsonify({'error': f"bucket must be one of: {', '.join(HISTORY_BUCKETS)}"}), 400
+        window = min(max(request.args.get('window', 4, type=int), 1), 104)
+        envelope.update(bucket=bucket, window=window)
+        periods = history_rollup(employee.id, bucket, window, since, until)
+        return Response(stream_with_context(json_stream(envelope, 'periods', periods)), mimetype='application/json')
+    
+    limit = request.args.get('limit', type=int)
+    if limit is not None:
+        limit = min(max(limit, 1), HISTORY_MAX_PAGE_SIZE)
+    submissions, next_cursor = iter_history(employee, since, until, cursor, limit)
+    
+    response = Response(stream_with_context(json_stream(envelope, 'submissions', submissions)), mimetype='application/json')
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return response
+
+@api.route('/api/export/results', methods=['GET'])
+def export_results():
+    """
+    Stream every burnout result with the employee's department for offline analytics.
+    
+    Query params:
+        format: 'csv' (default), 'parquet' or 'arrow' (Arrow IPC stream)
+        after_id: only results with a higher id; pass the previous export's X-Export-Watermark
+        since, until: ISO timestamps on watson_timestamp (since inclusive, until exclusive)
+    """
+    try:
+        export = ResultExport(
+            request.args.get('format', 'csv'),
+            after_id=request.args.get('after_id', 0, type=int),
+            since=parse_timestamp(request.args.get('since')),
+            until=parse_timestamp(request.args.get('until'))
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    response = Response(stream_with_context(export), mimetype=export.mimetype)
+    response.headers['X-Export-Watermark'] = str(export.watermark)
+    response.headers['Content-Disposition'] = f'attachment; filename="{export.filename}"'
+    return response
+
+def _data_changed():
+    """After a maintenance command rewrote served data: new ETags and dashboard cache keys everywhere"""
+    bump_data_version()
+    db.session.commit()
+
+@api.cli.command('reconcile-aggregates')
+@click.option('--dry-run', is_flag=True, help='Report drift without rewriting the table')
+@tenant_command
+def reconcile_aggregates_command(dry_run):
+    """Rebuild department risk aggregates from burnout_result and report drift"""
+    report = reconcile_aggregates(apply=not dry_run)
+    for item in report['drift']:
+        click.echo(f"{item['department']}.{item['field']}: stored={item['stored']} actual={item['actual']}")
+    status = 'rewritten' if report['applied'] else 'unchanged'
+    click.echo(f"{report['departments']} departments checked, {len(report['drift'])} drifted field(s), table {status}")
+    if report['applied']:
+        _data_changed()
+
+@api.cli.command('rescore-results')
+@click.option('--weights', help='JSON object of survey model weight overrides, e.g. {"stress": 60}')
+@click.option('--thresholds', help='JSON list of [score, label] pairs, highest first')
+@click.option('--dry-run', is_flag=True, help='Count changed rows without writing them')
+@tenant_command
+def rescore_results_command(weights, thresholds, dry_run):
+    """Re-score every stored result with the survey model, then rebuild aggregates"""
+    model = get_model(
+        SURVEY_MODEL.name,
+        json.loads(weights) if weights else None,
+        json.loads(thresholds) if thresholds else None
+    )
+    report = rescore_results(model, apply=not dry_run)
+    click.echo(f"{report['scanned']} results scanned, {report['changed']} changed in {report['elapsed_seconds']}s")
+    if report['changed'] and not dry_run:
+        reconcile_aggregates(apply=True)
+        backfill_rollups()
+        rebuild_states()
+        _data_changed()
+        click.echo("Department aggregates, trend rollups and risk state rebuilt")
+
+@api.cli.command('verify-anchors')
+@click.option('--refresh', is_flag=True, help='Re-read every anchored message from the mirror node')
+@tenant_command
+def verify_anchors_command(refresh):
+    """Verify every anchored result against the mirror node and cache the outcome"""
+    summary = anchor_verifier.verify_all(refresh=refresh)
+    elapsed = summary.pop('elapsed_seconds')
+    counts = ', '.join(f'{status}={count}' for status, count in sorted(summary.items()))
+    click.echo(f"{counts or 'no results'} in {elapsed}s")
+
+@api.cli.command('rebuild-risk-state')
+@tenant_command
+def rebuild_risk_state_command():
+    """Recompute per-employee EWMA / slope / last-label state from burnout_result"""
+    summary = rebuild_states()
+    click.echo(f"Risk state rebuilt for {summary['employees']} employees from {summary['results']} results "
+               f"({summary['escalations']} escalations seen)")
+
+@api.cli.command('backfill-trends')
+@tenant_command
+def backfill_trends_command():
+    """Rebuild the daily / weekly department trend rollups from burnout_result"""
+    summary = backfill_rollups()
+    _data_changed()
+    click.echo(f"{summary['buckets']} rollup buckets rebuilt from {summary['results']} results")
+
+@api.cli.command('export-results')
+@click.option('--format', 'fmt', type=click.Choice(list(EXPORT_FORMATS)), default='parquet', show_default=True)
+@click.option('--output', required=True, type=click.Path(dir_okay=False), help='File to write')
+@click.option('--after-id', type=int, default=0, help='Only results with a higher id')
+@click.option('--since', help='ISO timestamp, inclusive')
+@click.option('--until', help='ISO timestamp, exclusive')
+@click.option('--watermark-file', type=click.Path(dir_okay=False),
+              help='Read --after-id from this file and store the new watermark after a successful export')
+@click.option('--tenant', type=click.Choice(TENANTS), default=DEFAULT_TENANT, show_default=True)
+def export_results_command(fmt, output, after_id, since, until, watermark_file, tenant):
+    """Export one tenant's burnout results with departments to Parquet, Arrow or CSV"""
+    if watermark_file and os.path.exists(watermark_file):
+        with open(watermark_file) as f:
+            after_id = int(f.read().strip() or 0)
+    with tenant_context(tenant):
+        try:
+            export = ResultExport(fmt, after_id, parse_timestamp(since), parse_timestamp(until))
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+        
+        with open(output, 'wb') as f:
+            for chunk in export:
+                f.write(chunk)
+    if watermark_file:
+        with open(watermark_file, 'w') as f:
+            f.write(str(export.watermark))
+    click.echo(f"{export.rows} results (ids {after_id + 1}..{export.watermark}) written to {output} in {export.elapsed_seconds}s")
+
+@api.cli.command('run-job')
+@click.argument('name', type=click.Choice(sorted(scheduler.jobs)))
+@tenant_command
+def run_job_command(name):
+    """Run one maintenance job now (skipped if a worker is running it)"""
+    # Resubmitted workflow alerts need a running dispatcher; stop() sends them before exiting
+    workflow_dispatcher.start()
+    try:
+        run = scheduler.run(name, force=True)
+    finally:
+        workflow_dispatcher.stop()
+    if run is None:
+        click.echo(f"{name} is running in another worker")
+    else:
+        click.echo(f"{name}: {run.status}, {run.processed or 0} processed in {run.duration_ms}ms"
+                   + (f" ({run.error})" if run.error else ''))
+
+@api.cli.command('init-db')
+def init_db_command():
+    """Create or upgrade tables and build derived data (run once per deployment)"""
+    prepare_database()
+    click.echo("Database ready")
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    # Development server; production runs gunicorn -c gunicorn.conf.py wsgi:app
+    app = create_app(start_background=False)
+    with app.app_context():
+        prepare_database()
+    for service in (anchor_queue, anchor_verifier, workflow_dispatcher, scheduler):
+        service.init_app(app)
+    atexit.register(shutdown_app, app)
+    app.run(host='0.0.0.0', port=int(os.getenv('PORT', 5000)), debug=os.getenv('FLASK_DEBUG', '0') == '1')
\ No newline at end of file
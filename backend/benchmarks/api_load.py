@@ -0,0 +1,255 @@
+# WellMind – VorteX HR Automation
+# File: backend/benchmarks/api_load.py
+# Description: Reproducible load test for the Flask API hot paths with stubbed external services
+# License: MIT
+#
+# Usage (from backend/):
+#   python -m benchmarks.api_load --sizes 1000,10000 --concurrency 1,8 --output bench.json
+#   python -m benchmarks.api_load --baseline bench.json      # exit 1 on regressions
+#
+# For every data size a subprocess seeds a fresh temp SQLite database with
+# N employees / M results, swaps Hedera, watsonx and Orchestrate for local
+# stubs, then measures latency percentiles, throughput and SQL statements
+# per request for each endpoint at each concurrency level.
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Keep real credentials out of the benchmark process
+EXTERNAL_ENV = (
+    'HEDERA_ACCOUNT_ID', 'HEDERA_PRIVATE_KEY', 'OPERATOR_ID', 'OPERATOR_KEY', 'HEDERA_TOPIC_ID',
+    'WATSONX_URL', 'WATSONX_API_KEY', 'ORCHESTRATE_URL', 'ORCHESTRATE_BATCH_URL', 'ORCHESTRATE_API_KEY',
+)
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def _seed(employees, results):
+    """Bulk-load synthetic history through the same path as /api/survey/bulk"""
+    from services.bulk_ingest import BulkIngestor
+
+    rng = random.Random(42)
+    start = datetime.utcnow() - timedelta(days=365)
+
+    def records():
+        for i in range(results):
+            emp = i % employees
+            yield i + 1, {
+                'name': f'Employee {emp}',
+                'email': f'employee{emp}@bench.local',
+                'department': f'Department {emp % 12}',
+                'work_hours': rng.randint(20, 80),
+                'stress': rng.randint(1, 10),
+                'timestamp': (start + timedelta(minutes=i * 525600 // max(results, 1))).isoformat()
+            }
+
+    return BulkIngestor(chunk_size=5000).ingest(records())
+
+
+def run_child(employees, results, concurrency_levels, requests_per_run):
+    sys.path.insert(0, BACKEND_DIR)
+    from sqlalchemy import event
+    from app import create_app, prepare_database, anchor_queue, workflow_dispatcher
+    from database import db
+
+    # Local stubs for the external services
+    anchor_queue.anchor_fn = lambda record: f"stub-{record['id']}"
+    anchor_queue.anchor_root_fn = lambda root, ids: f"stub-batch-{ids[0]}"
+    workflow_dispatcher.send_fn = lambda records: {'status': 'simulated'}
+
+    app = create_app()
+    with app.app_context():
+        prepare_database()
+        seeded = _seed(employees, results)
+        engine = db.engine
+
+    queries = {'count': 0}
+    lock = threading.Lock()
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _count(*_):
+        with lock:
+            queries['count'] += 1
+
+    counter = {'n': 0}
+
+    def next_survey():
+        with lock:
+            counter['n'] += 1
+            n = counter['n']
+        return {
+            'name': f'Load {n}', 'email': f'employee{n % employees}@bench.local',
+            'department': f'Department {n % 12}', 'work_hours': 30 + n % 40, 'stress': n % 10 + 1
+        }
+
+    endpoints = [
+        ('POST /api/survey', lambda c: c.post('/api/survey', json=next_survey())),
+        ('GET /api/dashboard', lambda c: c.get('/api/dashboard')),
+        ('GET /api/employees', lambda c: c.get('/api/employees?limit=100')),
+        ('GET /api/employee/<id>/history',
+         lambda c: c.get(f'/api/employee/{random.randint(1, employees)}/history')),
+    ]
+
+    runs = []
+    for name, call in endpoints:
+        for concurrency in concurrency_levels:
+            latencies, errors = [], []
+            per_thread = max(1, requests_per_run // concurrency)
+
+            def worker():
+                client = app.test_client()
+                local, failed = [], 0
+                for _ in range(per_thread):
+                    started = time.perf_counter()
+                    resp = call(client)
+                    local.append(time.perf_counter() - started)
+                    failed += resp.status_code >= 400
+                with lock:
+                    latencies.extend(local)
+                    errors.append(failed)
+
+            queries['count'] = 0
+            threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+            started = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - started
+
+            latencies.sort()
+            total = len(latencies)
+            runs.append({
+                'employees': employees,
+                'results': results,
+                'endpoint': name,
+                'concurrency': concurrency,
+                'requests': total,
+                'errors': sum(errors),
+                'p50_ms': round(_percentile(latencies, 0.50) * 1000, 2),
+                'p99_ms': round(_percentile(latencies, 0.99) * 1000, 2),
+                'throughput_rps': round(total / elapsed, 1),
+                'queries_per_request': round(queries['count'] / total, 2)
+            })
+
+    print(json.dumps({'seed_seconds': seeded['elapsed_seconds'], 'runs': runs}))
+
+
+def _spawn(employees, results, args, tmp):
+    env = {k: v for k, v in os.environ.items() if k not in EXTERNAL_ENV}
+    env.update({
+        'DATABASE_URL': 'sqlite:///' + os.path.join(tmp, f'bench-{employees}-{results}.db'),
+        # Without --with-cache every GET runs its queries (no dashboard TTL cache, no response LRU)
+        'DASHBOARD_CACHE_TTL': '10' if args.with_cache else '0',
+        'RESPONSE_CACHE_ENTRIES': '256' if args.with_cache else '0',
+        'HEDERA_ANCHOR_WORKERS': '0',
+        'HEDERA_MIRROR_URL': 'stub',
+        'VERIFY_SWEEP_INTERVAL': '0',
+    })
+    proc = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.api_load', '--child',
+         '--sizes', f'{employees}:{results}', '--concurrency', args.concurrency,
+         '--requests', str(args.requests)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f'Benchmark for {employees} employees failed:\n{proc.stderr}')
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _parse_sizes(value):
+    """'1000,10000' -> [(1000, 5000), ...] (5 results per employee) or explicit 'N:M' pairs"""
+    sizes = []
+    for part in value.split(','):
+        if ':' in part:
+            employees, results = part.split(':')
+            sizes.append((int(employees), int(results)))
+        else:
+            sizes.append((int(part), int(part) * 5))
+    return sizes
+
+
+def compare(baseline_path, runs, tolerance):
+    """Return human-readable regressions against a previous --output file"""
+    with open(baseline_path) as f:
+        baseline = {
+            (r['employees'], r['endpoint'], r['concurrency']): r for r in json.load(f)['runs']
+        }
+    regressions = []
+    for run in runs:
+        base = baseline.get((run['employees'], run['endpoint'], run['concurrency']))
+        if not base:
+            continue
+        label = f"{run['endpoint']} @ {run['employees']} employees x{run['concurrency']}"
+        if run['queries_per_request'] > base['queries_per_request'] + 0.5:
+            regressions.append(f"{label}: {base['queries_per_request']} -> {run['queries_per_request']} queries/request")
+        if run['p99_ms'] > base['p99_ms'] * (1 + tolerance):
+            regressions.append(f"{label}: p99 {base['p99_ms']} -> {run['p99_ms']} ms")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the WellMind API hot paths')
+    parser.add_argument('--sizes', default='1000,10000',
+                        help="employee counts (5 results each) or explicit 'employees:results' pairs")
+    parser.add_argument('--concurrency', default='1,8', help='comma-separated concurrency levels')
+    parser.add_argument('--requests', type=int, default=200, help='requests per endpoint and concurrency level')
+    parser.add_argument('--with-cache', action='store_true', help='leave the dashboard cache and response LRU on')
+    parser.add_argument('--output', help='write machine-readable results to this JSON file')
+    parser.add_argument('--baseline', help='previous --output file to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='allowed relative p99 increase vs baseline')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    concurrency_levels = [int(c) for c in args.concurrency.split(',')]
+    if args.child:
+        (employees, results), = _parse_sizes(args.sizes)
+        run_child(employees, results, concurrency_levels, args.requests)
+        return
+
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for employees, results in _parse_sizes(args.sizes):
+            print(f"Seeding {employees} employees / {results} results...", file=sys.stderr)
+            runs.extend(_spawn(employees, results, args, tmp)['runs'])
+
+    print(f"{'endpoint':<32}{'employees':>10}{'conc':>6}{'p50 ms':>10}{'p99 ms':>10}{'req/s':>10}{'queries':>9}{'errors':>8}")
+    for r in runs:
+        print(f"{r['endpoint']:<32}{r['employees']:>10}{r['concurrency']:>6}{r['p50_ms']:>10}"
+              f"{r['p99_ms']:>10}{r['throughput_rps']:>10}{r['queries_per_request']:>9}{r['errors']:>8}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'generated_at': datetime.utcnow().isoformat(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'with_cache': args.with_cache,
+                'runs': runs
+            }, f, indent=2)
+
+    if args.baseline:
+        regressions = compare(args.baseline, runs, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
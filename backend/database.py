@@ -1,20 +1,274 @@
 # database.py
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.orm import with_loader_criteria
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
+import logging
+import os
+import re
 
-db = SQLAlchemy()
+logger = logging.getLogger(__name__)
+
+# Tenants (business units) served by this deployment; the first is the default
+TENANTS = tuple(t.strip() for t in os.getenv('TENANTS', 'default').split(',') if t.strip())
+DEFAULT_TENANT = TENANTS[0]
+for _tenant in TENANTS:
+    if not re.fullmatch(r'[a-z0-9_]{1,50}', _tenant):
+        raise ValueError(f'Invalid tenant id {_tenant!r}: use lowercase letters, digits and _')
+
+_current_tenant = ContextVar('tenant', default=None)
+# Set by services.tenancy when tenants live in separate databases / schemas
+_tenant_engine = None
+
+
+def current_tenant():
+    """Tenant of the running request, job or command (DEFAULT_TENANT outside any)"""
+    return _current_tenant.get() or DEFAULT_TENANT
+
+
+@contextmanager
+def tenant_context(tenant):
+    """Scope every query, insert and engine choice in the block to one tenant"""
+    token = _current_tenant.set(tenant)
+    try:
+        yield tenant
+    finally:
+        _current_tenant.reset(token)
+
+
+def each_tenant():
+    """Iterate over all tenants, each inside its tenant_context"""
+    for tenant in TENANTS:
+        with tenant_context(tenant):
+            yield tenant
+
+
+def set_tenant_engine_resolver(resolver):
+    """resolver(tenant) -> Engine, or None for the default engine"""
+    global _tenant_engine
+    _tenant_engine = resolver
+
+
+class TenantSession(Session):
+    """Flask-SQLAlchemy session that connects to the current tenant's engine"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and _tenant_engine is not None:
+            bind = _tenant_engine(current_tenant())
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+db = SQLAlchemy(session_options={'class_': TenantSession})
+
+
+class TenantScoped:
+    """
+    Rows owned by one tenant. New rows take the current tenant, and every
+    ORM SELECT / UPDATE / DELETE is filtered to it (_scope_to_tenant), so
+    service code never names the tenant itself.
+    """
+    tenant_id = db.Column(db.String(50), nullable=False, default=current_tenant)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _scope_to_tenant(execute_state):
+    if execute_state.is_column_load or execute_state.is_relationship_load:
+        return  # covered by the criteria of the statement that loaded the parent
+    if execute_state.is_select or execute_state.is_update or execute_state.is_delete:
+        tenant = current_tenant()
+        execute_state.statement = execute_state.statement.options(
+            with_loader_criteria(TenantScoped, lambda cls: cls.tenant_id == tenant, include_aliases=True))
+
+
+def database_url(app):
+    """DATABASE_URL from the environment, else the bundled SQLite file in instance/"""
+    url = os.getenv('DATABASE_URL')
+    if not url:
+        return 'sqlite:///' + os.path.join(app.root_path, 'instance', 'wellmind.db')
+    # Heroku-style URLs
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+def engine_options(url):
+    """Pool settings for server databases; busy timeout and thread sharing for SQLite"""
+    if url.startswith('sqlite'):
+        return {
+            'connect_args': {
+                'timeout': float(os.getenv('SQLITE_BUSY_TIMEOUT', 5)),
+                'check_same_thread': False
+            }
+        }
+    return {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': True
+    }
+
+
+def _tune_sqlite(dbapi_connection, connection_record):
+    """
+    WAL lets readers run alongside the single writer, synchronous=NORMAL is
+    durable across app crashes in WAL mode, and busy_timeout makes
+    concurrent writers wait for the lock instead of failing.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute(f"PRAGMA busy_timeout={int(float(os.getenv('SQLITE_BUSY_TIMEOUT', 5)) * 1000)}")
+    cursor.execute(f"PRAGMA mmap_size={int(os.getenv('SQLITE_MMAP_SIZE', 268435456))}")
+    cursor.execute('PRAGMA cache_size=-64000')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.close()
+
+
+def init_database(app):
+    """Configure the engine from the environment and bind db to the app"""
+    url = database_url(app)
+    app.config['SQLALCHEMY_DATABASE_URI'] = url
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(url)
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    if url.startswith('sqlite') and os.getenv('SQLITE_TUNING', '1') != '0':
+        with app.app_context():
+            event.listen(db.engine, 'connect', _tune_sqlite)
+    return url
+
+
+# Derived or disposable tables: dropped and recreated empty when their primary
+# key changed (prepare_database() rebuilds their contents)
+REBUILDABLE_TABLES = ('department_risk_aggregate', 'department_risk_rollup', 'data_version', 'scheduled_job')
+
+# Indexes replaced by tenant-prefixed ones
+RETIRED_INDEXES = (
+    'ix_employee_department_id', 'ix_burnout_result_watson_timestamp', 'ix_burnout_result_hedera_txid',
+    'ix_burnout_result_orchestrate_status', 'ix_anchor_outbox_status_next', 'ix_job_run_job_started',
+)
+
+
+def ensure_schema():
+    """
+    Create missing tables in the current tenant's database (or schema),
+    then add columns and indexes that models gained after their table was
+    first created (create_all() never alters an existing table). New
+    columns must be nullable or have a default; existing rows get the
+    default. Unique constraints the models no longer declare are dropped.
+    """
+    bind = db.session.get_bind()
+    schema = (bind.get_execution_options().get('schema_translate_map') or {}).get(None)
+    prefix = f'"{schema}".' if schema else ''
+    if schema:
+        db.session.execute(db.text(f'CREATE SCHEMA IF NOT EXISTS "{schema}"'))
+        db.session.commit()
+
+    inspector = db.inspect(bind)
+    existing_tables = set(inspector.get_table_names(schema=schema))
+    for name in REBUILDABLE_TABLES:
+        table = db.metadata.tables[name]
+        if name in existing_tables and inspector.get_pk_constraint(name, schema=schema)['constrained_columns'] != [c.name for c in table.primary_key]:
+            table.drop(bind)
+            logger.info("Recreating %s with its new primary key", name)
+    db.metadata.create_all(bind)
+
+    inspector = db.inspect(bind)
+    for table in db.metadata.sorted_tables:
+        existing_columns = {c['name'] for c in inspector.get_columns(table.name, schema=schema)}
+        for column in table.columns:
+            if column.name not in existing_columns:
+                column_type = column.type.compile(dialect=bind.dialect)
+                db.session.execute(db.text(f'ALTER TABLE {prefix}{table.name} ADD COLUMN {column.name} {column_type}'))
+                if column.default is not None:
+                    value = column.default.arg(None) if column.default.is_callable else column.default.arg
+                    db.session.execute(db.text(f'UPDATE {prefix}{table.name} SET {column.name} = :value'), {'value': value})
+                logger.info("Added column %s.%s", table.name, column.name)
+        db.session.commit()
+
+        if _drop_stale_unique(bind, inspector, table, schema, prefix):
+            inspector = db.inspect(bind)
+
+        existing_indexes = {i['name'] for i in inspector.get_indexes(table.name, schema=schema)}
+        for name in RETIRED_INDEXES:
+            if name in existing_indexes:
+                db.session.execute(db.text(f'DROP INDEX IF EXISTS {prefix}{name}'))
+                db.session.commit()
+                existing_indexes.discard(name)
+                logger.info("Dropped index %s", name)
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(bind)
+                logger.info("Created index %s", index.name)
+
+
+def _drop_stale_unique(bind, inspector, table, schema, prefix):
+    """
+    Drop unique constraints from older models, e.g. employee.email before
+    it became unique per tenant. Returns True if the table changed.
+    """
+    declared = {tuple(c.name for c in index.columns) for index in table.indexes if index.unique}
+    declared |= {tuple(c.name for c in constraint.columns) for constraint in table.constraints
+                 if isinstance(constraint, db.UniqueConstraint)}
+    for constraint in inspector.get_unique_constraints(table.name, schema=schema):
+        if tuple(constraint['column_names']) in declared:
+            continue
+        if bind.dialect.name == 'sqlite':
+            # SQLite cannot drop a table constraint; copy into a table created from the model
+            _rebuild_sqlite_table(bind, inspector, table)
+        else:
+            db.session.execute(db.text(f'ALTER TABLE {prefix}{table.name} DROP CONSTRAINT "{constraint["name"]}"'))
+            db.session.commit()
+        logger.info("Dropped unique constraint on %s(%s)", table.name, ', '.join(constraint['column_names']))
+        return True
+    return False
+
+
+def _rebuild_sqlite_table(bind, inspector, table):
+    columns = ', '.join(c.name for c in table.columns)
+    for index in inspector.get_indexes(table.name):
+        db.session.execute(db.text(f'DROP INDEX {index["name"]}'))
+    copy = table.to_metadata(db.MetaData(), name=f'_{table.name}_rebuild')
+    copy.create(db.session.connection())
+    db.session.execute(db.text(f'INSERT INTO {copy.name} ({columns}) SELECT {columns} FROM {table.name}'))
+    db.session.execute(db.text(f'DROP TABLE {table.name}'))
+    db.session.execute(db.text(f'ALTER TABLE {copy.name} RENAME TO {table.name}'))
+    db.session.commit()
+
+
+class Employee(TenantScoped, db.Model):
+    __table_args__ = (
+        db.Index('ix_employee_tenant_id', 'tenant_id', 'id'),
+        db.Index('ix_employee_tenant_department', 'tenant_id', 'department', 'id'),
+        # Emails are unique within a tenant; business units may share people
+        db.Index('ux_employee_tenant_email', 'tenant_id', 'email', unique=True),
+    )
 
-class Employee(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
-    email = db.Column(db.String(120), unique=True, nullable=False)
+    email = db.Column(db.String(120), nullable=False)
     department = db.Column(db.String(50), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Denormalized pointer to the newest BurnoutResult (by watson_timestamp)
+    latest_result_id = db.Column(db.Integer)
     
     # Relationship
     burnout_results = db.relationship('BurnoutResult', backref='employee', lazy=True)
 
-class BurnoutResult(db.Model):
+class BurnoutResult(TenantScoped, db.Model):
+    __table_args__ = (
+        db.Index('ix_burnout_result_tenant_id', 'tenant_id', 'id'),
+        db.Index('ix_burnout_result_tenant_timestamp', 'tenant_id', 'watson_timestamp'),
+        db.Index('ix_burnout_result_employee_timestamp', 'employee_id', 'watson_timestamp'),
+        # Maintenance jobs: simulated anchors and workflows left 'pending'
+        db.Index('ix_burnout_result_tenant_txid', 'tenant_id', 'hedera_txid'),
+        db.Index('ix_burnout_result_tenant_status', 'tenant_id', 'orchestrate_status', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False)
     risk_score = db.Column(db.Integer, nullable=False)
@@ -22,7 +276,9 @@ class BurnoutResult(db.Model):
     work_hours = db.Column(db.Integer)
     stress_level = db.Column(db.Integer)
     hedera_txid = db.Column(db.String(100))
+    merkle_proof = db.Column(db.Text)  # JSON inclusion proof when anchored as part of a Merkle batch
     orchestrate_status = db.Column(db.String(20), default='pending')
+    orchestrate_requested_at = db.Column(db.DateTime)  # first set 'pending'; bulk imports carry historical timestamps
     watson_timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     
     def to_dict(self):
@@ -38,4 +294,136 @@ class BurnoutResult(db.Model):
             'hedera_txid': self.hedera_txid,
             'orchestrate_status': self.orchestrate_status,
             'watson_timestamp': self.watson_timestamp.isoformat()
-        }
\ No newline at end of file
+        }
+
+class AnchorOutbox(TenantScoped, db.Model):
+    """Durable queue of results waiting to be anchored on Hedera"""
+    __table_args__ = (
+        db.Index('ix_anchor_outbox_tenant_status_next', 'tenant_id', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    result_id = db.Column(db.Integer, db.ForeignKey('burnout_result.id'), unique=True, nullable=False)
+    status = db.Column(db.String(20), default='pending', nullable=False)  # pending, processing, done, failed
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    last_error = db.Column(db.String(255))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationship
+    result = db.relationship('BurnoutResult')
+
+
+class DepartmentRiskAggregate(TenantScoped, db.Model):
+    """Running per-department totals, maintained alongside every BurnoutResult insert"""
+    tenant_id = db.Column(db.String(50), primary_key=True, default=current_tenant)
+    department = db.Column(db.String(50), primary_key=True)
+    employee_count = db.Column(db.Integer, default=0, nullable=False)
+    result_count = db.Column(db.Integer, default=0, nullable=False)
+    risk_sum = db.Column(db.Integer, default=0, nullable=False)
+    hours_sum = db.Column(db.Integer, default=0, nullable=False)
+    stress_sum = db.Column(db.Integer, default=0, nullable=False)
+    high_count = db.Column(db.Integer, default=0, nullable=False)
+    medium_count = db.Column(db.Integer, default=0, nullable=False)
+    low_count = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class DepartmentRiskRollup(TenantScoped, db.Model):
+    """Per-department risk totals for one day or week (granularity), maintained on every insert"""
+    # Primary key order serves the trend range scans (tenant, granularity, bucket_start range)
+    tenant_id = db.Column(db.String(50), primary_key=True, default=current_tenant)
+    granularity = db.Column(db.String(10), primary_key=True)  # day, week
+    bucket_start = db.Column(db.Date, primary_key=True)
+    department = db.Column(db.String(50), primary_key=True)
+    result_count = db.Column(db.Integer, default=0, nullable=False)
+    risk_sum = db.Column(db.BigInteger, default=0, nullable=False)
+    risk_sq_sum = db.Column(db.BigInteger, default=0, nullable=False)
+    high_count = db.Column(db.Integer, default=0, nullable=False)
+    medium_count = db.Column(db.Integer, default=0, nullable=False)
+    low_count = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class EmployeeRiskState(TenantScoped, db.Model):
+    """Online per-employee risk state (EWMA, trend slope, last label), advanced once per result"""
+    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), primary_key=True)
+    ewma = db.Column(db.Float, nullable=False)
+    slope = db.Column(db.Float, default=0.0, nullable=False)  # EWMA of risk change per submission
+    last_risk = db.Column(db.Integer, nullable=False)
+    last_label = db.Column(db.String(20), nullable=False)
+    last_result_id = db.Column(db.Integer, nullable=False)
+    last_timestamp = db.Column(db.DateTime, nullable=False)
+    samples = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class RiskAlert(TenantScoped, db.Model):
+    """A sharp risk escalation detected for one result"""
+    __table_args__ = (
+        db.Index('ix_risk_alert_tenant_id', 'tenant_id', 'id'),
+        db.Index('ix_risk_alert_employee_id', 'employee_id', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employee.id'), nullable=False)
+    result_id = db.Column(db.Integer, db.ForeignKey('burnout_result.id'), unique=True, nullable=False)
+    reason = db.Column(db.String(20), nullable=False)  # label_jump, ewma_jump
+    previous_label = db.Column(db.String(20))
+    label = db.Column(db.String(20), nullable=False)
+    risk_score = db.Column(db.Integer, nullable=False)
+    ewma = db.Column(db.Float)  # EWMA before this result
+    slope = db.Column(db.Float)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+
+class AnchorVerification(TenantScoped, db.Model):
+    """Cached outcome of checking a result's anchored hash against the mirror node"""
+    __table_args__ = (
+        db.Index('ix_anchor_verification_checked', 'checked_at'),
+    )
+
+    result_id = db.Column(db.Integer, db.ForeignKey('burnout_result.id'), primary_key=True)
+    hedera_txid = db.Column(db.String(100))  # anchor the check was made against
+    status = db.Column(db.String(20), nullable=False)  # verified, mismatch, not_found, simulated, unverifiable, pending
+    record_hash = db.Column(db.String(64))
+    anchored_hash = db.Column(db.String(64))  # record hash or Merkle root read from the mirror node
+    checked_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    verified_at = db.Column(db.DateTime)
+
+
+class DataVersion(TenantScoped, db.Model):
+    """Counter bumped in every transaction that changes data served by the read endpoints (ETag source)"""
+    tenant_id = db.Column(db.String(50), primary_key=True, default=current_tenant)
+    name = db.Column(db.String(20), primary_key=True)
+    version = db.Column(db.BigInteger, default=0, nullable=False)
+
+
+class ScheduledJob(TenantScoped, db.Model):
+    """One periodic job of one tenant: when it runs next and which worker holds its run lock"""
+    tenant_id = db.Column(db.String(50), primary_key=True, default=current_tenant)
+    name = db.Column(db.String(50), primary_key=True)
+    next_run_at = db.Column(db.DateTime, nullable=False)
+    locked_by = db.Column(db.String(100))  # host:pid of the worker running it
+    locked_until = db.Column(db.DateTime)  # lease; an expired lock is free again
+    last_status = db.Column(db.String(20))  # ok, error
+    last_started_at = db.Column(db.DateTime)
+    last_finished_at = db.Column(db.DateTime)
+
+
+class JobRun(TenantScoped, db.Model):
+    """Run history of scheduled jobs"""
+    __table_args__ = (
+        db.Index('ix_job_run_tenant_job_started', 'tenant_id', 'job_name', 'started_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_name = db.Column(db.String(50), nullable=False)
+    worker = db.Column(db.String(100))
+    status = db.Column(db.String(20), nullable=False)  # ok, error
+    processed = db.Column(db.Integer)
+    error = db.Column(db.String(255))
+    started_at = db.Column(db.DateTime, nullable=False)
+    finished_at = db.Column(db.DateTime)
+    duration_ms = db.Column(db.Integer)
@@ -0,0 +1,50 @@
+# WellMind – VorteX HR Automation
+# File: backend/gunicorn.conf.py
+# Description: Gunicorn settings: worker count, threads, timeouts and graceful shutdown of background services
+# License: MIT
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+
+# Requests spend most of their time in the database and outbound calls, so
+# each worker process also serves requests on a few threads
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+# Time a worker gets after SIGTERM to finish requests and drain its queues
+graceful_timeout = int(os.getenv('SHUTDOWN_TIMEOUT', 20)) + 10
+keepalive = 5
+
+# Recycle workers now and then so slow leaks cannot accumulate
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+
+# Every worker builds its own app, engine and background threads after the
+# fork; sharing a preloaded engine or threads across processes is unsafe
+preload_app = False
+
+
+def on_starting(server):
+    """Create / upgrade the schema once in the master, before any worker serves"""
+    from app import create_app, prepare_database
+    from database import db
+
+    app = create_app(start_background=False)
+    with app.app_context():
+        prepare_database()
+        db.engine.dispose()
+    if 'tenant_router' in app.extensions:
+        app.extensions['tenant_router'].dispose()
+
+
+def worker_exit(server, worker):
+    """Anchor due outbox rows and send queued workflow alerts before the worker exits"""
+    from app import shutdown_app
+
+    app = getattr(worker, 'wsgi', None)
+    if app is not None:
+        shutdown_app(app)
@@ -0,0 +1,150 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/aggregate_service.py
+# Description: Incrementally maintained per-department risk aggregates (read by the dashboard)
+# License: MIT
+
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+
+from database import db, BurnoutResult, Employee, DepartmentRiskAggregate
+
+AGGREGATE_FIELDS = (
+    'employee_count', 'result_count', 'risk_sum', 'hours_sum', 'stress_sum',
+    'high_count', 'medium_count', 'low_count'
+)
+
+
+def label_bucket(label):
+    """Aggregate column counting a result label ('Urgent' counts as high)"""
+    if label in ('High', 'Urgent'):
+        return 'high_count'
+    if label == 'Medium':
+        return 'medium_count'
+    return 'low_count'
+
+
+def apply_delta(department, **delta):
+    """
+    Add `delta` to a department's totals inside the caller's transaction.
+
+    Uses an in-place UPDATE (col = col + n) so concurrent writers never
+    lose increments; the row is created on first use.
+    """
+    changes = {getattr(DepartmentRiskAggregate, k): getattr(DepartmentRiskAggregate, k) + v for k, v in delta.items()}
+    changes[DepartmentRiskAggregate.updated_at] = datetime.utcnow()
+
+    def _update():
+        return DepartmentRiskAggregate.query.filter_by(department=department).update(changes, synchronize_session=False)
+
+    if _update():
+        return
+    try:
+        with db.session.begin_nested():
+            row = {field: 0 for field in AGGREGATE_FIELDS}
+            row.update(delta)
+            db.session.add(DepartmentRiskAggregate(department=department, **row))
+    except IntegrityError:
+        # Another transaction created the row first
+        _update()
+
+
+def record_new_employee(employee):
+    apply_delta(employee.department, employee_count=1)
+
+
+def result_delta(risk_score, work_hours, stress_level, label):
+    """Aggregate increments contributed by one result"""
+    return {
+        'result_count': 1,
+        'risk_sum': risk_score,
+        'hours_sum': work_hours or 0,
+        'stress_sum': stress_level or 0,
+        label_bucket(label): 1
+    }
+
+
+def merge_delta(deltas, department, delta):
+    """Fold a delta into a {department: delta} accumulator for apply_deltas()"""
+    target = deltas.setdefault(department, {})
+    for field, value in delta.items():
+        target[field] = target.get(field, 0) + value
+
+
+def apply_deltas(deltas):
+    """Apply accumulated per-department deltas, one UPDATE per department"""
+    for department, delta in deltas.items():
+        apply_delta(department, **delta)
+
+
+def record_result(department, result):
+    apply_delta(department, **result_delta(result.risk_score, result.work_hours, result.stress_level, result.label))
+
+
+def scan_department_aggregates():
+    """Recompute every department's totals from employee and burnout_result"""
+    totals = {}
+
+    def _row(department):
+        return totals.setdefault(department, {field: 0 for field in AGGREGATE_FIELDS})
+
+    for department, count in db.session.query(
+        Employee.department, db.func.count(Employee.id)
+    ).group_by(Employee.department):
+        _row(department)['employee_count'] = count
+
+    label = BurnoutResult.label
+    for department, count, risk, hours, stress, high, medium in db.session.query(
+        Employee.department,
+        db.func.count(BurnoutResult.id),
+        db.func.coalesce(db.func.sum(BurnoutResult.risk_score), 0),
+        db.func.coalesce(db.func.sum(BurnoutResult.work_hours), 0),
+        db.func.coalesce(db.func.sum(BurnoutResult.stress_level), 0),
+        db.func.coalesce(db.func.sum(db.case((label.in_(('High', 'Urgent')), 1), else_=0)), 0),
+        db.func.coalesce(db.func.sum(db.case((label == 'Medium', 1), else_=0)), 0)
+    ).join(Employee, Employee.id == BurnoutResult.employee_id).group_by(Employee.department):
+        row = _row(department)
+        row.update(result_count=count, risk_sum=int(risk), hours_sum=int(hours), stress_sum=int(stress),
+                   high_count=int(high), medium_count=int(medium), low_count=count - int(high) - int(medium))
+
+    return totals
+
+
+def reconcile_aggregates(apply=True):
+    """
+    Compare the aggregate table with a full rescan and report any drift.
+    With apply=True the table is rewritten from the rescan.
+
+    Surveys committed while the rescan runs can be missed, so run this
+    when writes are quiet (or run it twice).
+
+    Returns:
+        dict: { 'departments': int, 'drift': [ {department, field, stored, actual} ], 'applied': bool }
+    """
+    actual = scan_department_aggregates()
+    stored = {row.department: row for row in DepartmentRiskAggregate.query.all()}
+
+    drift = []
+    for department in sorted(set(actual) | set(stored)):
+        expected = actual.get(department, {field: 0 for field in AGGREGATE_FIELDS})
+        current = stored.get(department)
+        for field in AGGREGATE_FIELDS:
+            stored_value = getattr(current, field) if current else None
+            if stored_value != expected[field]:
+                drift.append({'department': department, 'field': field,
+                              'stored': stored_value, 'actual': expected[field]})
+
+    if apply and drift:
+        for department, row in stored.items():
+            if department not in actual:
+                db.session.delete(row)
+        for department, values in actual.items():
+            row = stored.get(department)
+            if row is None:
+                db.session.add(DepartmentRiskAggregate(department=department, **values))
+            else:
+                for field, value in values.items():
+                    setattr(row, field, value)
+        db.session.commit()
+
+    return {'departments': len(actual), 'drift': drift, 'applied': bool(apply and drift)}
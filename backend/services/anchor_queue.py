@@ -0,0 +1,314 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/anchor_queue.py
+# Description: Background outbox worker that anchors burnout results on Hedera off the request path
+# License: MIT
+
+import json
+import logging
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+from database import db, each_tenant, AnchorOutbox, BurnoutResult
+from services.hedera_service import submit_record_hash, submit_merkle_root, hash_record
+from services.http_cache import bump_data_version
+from services.log import SAMPLED
+from services.merkle import build_tree, merkle_root, inclusion_proof
+
+logger = logging.getLogger(__name__)
+
+# Written to hedera_txid when every retry has failed (same marker the
+# inline anchoring used)
+SIMULATED_TXID = 'SIMULATED_TX'
+
+
+class AnchorQueue:
+    """
+    Drains the anchor_outbox table with a small pool of worker threads.
+
+    Survey submissions add an AnchorOutbox row in the same transaction as the
+    BurnoutResult, so nothing is lost if the process dies before anchoring.
+    Workers claim rows atomically (safe with several processes sharing one
+    database), call Hedera, write hedera_txid back and retry failures with
+    exponential backoff. Every pass visits each tenant's outbox in turn,
+    in its own session.
+
+    In 'batch' mode (HEDERA_ANCHOR_MODE=batch) rows are collected until
+    merkle_batch_size are due or the oldest has waited batch_window seconds;
+    only the Merkle root of their hashes is anchored and every row stores
+    its inclusion proof in merkle_proof.
+
+    anchor_fn receives BurnoutResult.to_dict() and anchor_root_fn receives
+    (root, record_ids); both return a transaction ID. Pass stubs here to run
+    without hiero_sdk_python or network access.
+    """
+
+    def __init__(self, anchor_fn=None, workers=None, max_attempts=None,
+                 retry_delay=None, max_retry_delay=None, poll_interval=None,
+                 lease_seconds=None, batch_size=10, mode=None, anchor_root_fn=None,
+                 merkle_batch_size=None, batch_window=None):
+        self.anchor_fn = anchor_fn or submit_record_hash
+        self.anchor_root_fn = anchor_root_fn or submit_merkle_root
+        self.mode = (mode or os.getenv('HEDERA_ANCHOR_MODE', 'single')).lower()
+        self.merkle_batch_size = merkle_batch_size or int(os.getenv('HEDERA_BATCH_SIZE', 256))
+        self.batch_window = batch_window or float(os.getenv('HEDERA_BATCH_WINDOW', 30))
+        self.workers = workers if workers is not None else int(os.getenv('HEDERA_ANCHOR_WORKERS', 2))
+        self.max_attempts = max_attempts or int(os.getenv('HEDERA_ANCHOR_MAX_ATTEMPTS', 5))
+        self.retry_delay = retry_delay or float(os.getenv('HEDERA_ANCHOR_RETRY_DELAY', 2))
+        self.max_retry_delay = max_retry_delay or float(os.getenv('HEDERA_ANCHOR_MAX_RETRY_DELAY', 300))
+        self.poll_interval = poll_interval or float(os.getenv('HEDERA_ANCHOR_POLL_INTERVAL', 5))
+        self.lease_seconds = lease_seconds or float(os.getenv('HEDERA_ANCHOR_LEASE', 120))
+        self.batch_size = batch_size
+
+        self.app = None
+        self._threads = []
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._batch_lock = threading.Lock()
+
+    def init_app(self, app, start=True):
+        """Bind to a Flask app and start the worker threads"""
+        self.app = app
+        app.extensions['anchor_queue'] = self
+        if start and self.workers > 0:
+            self.start()
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def enqueue(self, result):
+        """Add an outbox row for a flushed BurnoutResult; the caller commits"""
+        entry = AnchorOutbox(result_id=result.id, status='pending', next_attempt_at=datetime.utcnow())
+        db.session.add(entry)
+        return entry
+
+    def notify(self):
+        """Wake idle workers after the enqueuing transaction has committed"""
+        self._wakeup.set()
+
+    # ------------------------------------------------------------------
+    # Worker lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if self._threads:
+            return
+        self._stopping.clear()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f'anchor-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info("Started %d anchoring worker(s)", self.workers)
+
+    def stop(self, timeout=10, drain=False):
+        """
+        Stop the workers. With drain=True (graceful shutdown) rows that are
+        already due are anchored before returning, batch window ignored,
+        until the outbox is empty or timeout runs out; the rest stay in the
+        outbox for the next process.
+        """
+        deadline = time.monotonic() + timeout
+        was_running = bool(self._threads)
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+        self._threads = []
+        if drain and was_running:
+            drained = 0
+            for _ in each_tenant():
+                with self.app.app_context():
+                    while time.monotonic() < deadline:
+                        if self.mode == 'batch':
+                            processed = self._drain_merkle_batch(force=True)
+                        else:
+                            processed = self.drain_once()
+                        if not processed:
+                            break
+                        drained += processed
+            if drained:
+                logger.info("Anchored %d outbox row(s) during shutdown", drained)
+
+    def _worker_loop(self):
+        while not self._stopping.is_set():
+            processed = 0
+            for tenant in each_tenant():
+                try:
+                    with self.app.app_context():
+                        processed += self.drain_once()
+                except Exception as e:
+                    logger.exception("Anchor worker error (%s): %s", tenant, e)
+            if not processed:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    # ------------------------------------------------------------------
+    # Processing
+    # ------------------------------------------------------------------
+
+    def drain_once(self, limit=None):
+        """
+        Claim and process one batch of the current tenant's due outbox rows.
+        Must run inside an app context. Returns the number of rows processed.
+        """
+        if self.mode == 'batch':
+            return self._drain_merkle_batch(limit)
+        entry_ids = self._claim(limit or self.batch_size)
+        for entry_id in entry_ids:
+            self._process(entry_id)
+        return len(entry_ids)
+
+    def flush(self):
+        """Anchor everything of the current tenant that is due now, ignoring the batch window"""
+        total = 0
+        while True:
+            if self.mode == 'batch':
+                processed = self._drain_merkle_batch(force=True)
+            else:
+                processed = self.drain_once()
+            if not processed:
+                return total
+            total += processed
+
+    def _claim(self, limit):
+        now = datetime.utcnow()
+        lease_expired = now - timedelta(seconds=self.lease_seconds)
+        candidates = db.session.query(AnchorOutbox.id).filter(
+            db.or_(
+                db.and_(AnchorOutbox.status == 'pending', AnchorOutbox.next_attempt_at <= now),
+                db.and_(AnchorOutbox.status == 'processing', AnchorOutbox.updated_at < lease_expired)
+            )
+        ).order_by(AnchorOutbox.id).limit(limit).all()
+
+        claimed = []
+        for (entry_id,) in candidates:
+            # Conditional update so only one worker (in any process) wins the row
+            updated = AnchorOutbox.query.filter(
+                AnchorOutbox.id == entry_id,
+                db.or_(
+                    AnchorOutbox.status == 'pending',
+                    db.and_(AnchorOutbox.status == 'processing', AnchorOutbox.updated_at < lease_expired)
+                )
+            ).update({'status': 'processing', 'updated_at': now}, synchronize_session=False)
+            if updated:
+                claimed.append(entry_id)
+        db.session.commit()
+        return claimed
+
+    def _process(self, entry_id):
+        entry = db.session.get(AnchorOutbox, entry_id)
+        result = db.session.get(BurnoutResult, entry.result_id) if entry else None
+        if result is None:
+            if entry:
+                entry.status = 'failed'
+                entry.last_error = 'Result no longer exists'
+                db.session.commit()
+            return
+
+        try:
+            tx_id = self.anchor_fn(result.to_dict())
+        except Exception as e:
+            db.session.rollback()
+            self._record_failure(entry, result, e)
+            return
+
+        result.hedera_txid = tx_id
+        entry.status = 'done'
+        entry.attempts += 1
+        entry.last_error = None
+        bump_data_version()
+        db.session.commit()
+        logger.debug("Result %s anchored: %s", result.id, tx_id, extra=SAMPLED)
+
+    def _drain_merkle_batch(self, limit=None, force=False):
+        # One batch at a time per process so concurrent workers don't split it
+        with self._batch_lock:
+            if not force and not self._batch_ready():
+                return 0
+            entry_ids = self._claim(limit or self.merkle_batch_size)
+            if entry_ids:
+                self._process_merkle_batch(entry_ids)
+            return len(entry_ids)
+
+    def _batch_ready(self):
+        now = datetime.utcnow()
+        due_count, oldest = db.session.query(
+            db.func.count(AnchorOutbox.id), db.func.min(AnchorOutbox.created_at)
+        ).filter(AnchorOutbox.status == 'pending', AnchorOutbox.next_attempt_at <= now).one()
+        if not due_count:
+            return False
+        return due_count >= self.merkle_batch_size or oldest <= now - timedelta(seconds=self.batch_window)
+
+    def _process_merkle_batch(self, entry_ids):
+        entries = AnchorOutbox.query.filter(AnchorOutbox.id.in_(entry_ids)).order_by(AnchorOutbox.id).all()
+        results = {
+            r.id: r for r in BurnoutResult.query.options(db.joinedload(BurnoutResult.employee))
+            .filter(BurnoutResult.id.in_([e.result_id for e in entries]))
+        }
+        live = []
+        for entry in entries:
+            if entry.result_id in results:
+                live.append(entry)
+            else:
+                entry.status = 'failed'
+                entry.last_error = 'Result no longer exists'
+        if not live:
+            db.session.commit()
+            return
+
+        record_ids = [entry.result_id for entry in live]
+        levels = build_tree([hash_record(results[rid].to_dict()) for rid in record_ids])
+        root = merkle_root(levels)
+
+        try:
+            tx_id = self.anchor_root_fn(root, record_ids)
+        except Exception as e:
+            db.session.rollback()
+            for entry in live:
+                self._record_failure(entry, results[entry.result_id], e, commit=False)
+            db.session.commit()
+            return
+
+        for index, entry in enumerate(live):
+            result = results[entry.result_id]
+            result.hedera_txid = tx_id
+            result.merkle_proof = json.dumps({
+                'root': root,
+                'leaf_index': index,
+                'leaf_count': len(live),
+                'path': inclusion_proof(levels, index)
+            })
+            entry.status = 'done'
+            entry.attempts += 1
+            entry.last_error = None
+        bump_data_version()
+        db.session.commit()
+        logger.info("Merkle batch of %d results anchored: %s (root %s…)", len(live), tx_id, root[:16])
+
+    def _record_failure(self, entry, result, error, commit=True):
+        entry.attempts += 1
+        entry.last_error = str(error)[:255]
+        if entry.attempts >= self.max_attempts:
+            entry.status = 'failed'
+            result.hedera_txid = SIMULATED_TXID
+            bump_data_version()
+            logger.error("Result %s failed after %d attempts: %s", result.id, entry.attempts, error)
+        else:
+            entry.status = 'pending'
+            entry.next_attempt_at = datetime.utcnow() + timedelta(seconds=self._backoff(entry.attempts))
+            logger.warning("Result %s attempt %d failed, retrying: %s", result.id, entry.attempts, error)
+        if commit:
+            db.session.commit()
+
+    def _backoff(self, attempts):
+        """Exponential backoff with jitter"""
+        delay = min(self.max_retry_delay, self.retry_delay * (2 ** (attempts - 1)))
+        return random.uniform(delay / 2, delay)
+
+    def stats(self):
+        """Outbox row counts of the current tenant by status"""
+        rows = db.session.query(AnchorOutbox.status, db.func.count(AnchorOutbox.id)).group_by(AnchorOutbox.status).all()
+        return {status: count for status, count in rows}
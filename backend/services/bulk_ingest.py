@@ -0,0 +1,322 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/bulk_ingest.py
+# Description: Streaming bulk survey import (NDJSON / CSV) with chunked batch inserts
+# License: MIT
+
+import csv
+import json
+import logging
+import time
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+
+from database import db, AnchorOutbox, BurnoutResult, Employee
+from services.aggregate_service import apply_deltas, merge_delta, result_delta
+from services.escalation_service import apply_escalations
+from services.http_cache import bump_data_version
+from services.survey_service import parse_survey, SurveyValidationError
+from services.trend_service import apply_rollups, merge_rollup
+
+# Keep IN (...) lists under SQLite's bound-parameter limit
+_LOOKUP_BATCH = 500
+
+logger = logging.getLogger(__name__)
+
+
+def iter_ndjson(stream):
+    """Yield (line_number, record) from newline-delimited JSON; bad lines yield the error"""
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, SurveyValidationError(f'Invalid JSON: {e}')
+            continue
+        if not isinstance(record, dict):
+            yield line_no, SurveyValidationError('Expected a JSON object')
+            continue
+        yield line_no, record
+
+
+def iter_csv(stream):
+    """Yield (line_number, record) from CSV with a header row"""
+    reader = csv.DictReader(stream)
+    for record in reader:
+        yield reader.line_num, record
+
+
+def _parse_timestamp(value):
+    """Historical exports may carry their own submission time; default to now"""
+    if not value:
+        return datetime.utcnow()
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        raise SurveyValidationError(f'Invalid timestamp: {value}')
+
+
+class BulkIngestor:
+    """
+    Imports survey records in bounded-memory chunks.
+
+    Each chunk is validated and scored with the same rules as POST
+    /api/survey, then written in one transaction: missing employees are
+    inserted in one batch (looked up through an email -> id map kept for
+    the whole import), results and anchor outbox rows with executemany
+    inserts, and aggregates / trend rollups / latest-result pointers with
+    one statement per department / bucket / employee. Escalation state is
+    advanced in timestamp order with one executemany per chunk.
+
+    Workflow decisions follow POST /api/survey too: rows the dispatcher
+    would act on (or that raise an escalation alert, with alert_dispatch)
+    are 'pending' and handed to the dispatcher once their chunk commits,
+    the rest 'not_required'. Without a dispatcher every row is left
+    'pending' for the sweep-pending-workflows job to settle.
+    """
+
+    def __init__(self, anchor_queue=None, chunk_size=1000, max_errors=1000, dispatcher=None, alert_dispatch=True):
+        self.anchor_queue = anchor_queue
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.dispatcher = dispatcher
+        self.alert_dispatch = alert_dispatch
+        self._employees = {}  # email -> (id, department)
+        self.summary = {
+            'processed': 0,
+            'inserted': 0,
+            'employees_created': 0,
+            'failed': 0,
+            'chunks': 0,
+            'alerts': 0,
+            'workflows_queued': 0,
+            'errors': [],
+            'errors_truncated': False
+        }
+
+    def ingest(self, records):
+        """
+        Args:
+            records: iterable of (line_number, dict | Exception)
+        Returns:
+            dict: import summary with per-row errors
+        """
+        started = time.perf_counter()
+        chunk = []
+        for item in records:
+            chunk.append(item)
+            if len(chunk) >= self.chunk_size:
+                self._ingest_chunk(chunk)
+                chunk = []
+        if chunk:
+            self._ingest_chunk(chunk)
+        self.summary['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+        return self.summary
+
+    def _error(self, line_no, message):
+        self.summary['failed'] += 1
+        if len(self.summary['errors']) < self.max_errors:
+            self.summary['errors'].append({'line': line_no, 'error': message})
+        else:
+            self.summary['errors_truncated'] = True
+
+    def _ingest_chunk(self, chunk):
+        self.summary['processed'] += len(chunk)
+        self.summary['chunks'] += 1
+
+        rows = []
+        for line_no, record in chunk:
+            if isinstance(record, Exception):
+                self._error(line_no, str(record))
+                continue
+            try:
+                survey = parse_survey(record)
+                survey['watson_timestamp'] = _parse_timestamp(record.get('timestamp') or record.get('watson_timestamp'))
+            except SurveyValidationError as e:
+                self._error(line_no, str(e))
+                continue
+            rows.append((line_no, survey))
+
+        if not rows:
+            return
+
+        # A concurrent writer may create one of our employees first; retry once with a fresh lookup
+        dispatch = []
+        for attempt in range(2):
+            created = []
+            try:
+                records = self._write_chunk(rows, created)
+                db.session.commit()
+                dispatch = records
+                break
+            except IntegrityError as e:
+                db.session.rollback()
+                self._forget(created)
+                if attempt:
+                    self._fail_rows(rows, e)
+            except Exception as e:
+                db.session.rollback()
+                self._forget(created)
+                self._fail_rows(rows, e)
+                break
+
+        if self.anchor_queue:
+            self.anchor_queue.notify()
+        for record in dispatch:
+            # A full queue leaves the rest 'pending' for the sweep job
+            if not self.dispatcher.submit(record):
+                break
+            self.summary['workflows_queued'] += 1
+
+    def _fail_rows(self, rows, error):
+        logger.error("Bulk import chunk failed: %s", error)
+        for line_no, _ in rows:
+            self._error(line_no, f'Database error: {error}')
+
+    def _forget(self, emails):
+        for email in emails:
+            self._employees.pop(email, None)
+
+    def _write_chunk(self, rows, created):
+        """Write one chunk in the open transaction; returns the workflow records to dispatch after commit"""
+        deltas = {}
+        rollups = {}
+        new_employees = self._resolve_employees(rows, created, deltas)
+
+        now = datetime.utcnow()
+        result_rows = []
+        for _, survey in rows:
+            employee_id, department = self._employees[survey['email']]
+            status = self._workflow_status(survey)
+            result_rows.append({
+                'employee_id': employee_id,
+                'risk_score': survey['risk_score'],
+                'label': survey['label'],
+                'work_hours': survey['work_hours'],
+                'stress_level': survey['stress_level'],
+                'orchestrate_status': status,
+                'orchestrate_requested_at': now if status == 'pending' else None,
+                'watson_timestamp': survey['watson_timestamp']
+            })
+            merge_delta(deltas, department, result_delta(
+                survey['risk_score'], survey['work_hours'], survey['stress_level'], survey['label']))
+            merge_rollup(rollups, department, survey['watson_timestamp'], survey['risk_score'], survey['label'])
+
+        result_ids = db.session.execute(
+            db.insert(BurnoutResult).returning(BurnoutResult.id, sort_by_parameter_order=True),
+            result_rows
+        ).scalars().all()
+
+        db.session.execute(db.insert(AnchorOutbox), [
+            {'result_id': result_id, 'status': 'pending', 'attempts': 0,
+             'next_attempt_at': now, 'created_at': now, 'updated_at': now}
+            for result_id in result_ids
+        ])
+
+        self._update_latest_pointers(result_rows, result_ids)
+        apply_deltas(deltas)
+        apply_rollups(rollups)
+        alerted = apply_escalations(
+            (row['employee_id'], result_id, row['watson_timestamp'], row['risk_score'], row['label'])
+            for row, result_id in zip(result_rows, result_ids)
+        )
+        self.summary['alerts'] += len(alerted)
+        if self.dispatcher and self.alert_dispatch:
+            self._dispatch_alerted(result_rows, result_ids, set(alerted), now)
+
+        bump_data_version()
+
+        self.summary['inserted'] += len(result_ids)
+        self.summary['employees_created'] += new_employees
+        if not self.dispatcher:
+            return []
+        return [
+            {
+                'id': result_id,
+                'employee_id': row['employee_id'],
+                'employee_name': survey['name'],
+                'risk_score': row['risk_score'],
+                'label': row['label'],
+                'timestamp': row['watson_timestamp'].isoformat()
+            }
+            for (_, survey), row, result_id in zip(rows, result_rows, result_ids)
+            if row['orchestrate_status'] == 'pending'
+        ]
+
+    def _workflow_status(self, survey):
+        if self.dispatcher is None or self.dispatcher.should_dispatch(survey['risk_score'], survey['label']):
+            return 'pending'
+        return 'not_required'
+
+    def _dispatch_alerted(self, result_rows, result_ids, alerted, now):
+        """Escalation alerts start a workflow even below the dispatch threshold"""
+        promoted = []
+        for row, result_id in zip(result_rows, result_ids):
+            if result_id in alerted and row['orchestrate_status'] != 'pending':
+                row['orchestrate_status'] = 'pending'
+                promoted.append(result_id)
+        for i in range(0, len(promoted), _LOOKUP_BATCH):
+            BurnoutResult.query.filter(BurnoutResult.id.in_(promoted[i:i + _LOOKUP_BATCH])).update(
+                {'orchestrate_status': 'pending', 'orchestrate_requested_at': now}, synchronize_session=False)
+
+    def _resolve_employees(self, rows, created, deltas):
+        """Fill the email map for this chunk, inserting unknown employees in one batch"""
+        unknown = {survey['email'] for _, survey in rows if survey['email'] not in self._employees}
+        emails = list(unknown)
+        for i in range(0, len(emails), _LOOKUP_BATCH):
+            batch = emails[i:i + _LOOKUP_BATCH]
+            for emp_id, email, department in db.session.query(
+                Employee.id, Employee.email, Employee.department
+            ).filter(Employee.email.in_(batch)):
+                self._employees[email] = (emp_id, department)
+                unknown.discard(email)
+
+        if not unknown:
+            return 0
+
+        new_rows = []
+        for _, survey in rows:
+            if survey['email'] in unknown:
+                unknown.discard(survey['email'])
+                new_rows.append({
+                    'name': survey['name'],
+                    'email': survey['email'],
+                    'department': survey['department'],
+                    'created_at': datetime.utcnow()
+                })
+
+        inserted = db.session.execute(
+            db.insert(Employee).returning(Employee.id, sort_by_parameter_order=True),
+            new_rows
+        ).scalars().all()
+        for emp_id, row in zip(inserted, new_rows):
+            self._employees[row['email']] = (emp_id, row['department'])
+            created.append(row['email'])
+            merge_delta(deltas, row['department'], {'employee_count': 1})
+        return len(inserted)
+
+    def _update_latest_pointers(self, result_rows, result_ids):
+        """Move latest_result_id forward only where the imported result is newer"""
+        newest = {}
+        for row, result_id in zip(result_rows, result_ids):
+            key = (row['watson_timestamp'], result_id)
+            current = newest.get(row['employee_id'])
+            if current is None or key > current:
+                newest[row['employee_id']] = key
+
+        employee = Employee.__table__
+        result = BurnoutResult.__table__
+        current_ts = db.select(result.c.watson_timestamp).where(
+            result.c.id == employee.c.latest_result_id
+        ).scalar_subquery()
+        stmt = employee.update().where(
+            employee.c.id == db.bindparam('eid'),
+            db.or_(employee.c.latest_result_id.is_(None), current_ts <= db.bindparam('ts'))
+        ).values(latest_result_id=db.bindparam('rid'))
+
+        db.session.execute(stmt, [
+            {'eid': employee_id, 'rid': result_id, 'ts': ts}
+            for employee_id, (ts, result_id) in newest.items()
+        ])
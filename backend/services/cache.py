@@ -0,0 +1,108 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/cache.py
+# Description: Small in-process caches for expensive read endpoints
+# License: MIT
+
+import threading
+from collections import OrderedDict
+import time
+
+
+class TTLCache:
+    """
+    Thread-safe key/value cache whose entries expire after `ttl` seconds.
+
+    get_or_set() computes a missing value under a lock, so a burst of
+    requests after an invalidation runs the expensive query once rather
+    than once per request.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._data = {}  # key -> (expires_at, value)
+        self._lock = threading.RLock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            return None
+
+    def set(self, key, value):
+        with self._lock:
+            now = time.monotonic()
+            # Versioned keys are never read again once superseded; drop them when they expire
+            for stale in [k for k, (expires_at, _) in self._data.items() if expires_at <= now]:
+                del self._data[stale]
+            self._data[key] = (now + self.ttl, value)
+
+    def get_or_set(self, key, compute):
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            # Another thread may have filled it while we waited
+            value = self.get(key)
+            if value is None:
+                value = compute()
+                self.set(key, value)
+            return value
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache holding at most `max_entries`
+    values and, when max_bytes is set, at most max_bytes of weigh(value).
+    """
+
+    def __init__(self, max_entries, max_bytes=None, weigh=len):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.weigh = weigh
+        self.size_bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        with self._lock:
+            if self.max_bytes is not None:
+                size = self.weigh(value)
+                if size > self.max_bytes:
+                    return
+                if key in self._data:
+                    self.size_bytes -= self.weigh(self._data[key])
+                self.size_bytes += size
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries or (
+                    self.max_bytes is not None and self.size_bytes > self.max_bytes):
+                _, evicted = self._data.popitem(last=False)
+                if self.max_bytes is not None:
+                    self.size_bytes -= self.weigh(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.size_bytes = 0
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,62 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/circuit_breaker.py
+# Description: Circuit breaker that stops calling an external API while it is failing
+# License: MIT
+
+import threading
+import time
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `failure_threshold` consecutive failures.
+    While open, allow() is False until `reset_timeout` seconds pass; then
+    one trial call is let through (half-open). Its success closes the
+    breaker, its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return 'closed'
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        with self._lock:
+            state = self._state()
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def reset(self):
+        self.record_success()
@@ -0,0 +1,55 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/dashboard_service.py
+# Description: Aggregate queries behind the HR dashboard
+# License: MIT
+
+from database import db, BurnoutResult, DepartmentRiskAggregate
+from services.aggregate_service import AGGREGATE_FIELDS
+
+
+def _average(total, count):
+    return round(total / count, 1) if count else 0
+
+
+def summary_stats():
+    """Totals, risk buckets and averages summed over the per-department aggregates"""
+    agg = DepartmentRiskAggregate
+    row = db.session.query(*[
+        db.func.coalesce(db.func.sum(getattr(agg, field)), 0) for field in AGGREGATE_FIELDS
+    ]).one()
+    totals = dict(zip(AGGREGATE_FIELDS, (int(v) for v in row)))
+    surveys = totals['result_count']
+    return {
+        'total_employees': totals['employee_count'],
+        'total_surveys': surveys,
+        'high_risk_count': totals['high_count'],
+        'medium_risk_count': totals['medium_count'],
+        'low_risk_count': totals['low_count'],
+        'average_risk': _average(totals['risk_sum'], surveys),
+        'average_hours': _average(totals['hours_sum'], surveys),
+        'average_stress': _average(totals['stress_sum'], surveys)
+    }
+
+
+def department_breakdown():
+    """Employees per department and the department's average risk"""
+    return [
+        {'department': row.department, 'count': row.employee_count, 'avg_risk': _average(row.risk_sum, row.result_count)}
+        for row in DepartmentRiskAggregate.query.order_by(DepartmentRiskAggregate.department)
+    ]
+
+
+def recent_submissions(limit=10):
+    """Latest results with their employee loaded in the same query"""
+    results = BurnoutResult.query.options(
+        db.joinedload(BurnoutResult.employee)
+    ).order_by(BurnoutResult.watson_timestamp.desc()).limit(limit).all()
+    return [r.to_dict() for r in results]
+
+
+def build_dashboard():
+    return {
+        'summary': summary_stats(),
+        'departments': department_breakdown(),
+        'recent_submissions': recent_submissions()
+    }
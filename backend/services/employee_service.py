@@ -0,0 +1,207 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/employee_service.py
+# Description: Paginated employee listing backed by the latest-result pointer, and streamed per-employee history
+# License: MIT
+
+from datetime import datetime
+
+from database import db, AnchorVerification, BurnoutResult, Employee
+
+HISTORY_BUCKETS = ('week', 'month')
+_ROLLUP_FIELDS = ('risk_score', 'work_hours', 'stress_level')
+
+
+def backfill_latest_results():
+    """
+    Point every employee that has results but no latest_result_id at their
+    newest result. One correlated UPDATE, served by the
+    (employee_id, watson_timestamp) index.
+    """
+    newest = db.select(BurnoutResult.id).where(
+        BurnoutResult.employee_id == Employee.id
+    ).order_by(BurnoutResult.watson_timestamp.desc(), BurnoutResult.id.desc()).limit(1).scalar_subquery()
+    has_results = db.select(BurnoutResult.id).where(BurnoutResult.employee_id == Employee.id).exists()
+
+    updated = db.session.execute(
+        db.update(Employee)
+        .where(Employee.latest_result_id.is_(None), has_results)
+        .values(latest_result_id=newest)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return updated
+
+
+def list_employees_page(limit, cursor=None, department=None, risk=None):
+    """
+    One page of employees joined to their latest result, ordered by id.
+
+    Args:
+        limit (int): page size
+        cursor (int): last employee id of the previous page
+        department (str): only this department
+        risk (str): only this latest risk label ('No data' = never surveyed)
+    Returns:
+        tuple: (list of employee dicts, next cursor or None)
+    """
+    latest = db.aliased(BurnoutResult)
+    query = db.session.query(Employee, latest, AnchorVerification.status, AnchorVerification.hedera_txid) \
+        .outerjoin(latest, latest.id == Employee.latest_result_id) \
+        .outerjoin(AnchorVerification, AnchorVerification.result_id == Employee.latest_result_id)
+
+    if cursor is not None:
+        query = query.filter(Employee.id > cursor)
+    if department:
+        query = query.filter(Employee.department == department)
+    if risk == 'No data':
+        query = query.filter(Employee.latest_result_id.is_(None))
+    elif risk:
+        query = query.filter(latest.label == risk)
+
+    rows = query.order_by(Employee.id).limit(limit + 1).all()
+    next_cursor = rows[limit - 1][0].id if len(rows) > limit else None
+
+    data = []
+    for emp, result, verification_status, verified_txid in rows[:limit]:
+        # Only a cached successful check against the current anchor counts; simulated ids never do
+        verified = bool(result) and verification_status == 'verified' and verified_txid == result.hedera_txid
+        data.append({
+            'id': emp.id,
+            'name': emp.name,
+            'department': emp.department,
+            'email': emp.email,
+            'latest_risk_score': result.risk_score if result else None,
+            'latest_risk_label': result.label if result else 'No data',
+            'work_hours': result.work_hours if result else None,
+            'stress_level': result.stress_level if result else None,
+            'last_submission': result.watson_timestamp.isoformat() if result else None,
+            'hedera_verified': verified,
+            'anchor_status': verification_status if result and verified_txid == result.hedera_txid else None
+        })
+    return data, next_cursor
+
+
+def parse_timestamp(value):
+    """ISO-8601 query parameter -> naive UTC datetime (None when absent)"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        raise ValueError(f'Invalid timestamp: {value}')
+
+
+def parse_history_cursor(value):
+    """'<iso timestamp>,<result id>' from X-Next-Cursor -> (datetime, int)"""
+    if not value:
+        return None
+    try:
+        ts, result_id = value.rsplit(',', 1)
+        return datetime.fromisoformat(ts), int(result_id)
+    except ValueError:
+        raise ValueError(f'Invalid cursor: {value}')
+
+
+def _history_filter(stmt, employee_id, since, until):
+    stmt = stmt.where(BurnoutResult.employee_id == employee_id)
+    if since:
+        stmt = stmt.where(BurnoutResult.watson_timestamp >= since)
+    if until:
+        stmt = stmt.where(BurnoutResult.watson_timestamp < until)
+    return stmt
+
+
+def iter_history(employee, since=None, until=None, cursor=None, limit=None, chunk_size=500):
+    """
+    An employee's submissions, newest first, as to_dict()-shaped dicts.
+
+    Rows are read in chunks over the (employee_id, watson_timestamp) index
+    without loading ORM objects; cursor continues after (timestamp, id)
+    of the last row of the previous page.
+
+    Returns:
+        tuple: (iterator of dicts, next cursor or None). With a limit the
+        page is read eagerly (limit + 1 rows) so the cursor is known up front.
+    """
+    stmt = _history_filter(db.select(
+        BurnoutResult.id, BurnoutResult.risk_score, BurnoutResult.label, BurnoutResult.work_hours,
+        BurnoutResult.stress_level, BurnoutResult.hedera_txid, BurnoutResult.orchestrate_status,
+        BurnoutResult.watson_timestamp
+    ), employee.id, since, until)
+    if cursor:
+        ts, result_id = cursor
+        stmt = stmt.where(db.or_(
+            BurnoutResult.watson_timestamp < ts,
+            db.and_(BurnoutResult.watson_timestamp == ts, BurnoutResult.id < result_id)
+        ))
+    stmt = stmt.order_by(BurnoutResult.watson_timestamp.desc(), BurnoutResult.id.desc())
+
+    next_cursor = None
+    if limit:
+        rows = db.session.execute(stmt.limit(limit + 1)).all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = f'{rows[-1].watson_timestamp.isoformat()},{rows[-1].id}'
+    else:
+        rows = db.session.execute(stmt.execution_options(yield_per=chunk_size))
+
+    def submissions():
+        for row in rows:
+            yield {
+                'id': row.id,
+                'employee_id': employee.id,
+                'employee_name': employee.name,
+                'department': employee.department,
+                'risk_score': row.risk_score,
+                'label': row.label,
+                'work_hours': row.work_hours,
+                'stress_level': row.stress_level,
+                'hedera_txid': row.hedera_txid,
+                'orchestrate_status': row.orchestrate_status,
+                'watson_timestamp': row.watson_timestamp.isoformat()
+            }
+
+    return submissions(), next_cursor
+
+
+def _bucket_start(bucket):
+    """Start of the week (Monday) / month containing watson_timestamp"""
+    ts = BurnoutResult.watson_timestamp
+    if db.engine.dialect.name == 'sqlite':
+        if bucket == 'week':
+            return db.func.date(ts, 'weekday 0', '-6 days')
+        return db.func.strftime('%Y-%m-01', ts)
+    return db.func.date_trunc(bucket, ts)
+
+
+def history_rollup(employee_id, bucket, window=4, since=None, until=None):
+    """
+    Per-week / per-month averages of risk, hours and stress, oldest first,
+    plus rolling averages over the last `window` periods.
+
+    Grouping and the rolling window both run in SQL; rolling values are
+    weighted by the number of submissions in each period.
+    """
+    period = _bucket_start(bucket).label('period')
+    columns = [period, db.func.count(BurnoutResult.id).label('submissions')]
+    for field in _ROLLUP_FIELDS:
+        col = getattr(BurnoutResult, field)
+        columns.append(db.func.sum(col).label(f'{field}_sum'))
+        columns.append(db.func.count(col).label(f'{field}_n'))
+    grouped = _history_filter(db.select(*columns), employee_id, since, until).group_by(period).subquery()
+
+    frame = {'order_by': grouped.c.period, 'rows': (-(window - 1), 0)}
+    columns = [grouped.c.period, grouped.c.submissions]
+    for field in _ROLLUP_FIELDS:
+        total, n = grouped.c[f'{field}_sum'], grouped.c[f'{field}_n']
+        columns.append((total * 1.0 / db.func.nullif(n, 0)).label(f'avg_{field}'))
+        columns.append((db.func.sum(total).over(**frame) * 1.0 /
+                        db.func.nullif(db.func.sum(n).over(**frame), 0)).label(f'rolling_{field}'))
+
+    for row in db.session.execute(db.select(*columns).order_by(grouped.c.period)):
+        item = {'period_start': str(row.period)[:10], 'submissions': row.submissions}
+        for field in _ROLLUP_FIELDS:
+            for prefix in ('avg', 'rolling'):
+                value = getattr(row, f'{prefix}_{field}')
+                item[f'{prefix}_{field}'] = round(value, 2) if value is not None else None
+        yield item
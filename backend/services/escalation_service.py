@@ -0,0 +1,231 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/escalation_service.py
+# Description: Online per-employee risk state (EWMA, slope, last label) and escalation alerts
+# License: MIT
+
+import os
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+
+from database import db, BurnoutResult, Employee, EmployeeRiskState, RiskAlert
+
+EWMA_ALPHA = float(os.getenv('ALERT_EWMA_ALPHA', 0.3))
+SLOPE_ALPHA = float(os.getenv('ALERT_SLOPE_ALPHA', 0.5))
+EWMA_JUMP = float(os.getenv('ALERT_EWMA_JUMP', 20))
+LABEL_JUMP = int(os.getenv('ALERT_LABEL_JUMP', 2))
+
+LABEL_RANK = {'Low': 0, 'Medium': 1, 'High': 2, 'Urgent': 3}
+STATE_FIELDS = ('ewma', 'slope', 'last_risk', 'last_label', 'last_result_id', 'last_timestamp', 'samples')
+
+# Keep IN (...) lists under SQLite's bound-parameter limit
+_LOOKUP_BATCH = 500
+
+
+def advance(state, result_id, timestamp, risk_score, label):
+    """
+    Fold one result into an employee's state in O(1).
+
+    Args:
+        state (dict | None): STATE_FIELDS of the previous state
+    Returns:
+        tuple: (new state dict, alert dict or None)
+    """
+    if state is None:
+        return {
+            'ewma': float(risk_score), 'slope': 0.0, 'last_risk': risk_score, 'last_label': label,
+            'last_result_id': result_id, 'last_timestamp': timestamp, 'samples': 1
+        }, None
+
+    reason = None
+    if LABEL_RANK.get(label, 0) - LABEL_RANK.get(state['last_label'], 0) >= LABEL_JUMP:
+        reason = 'label_jump'
+    elif risk_score - state['ewma'] >= EWMA_JUMP:
+        reason = 'ewma_jump'
+
+    slope = SLOPE_ALPHA * (risk_score - state['last_risk']) + (1 - SLOPE_ALPHA) * state['slope']
+    new_state = {
+        'ewma': EWMA_ALPHA * risk_score + (1 - EWMA_ALPHA) * state['ewma'],
+        'slope': slope,
+        'last_risk': risk_score,
+        'last_label': label,
+        'last_result_id': result_id,
+        'last_timestamp': timestamp,
+        'samples': state['samples'] + 1
+    }
+    alert = None
+    if reason:
+        alert = {
+            'result_id': result_id, 'reason': reason, 'previous_label': state['last_label'],
+            'label': label, 'risk_score': risk_score, 'ewma': round(state['ewma'], 2),
+            'slope': round(slope, 2), 'created_at': datetime.utcnow()
+        }
+    return new_state, alert
+
+
+def _is_stale(state, timestamp, result_id):
+    """Results older than the state's last one (e.g. historical imports) do not move it"""
+    return state is not None and (timestamp, result_id) < (state['last_timestamp'], state['last_result_id'])
+
+
+def _as_dict(row):
+    return {field: getattr(row, field) for field in STATE_FIELDS}
+
+
+def record_escalation(employee_id, result):
+    """
+    Advance the employee's state with a new result inside the caller's
+    transaction (one locked primary-key read, one write).
+
+    The state row is read FOR UPDATE, so concurrent submissions for one
+    employee advance it one after the other (SQLite ignores the clause; its
+    writers are already serialized by the database lock).
+
+    Returns:
+        RiskAlert | None: the alert added to the session, if the result escalates
+    """
+    for _ in range(2):
+        row = db.session.get(EmployeeRiskState, employee_id, with_for_update=True, populate_existing=True)
+        previous = _as_dict(row) if row else None
+        if _is_stale(previous, result.watson_timestamp, result.id):
+            return None
+
+        state, alert = advance(previous, result.id, result.watson_timestamp, result.risk_score, result.label)
+        if row is not None:
+            for field, value in state.items():
+                setattr(row, field, value)
+            break
+        try:
+            with db.session.begin_nested():
+                db.session.add(EmployeeRiskState(employee_id=employee_id, **state))
+            break
+        except IntegrityError:
+            # Another transaction created the state first: lock its row and advance that instead
+            continue
+    else:
+        return None
+
+    if alert is None:
+        return None
+    risk_alert = RiskAlert(employee_id=employee_id, **alert)
+    db.session.add(risk_alert)
+    return risk_alert
+
+
+def apply_escalations(items):
+    """
+    Advance states for a batch of results (bulk import) in timestamp order.
+
+    Args:
+        items: iterable of (employee_id, result_id, timestamp, risk_score, label)
+    Returns:
+        list: ids of the results that raised an alert
+    """
+    items = sorted(items, key=lambda item: (item[2], item[1]))
+    employee_ids = list({item[0] for item in items})
+    states, existing = {}, set()
+    for i in range(0, len(employee_ids), _LOOKUP_BATCH):
+        for row in EmployeeRiskState.query.filter(EmployeeRiskState.employee_id.in_(employee_ids[i:i + _LOOKUP_BATCH])):
+            states[row.employee_id] = _as_dict(row)
+            existing.add(row.employee_id)
+
+    alerts = []
+    for employee_id, result_id, timestamp, risk_score, label in items:
+        state = states.get(employee_id)
+        if _is_stale(state, timestamp, result_id):
+            continue
+        states[employee_id], alert = advance(state, result_id, timestamp, risk_score, label)
+        if alert:
+            alerts.append(dict(alert, employee_id=employee_id))
+
+    now = datetime.utcnow()
+    table = EmployeeRiskState.__table__
+    columns = STATE_FIELDS + ('updated_at',)
+    updates = [
+        dict({f'new_{field}': value for field, value in s.items()}, eid=eid, new_updated_at=now)
+        for eid, s in states.items() if eid in existing
+    ]
+    inserts = [dict(s, employee_id=eid, updated_at=now) for eid, s in states.items() if eid not in existing]
+    if updates:
+        db.session.execute(
+            table.update().where(table.c.employee_id == db.bindparam('eid'))
+            .values({field: db.bindparam(f'new_{field}') for field in columns}),
+            updates
+        )
+    if inserts:
+        db.session.execute(db.insert(EmployeeRiskState), inserts)
+    if alerts:
+        db.session.execute(db.insert(RiskAlert), alerts)
+    return [alert['result_id'] for alert in alerts]
+
+
+def rebuild_states(chunk_size=10000):
+    """
+    Recompute every employee's state from burnout_result in one streaming
+    pass ordered by watson_timestamp. Existing alerts are kept.
+
+    Returns:
+        dict: { 'results': int, 'employees': int, 'escalations': int }
+    """
+    states = {}
+    scanned = escalations = 0
+    rows = db.session.execute(
+        db.select(BurnoutResult.employee_id, BurnoutResult.id, BurnoutResult.watson_timestamp,
+                  BurnoutResult.risk_score, BurnoutResult.label)
+        .order_by(BurnoutResult.watson_timestamp, BurnoutResult.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    for employee_id, result_id, timestamp, risk_score, label in rows:
+        states[employee_id], alert = advance(states.get(employee_id), result_id, timestamp, risk_score, label)
+        scanned += 1
+        escalations += alert is not None
+
+    db.session.query(EmployeeRiskState).delete(synchronize_session=False)
+    now = datetime.utcnow()
+    rows = [dict(state, employee_id=employee_id, updated_at=now) for employee_id, state in states.items()]
+    for i in range(0, len(rows), chunk_size):
+        db.session.execute(db.insert(EmployeeRiskState), rows[i:i + chunk_size])
+    db.session.commit()
+    return {'results': scanned, 'employees': len(states), 'escalations': escalations}
+
+
+def list_alerts(limit, cursor=None, employee_id=None, department=None, since=None):
+    """
+    Newest alerts first, keyset-paginated by alert id.
+
+    Returns:
+        tuple: (list of alert dicts, next cursor or None)
+    """
+    query = db.session.query(RiskAlert, Employee.name, Employee.department, BurnoutResult.orchestrate_status) \
+        .join(Employee, Employee.id == RiskAlert.employee_id) \
+        .join(BurnoutResult, BurnoutResult.id == RiskAlert.result_id)
+    if cursor is not None:
+        query = query.filter(RiskAlert.id < cursor)
+    if employee_id is not None:
+        query = query.filter(RiskAlert.employee_id == employee_id)
+    if department:
+        query = query.filter(Employee.department == department)
+    if since:
+        query = query.filter(RiskAlert.created_at >= since)
+
+    rows = query.order_by(RiskAlert.id.desc()).limit(limit + 1).all()
+    next_cursor = rows[limit - 1][0].id if len(rows) > limit else None
+
+    data = []
+    for alert, name, department, orchestrate_status in rows[:limit]:
+        data.append({
+            'id': alert.id,
+            'employee_id': alert.employee_id,
+            'employee_name': name,
+            'department': department,
+            'result_id': alert.result_id,
+            'reason': alert.reason,
+            'previous_label': alert.previous_label,
+            'label': alert.label,
+            'risk_score': alert.risk_score,
+            'ewma': alert.ewma,
+            'slope': alert.slope,
+            'orchestrate_status': orchestrate_status,
+            'created_at': alert.created_at.isoformat()
+        })
+    return data, next_cursor
@@ -0,0 +1,187 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/export_service.py
+# Description: Streaming columnar export of burnout results (Parquet, Arrow IPC or CSV) for offline analytics
+# License: MIT
+
+import csv
+import io
+import os
+import time
+
+from database import db, BurnoutResult, Employee
+
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 20000))
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+}
+
+# watson_timestamp stays last: the CSV writer formats it separately
+EXPORT_COLUMNS = (
+    'id', 'employee_id', 'department', 'risk_score', 'label', 'work_hours',
+    'stress_level', 'hedera_txid', 'orchestrate_status', 'watson_timestamp'
+)
+
+
+def export_watermark(after_id=0):
+    """Highest result id an export starting now will include"""
+    return db.session.execute(
+        db.select(db.func.max(BurnoutResult.id)).where(BurnoutResult.id > after_id)
+    ).scalar() or after_id
+
+
+class ResultExport:
+    """
+    One export of burnout_result joined with Employee.department.
+
+    Rows are read in id order with a streaming cursor (server-side on
+    PostgreSQL), chunk_size at a time, and encoded chunk by chunk: a CSV
+    block, an Arrow record batch or a Parquet row group. Memory stays
+    bounded by one chunk whatever the export size. Iterate the object for
+    the encoded bytes.
+
+    The id range is fixed when the export is created: results with
+    after_id < id <= watermark. Pass the watermark as after_id next time
+    for an incremental export. since / until filter on watson_timestamp;
+    historical imports can carry old timestamps, so the id watermark is the
+    one that never misses rows.
+    """
+
+    def __init__(self, fmt='csv', after_id=0, since=None, until=None, chunk_size=None):
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+        self.fmt = fmt
+        self.after_id = after_id or 0
+        self.since = since
+        self.until = until
+        self.chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+        self.watermark = export_watermark(self.after_id)
+        self.rows = 0
+        self.elapsed_seconds = 0.0
+
+    @property
+    def mimetype(self):
+        return EXPORT_FORMATS[self.fmt][0]
+
+    @property
+    def filename(self):
+        return f'burnout_results_{self.after_id + 1}-{self.watermark}.{EXPORT_FORMATS[self.fmt][1]}'
+
+    def __iter__(self):
+        writer = {'csv': _csv_chunks, 'parquet': _parquet_chunks, 'arrow': _arrow_chunks}[self.fmt]
+        return writer(self._partitions())
+
+    def _partitions(self):
+        started = time.perf_counter()
+        if self.watermark > self.after_id:
+            query = db.select(
+                BurnoutResult.id, BurnoutResult.employee_id, Employee.department, BurnoutResult.risk_score,
+                BurnoutResult.label, BurnoutResult.work_hours, BurnoutResult.stress_level,
+                BurnoutResult.hedera_txid, BurnoutResult.orchestrate_status, BurnoutResult.watson_timestamp
+            ).join(Employee, Employee.id == BurnoutResult.employee_id).where(
+                BurnoutResult.id > self.after_id, BurnoutResult.id <= self.watermark
+            )
+            if self.since:
+                query = query.where(BurnoutResult.watson_timestamp >= self.since)
+            if self.until:
+                query = query.where(BurnoutResult.watson_timestamp < self.until)
+
+            result = db.session.execute(query.order_by(BurnoutResult.id).execution_options(yield_per=self.chunk_size))
+            for rows in result.partitions():
+                self.rows += len(rows)
+                yield rows
+        self.elapsed_seconds = round(time.perf_counter() - started, 3)
+
+
+def _csv_chunks(partitions):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in partitions:
+        writer.writerows((*row[:-1], row[-1].isoformat() if row[-1] else '') for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink:
+    """Write-only file object that hands out what the Arrow writers wrote since the last take()"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_schema(pa):
+    return pa.schema([
+        ('id', pa.int64()),
+        ('employee_id', pa.int64()),
+        ('department', pa.string()),
+        ('risk_score', pa.int32()),
+        ('label', pa.string()),
+        ('work_hours', pa.int32()),
+        ('stress_level', pa.int32()),
+        ('hedera_txid', pa.string()),
+        ('orchestrate_status', pa.string()),
+        ('watson_timestamp', pa.timestamp('us')),
+    ])
+
+
+def _record_batch(pa, schema, rows):
+    columns = zip(*rows)
+    return pa.RecordBatch.from_arrays(
+        [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema)
+
+
+def _arrow_chunks(partitions):
+    # pyarrow is only needed for columnar exports; import it on first use
+    import pyarrow as pa
+
+    schema = _arrow_schema(pa)
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, schema, options=pa.ipc.IpcWriteOptions(compression='zstd'))
+    for rows in partitions:
+        writer.write_batch(_record_batch(pa, schema, rows))
+        yield sink.take()
+    writer.close()
+    yield sink.take()
+
+
+def _parquet_chunks(partitions):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(pa)
+    sink = _ChunkSink()
+    # One row group per chunk; dictionary encoding keeps department / label columns small
+    writer = pq.ParquetWriter(sink, schema, compression='zstd')
+    for rows in partitions:
+        writer.write_batch(_record_batch(pa, schema, rows))
+        yield sink.take()
+    writer.close()
+    yield sink.take()
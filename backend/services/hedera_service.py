@@ -1,23 +1,193 @@
 import hashlib
+import logging
 import os
 import json
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
 from dotenv import load_dotenv
 
-# Hiero SDK imports - these should work now
-from hiero_sdk_python import (
-    Client,
-    AccountId,
-    PrivateKey,
-    Network,
-    TopicMessageSubmitTransaction,
-    TopicId,
-    FileCreateTransaction,
-    ResponseCode
-)
+from services.log import SAMPLED
+from services.metrics import track_external
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# to_dict() keys that are written after a record is anchored and so are
+# left out of its audit hash
+ANCHOR_VOLATILE_FIELDS = ('hedera_txid', 'orchestrate_status')
+
+# Audit hash versions, declared as hash_version in anchored messages.
+# 1: the full to_dict() as the original inline anchoring hashed it, right
+#    after insert (no txid yet, workflow still pending); messages carry no
+#    hash_version
+# 2: to_dict() without ANCHOR_VOLATILE_FIELDS
+ANCHOR_HASH_VERSION = 2
+LEGACY_ANCHOR_VALUES = {'hedera_txid': None, 'orchestrate_status': 'pending'}
+
+
+@lru_cache(maxsize=1)
+def _load_config():
+    """Read Hedera settings from the environment once per process"""
+    # Try different environment variable names for compatibility
+    return {
+        'account_id': os.getenv('HEDERA_ACCOUNT_ID') or os.getenv('OPERATOR_ID'),
+        'private_key': os.getenv('HEDERA_PRIVATE_KEY') or os.getenv('OPERATOR_KEY'),
+        'topic_id': (os.getenv('HEDERA_TOPIC_ID') or '').strip() or None,
+        'network': os.getenv('NETWORK', 'testnet').lower(),
+    }
+
+
+def hedera_configured():
+    """True when operator credentials are set, i.e. anchoring will not just simulate"""
+    config = _load_config()
+    return bool(config['account_id'] and config['private_key'])
+
+
+@lru_cache(maxsize=8)
+def _parse_operator(account_id, private_key):
+    """Parse operator credentials once; key parsing is the expensive part"""
+    # The Hiero SDK (and its gRPC stack) is imported on first use so web
+    # workers and CLI commands that never anchor start without it
+    from hiero_sdk_python import AccountId, PrivateKey
+    return AccountId.from_string(account_id), PrivateKey.from_string(private_key)
+
+
+@lru_cache(maxsize=32)
+def _parse_topic_id(topic_id):
+    from hiero_sdk_python import TopicId
+    return TopicId.from_string(topic_id)
+
+
+def _create_client(config):
+    """Build a Client for the configured network with the operator set"""
+    from hiero_sdk_python import Client, Network
+    network = Network(config['network'])
+    client = Client(network)
+    operator_id, operator_key = _parse_operator(config['account_id'], config['private_key'])
+    client.set_operator(operator_id, operator_key)
+    logger.info("Connected to Hedera %s network as %s", config['network'], client.operator_account_id)
+    return client
+
+
+class HederaClientPool:
+    """
+    Thread-safe pool of Hedera clients, created lazily on first use.
+
+    At most max_size clients exist at once: each acquire() takes a slot and
+    hands out a client exclusively, waiting up to acquire_timeout for a
+    slot when all are in use. The client goes back to the pool when the
+    block exits cleanly. A client that raised is closed and replaced; idle
+    clients are replaced once they outlive max_age or when they were
+    created before another client last failed.
+
+    client_factory(config) -> client can be swapped for a stub in tests.
+    """
+
+    def __init__(self, client_factory=None, max_size=None, max_age=None, acquire_timeout=None):
+        self.client_factory = client_factory or _create_client
+        self.max_size = max_size or int(os.getenv('HEDERA_CLIENT_POOL_SIZE', 4))
+        self.max_age = max_age or float(os.getenv('HEDERA_CLIENT_MAX_AGE', 3600))
+        self.acquire_timeout = acquire_timeout or float(os.getenv('HEDERA_CLIENT_ACQUIRE_TIMEOUT', 30))
+        self._idle = []  # (client, created_at)
+        self._slots = threading.BoundedSemaphore(self.max_size)
+        self._last_failure = None  # monotonic time a client last raised
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'reconnects': 0, 'expired': 0, 'stale': 0, 'timeouts': 0}
+
+    @contextmanager
+    def acquire(self, config):
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            with self._lock:
+                self._stats['timeouts'] += 1
+            raise TimeoutError(f'no Hedera client free within {self.acquire_timeout}s (pool size {self.max_size})')
+        try:
+            client, created_at = self._checkout(config)
+            try:
+                yield client
+            except Exception:
+                # The connection may be broken; never hand this client out again
+                self._discard(client)
+                with self._lock:
+                    self._stats['reconnects'] += 1
+                    self._last_failure = time.monotonic()
+                raise
+            else:
+                self._checkin(client, created_at)
+        finally:
+            self._slots.release()
+
+    def _checkout(self, config):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    self._stats['misses'] += 1
+                    break
+                client, created_at = self._idle.pop()
+                retired = self._retire_reason(created_at)
+                if retired is None:
+                    self._stats['hits'] += 1
+                    return client, created_at
+                self._stats[retired] += 1
+                self._stats['reconnects'] += 1
+            self._discard(client)
+        return self.client_factory(config), time.monotonic()
+
+    def _checkin(self, client, created_at):
+        with self._lock:
+            if len(self._idle) < self.max_size:
+                self._idle.append((client, created_at))
+                return
+        self._discard(client)
+
+    def _retire_reason(self, created_at):
+        """
+        Why an idle client must be replaced, or None to reuse it. The SDK has
+        no cheap channel probe, so this goes by age and by failures: a client
+        opened before another one failed likely shares its broken connection.
+        """
+        if time.monotonic() - created_at > self.max_age:
+            return 'expired'
+        if self._last_failure is not None and created_at <= self._last_failure:
+            return 'stale'
+        return None
+
+    def _discard(self, client):
+        close = getattr(client, 'close', None)
+        if close:
+            try:
+                close()
+            except Exception:
+                pass
+
+    def clear(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for client, _ in idle:
+            self._discard(client)
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, idle=len(self._idle), max_size=self.max_size)
+
+
+_client_pool = HederaClientPool()
+
+
+def get_client_pool():
+    return _client_pool
+
+
+def reset_hedera_config():
+    """Drop cached settings, parsed keys and pooled clients (e.g. after rotating keys)"""
+    _load_config.cache_clear()
+    _parse_operator.cache_clear()
+    _parse_topic_id.cache_clear()
+    _client_pool.clear()
+
 def store_hash_on_hedera(record):
     """
     Store a hashed burnout record on Hedera Testnet for audit trail.
@@ -27,58 +197,118 @@ def store_hash_on_hedera(record):
     Returns:
         str: Hedera transaction or simulated ID
     """
+    try:
+        return submit_record_hash(record)
+    except Exception as e:
+        logger.exception("Hedera error: %s", e)
+        return _simulate_hedera_tx(record)
 
-    # Try different environment variable names for compatibility
-    hedera_account_id = (
-        os.getenv('HEDERA_ACCOUNT_ID') or 
-        os.getenv('OPERATOR_ID')
-    )
-    hedera_private_key = (
-        os.getenv('HEDERA_PRIVATE_KEY') or 
-        os.getenv('OPERATOR_KEY')
-    )
-    hedera_topic_id = os.getenv('HEDERA_TOPIC_ID')
+
+def submit_record_hash(record):
+    """
+    Same as store_hash_on_hedera, but network errors are raised instead of
+    being swallowed into a simulated ID so callers can retry.
+
+    Args:
+        record (dict): BurnoutResult data
+    Returns:
+        str: Hedera transaction ID, or a simulated ID when Hedera is not configured
+    """
+
+    config = _load_config()
 
     # Validate environment variables
-    if not hedera_account_id or not hedera_private_key:
-        print("Hedera credentials not configured, simulating transaction")
+    if not config['account_id'] or not config['private_key']:
+        logger.debug("Hedera credentials not configured, simulating transaction", extra=SAMPLED)
         return _simulate_hedera_tx(record)
 
-    try:
-        # Initialize client
-        network_name = os.getenv('NETWORK', 'testnet').lower()
-        network = Network(network_name)
-        client = Client(network)
-        
-        print(f"🔗 Connecting to Hedera {network_name} network")
+    # Hash record for audit trail
+    record_hash = hash_record(record)
+    return _publish(config, build_record_message(record, record_hash), record_hash)
 
-        # Set operator
-        operator_id = AccountId.from_string(hedera_account_id)
-        operator_key = PrivateKey.from_string(hedera_private_key)
-        client.set_operator(operator_id, operator_key)
-        
-        print(f"👤 Client set up with operator: {client.operator_account_id}")
-
-        # Hash record for audit trail
-        record_str = json.dumps(record, sort_keys=True)
-        record_hash = hashlib.sha256(record_str.encode()).hexdigest()
-
-        payload = {
-            "event": "burnout_score",
-            "record_id": record.get("id"),
-            "risk_label": record.get("label"),
-            "risk_score": record.get("risk_score"),
-            "hash": record_hash,
-            "ts": record.get("watson_timestamp"),
-            "employee_id": record.get("employee_id")
-        }
-        message = json.dumps(payload)
 
+def build_record_message(record, record_hash=None):
+    """HCS message anchoring a single record (what verification reads back from the mirror node)"""
+    return json.dumps({
+        "event": "burnout_score",
+        "record_id": record.get("id"),
+        "risk_label": record.get("label"),
+        "risk_score": record.get("risk_score"),
+        "hash": record_hash or hash_record(record),
+        "hash_version": ANCHOR_HASH_VERSION,
+        "ts": record.get("watson_timestamp"),
+        "employee_id": record.get("employee_id")
+    })
+
+
+def submit_merkle_root(root, record_ids):
+    """
+    Anchor the Merkle root of a batch of record hashes as a single message.
+    Errors are raised so the caller can retry the whole batch.
+
+    Args:
+        root (str): hex Merkle root from services.merkle
+        record_ids (list[int]): BurnoutResult IDs covered by the root, in leaf order
+    Returns:
+        str: Hedera transaction ID, or a simulated ID when Hedera is not configured
+    """
+    config = _load_config()
+
+    if not config['account_id'] or not config['private_key']:
+        logger.debug("Hedera credentials not configured, simulating batch transaction")
+        return f"simulate-batch-{record_ids[0]}-{root[:10]}"
+
+    return _publish(config, build_batch_message(root, record_ids), root)
+
+
+def build_batch_message(root, record_ids):
+    """HCS message anchoring the Merkle root of a batch"""
+    return json.dumps({
+        "event": "burnout_batch",
+        "merkle_root": root,
+        "hash_version": ANCHOR_HASH_VERSION,
+        "count": len(record_ids),
+        "first_record_id": record_ids[0],
+        "last_record_id": record_ids[-1]
+    })
+
+
+def hash_record(record, version=ANCHOR_HASH_VERSION):
+    """
+    SHA-256 of a BurnoutResult.to_dict(), ignoring fields that change after
+    anchoring (the anchor reference itself and the workflow status).
+    version=1 re-derives the hash of records anchored before hash_version
+    existed, with those fields as they were when it was taken.
+    """
+    if version == 1:
+        stable = dict(record, **LEGACY_ANCHOR_VALUES)
+    else:
+        stable = {k: v for k, v in record.items() if k not in ANCHOR_VOLATILE_FIELDS}
+    record_str = json.dumps(stable, sort_keys=True)
+    return hashlib.sha256(record_str.encode()).hexdigest()
+
+
+def anchor_hash_versions(message=None):
+    """
+    Hash versions to try for an anchored message: the one it declares, or
+    for messages without hash_version (and cached anchors whose message
+    is not at hand) the current version, then the legacy one.
+    """
+    declared = (message or {}).get('hash_version')
+    return (declared,) if declared else (ANCHOR_HASH_VERSION, 1)
+
+
+def _publish(config, message, file_hash):
+    """Submit to the configured HCS topic, or store the hash in a file when no topic is set"""
+    from hiero_sdk_python import FileCreateTransaction, ResponseCode, TopicMessageSubmitTransaction
+    _, operator_key = _parse_operator(config['account_id'], config['private_key'])
+
+    with _client_pool.acquire(config) as client:
         # If Topic ID exists, publish to topic (HCS)
-        if hedera_topic_id:
-            topic_id = TopicId.from_string(hedera_topic_id.strip())
+        if config['topic_id']:
+            topic_id = _parse_topic_id(config['topic_id'])
             
-            print(f"📝 Submitting message to topic: {topic_id}")
+            logger.debug("Submitting message to topic %s", topic_id, extra=SAMPLED)
             
             # Create and execute transaction
             transaction = (
@@ -87,36 +317,30 @@ def store_hash_on_hedera(record):
                 .sign(operator_key)
             )
 
-            receipt = transaction.execute(client)
+            with track_external('hedera', 'topic_message_submit'):
+                receipt = transaction.execute(client)
             tx_id = receipt.transaction_id
             
-            print(f"✅ Success! Message submitted to topic {topic_id}")
-            print(f"📄 Transaction ID: {tx_id}")
-            print(f"📊 Transaction status: {ResponseCode(receipt.status).name}")
+            logger.debug("Message submitted to topic %s: %s (%s)", topic_id, tx_id, ResponseCode(receipt.status).name, extra=SAMPLED)
             
             return f"topic:{topic_id}:{tx_id}"
 
         # Fallback: FileCreateTransaction (if no topic ID)
-        print("📁 No topic ID configured, creating file instead...")
+        logger.debug("No topic ID configured, creating file instead")
         
         transaction = (
-            FileCreateTransaction(contents=record_hash.encode())
+            FileCreateTransaction(contents=file_hash.encode())
             .freeze_with(client)
             .sign(operator_key)
         )
         
-        receipt = transaction.execute(client)
+        with track_external('hedera', 'file_create'):
+            receipt = transaction.execute(client)
         file_id = receipt.file_id
         
-        print(f"✅ Success! File created: {file_id}")
+        logger.debug("File created: %s", file_id, extra=SAMPLED)
         return f"file:{file_id}"
 
-    except Exception as e:
-        print(f"❌ Hedera error: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return _simulate_hedera_tx(record)
-
 
 def _simulate_hedera_tx(record):
     """Simulation fallback for dev/testing"""
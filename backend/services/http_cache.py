@@ -0,0 +1,106 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/http_cache.py
+# Description: ETag / If-None-Match handling and an LRU of serialized responses, keyed by a data-version counter
+# License: MIT
+
+import hashlib
+from functools import wraps
+
+from flask import Response, g, request
+from sqlalchemy.exc import IntegrityError
+
+from database import db, current_tenant, DataVersion
+from services.cache import LRUCache
+
+_VERSION_NAME = 'data'
+
+
+def bump_data_version():
+    """
+    Increment the data version inside the caller's transaction. Call it in
+    every transaction that changes what the cached read endpoints return.
+    """
+    def _update():
+        return DataVersion.query.filter_by(name=_VERSION_NAME).update(
+            {DataVersion.version: DataVersion.version + 1}, synchronize_session=False)
+
+    if _update():
+        return
+    try:
+        with db.session.begin_nested():
+            db.session.add(DataVersion(name=_VERSION_NAME, version=1))
+    except IntegrityError:
+        _update()
+
+
+def current_data_version():
+    return db.session.execute(
+        db.select(DataVersion.version).where(DataVersion.name == _VERSION_NAME)
+    ).scalar() or 0
+
+
+class ResponseCache:
+    """
+    Conditional GET for read endpoints.
+
+    The ETag of a response is derived from the tenant's data version, the
+    tenant and the full request path, so it changes exactly when a write
+    of that tenant commits. A request
+    whose If-None-Match matches gets 304 without running the view. With
+    max_entries > 0, serialized bodies are kept in a size-bounded LRU and
+    replayed while the data version is unchanged; streamed responses are
+    never stored.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=32 * 1024 * 1024):
+        self.enabled = max_entries > 0
+        self.store = LRUCache(max_entries, max_bytes=max_bytes, weigh=lambda entry: len(entry[1]))
+        self.not_modified = 0
+
+    def conditional(self, view):
+        """Decorator for GET views returning JSON"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            version = g.data_version = current_data_version()
+            key = f'{current_tenant()}:{request.full_path}'
+            digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+            etag = f'{version}-{digest}'
+
+            if request.if_none_match.contains(etag):
+                self.not_modified += 1
+                return self._finish(Response(status=304), etag)
+
+            if self.enabled:
+                entry = self.store.get(key)
+                if entry and entry[0] == version:
+                    _, body, mimetype, headers = entry
+                    return self._finish(Response(body, mimetype=mimetype, headers=headers), etag)
+
+            response = view(*args, **kwargs)
+            if isinstance(response, tuple) or response.status_code != 200:
+                return response
+            if self.enabled and not response.is_streamed:
+                headers = [(k, v) for k, v in response.headers if k == 'X-Next-Cursor']
+                self.store.set(key, (version, response.get_data(), response.mimetype, headers))
+            return self._finish(response, etag)
+        return wrapper
+
+    @staticmethod
+    def _finish(response, etag):
+        response.set_etag(etag)
+        # Browsers and proxies may keep the body but must revalidate every time
+        response.headers['Cache-Control'] = 'no-cache'
+        response.vary.add('X-Tenant-ID')
+        return response
+
+    def clear(self):
+        self.store.clear()
+
+    def stats(self):
+        return {
+            'entries': len(self.store),
+            'bytes': self.store.size_bytes,
+            'hits': self.store.hits,
+            'misses': self.store.misses,
+            'not_modified': self.not_modified
+        }
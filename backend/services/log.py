@@ -0,0 +1,51 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/log.py
+# Description: Leveled logging setup with sampling for high-volume hot-path messages
+# License: MIT
+
+import logging
+import os
+import random
+
+# Pass as extra= on per-request / per-record log lines that may be dropped under load
+SAMPLED = {'sampled': True}
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps only a fraction of records logged with extra=SAMPLED.
+    Warnings and errors are never sampled away.
+    """
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if not getattr(record, 'sampled', False) or record.levelno >= logging.WARNING:
+            return True
+        return self.rate >= 1 or random.random() < self.rate
+
+
+def configure_logging(level=None, sample_rate=None):
+    """
+    Configure the root logger once.
+
+    LOG_LEVEL: DEBUG / INFO / WARNING / ERROR (default INFO)
+    LOG_SAMPLE_RATE: fraction of sampled hot-path lines to keep (default 1.0)
+    """
+    level = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+    sample_rate = sample_rate if sample_rate is not None else float(os.getenv('LOG_SAMPLE_RATE', 1.0))
+
+    root = logging.getLogger()
+    if getattr(root, '_wellmind_configured', False):
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(
+        os.getenv('LOG_FORMAT', '%(asctime)s %(levelname)s [%(name)s] %(message)s')))
+    handler.addFilter(SamplingFilter(sample_rate))
+    root.addHandler(handler)
+    root.setLevel(level)
+    # Per-request access lines are covered by /metrics
+    logging.getLogger('werkzeug').setLevel(os.getenv('ACCESS_LOG_LEVEL', 'WARNING').upper())
+    root._wellmind_configured = True
@@ -0,0 +1,194 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/maintenance_jobs.py
+# Description: Periodic jobs: re-anchor simulated transactions, sweep stale pending workflows, reconcile aggregates
+# License: MIT
+
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+
+from database import db, AnchorOutbox, BurnoutResult, Employee, RiskAlert
+from services.aggregate_service import reconcile_aggregates
+from services.anchor_queue import SIMULATED_TXID
+from services.hedera_service import hedera_configured
+from services.http_cache import bump_data_version
+
+logger = logging.getLogger(__name__)
+
+# Rows per committed chunk, rows per run, and a pause between chunks so a
+# job never holds the write lock for long while surveys are coming in
+JOB_CHUNK_SIZE = int(os.getenv('JOB_CHUNK_SIZE', 500))
+JOB_MAX_ROWS = int(os.getenv('JOB_MAX_ROWS', 20000))
+JOB_CHUNK_PAUSE = float(os.getenv('JOB_CHUNK_PAUSE', 0.05))
+
+# Workflows requested longer ago than this and still pending were lost (process restart, full queue)
+WORKFLOW_STALE_AFTER = float(os.getenv('WORKFLOW_STALE_AFTER', 1800))
+# ... and still undelivered this long after the request: marked 'expired', no longer resubmitted
+WORKFLOW_MAX_AGE = float(os.getenv('WORKFLOW_MAX_AGE', 7 * 86400))
+
+
+def _chunks(query, id_column, limit=None, chunk_size=None):
+    """Yield id-ordered chunks of query's rows (keyset on id_column), pausing between them"""
+    limit = limit or JOB_MAX_ROWS
+    chunk_size = chunk_size or JOB_CHUNK_SIZE
+    last_id, seen = 0, 0
+    while seen < limit:
+        rows = db.session.execute(
+            query.where(id_column > last_id).order_by(id_column).limit(min(chunk_size, limit - seen))
+        ).all()
+        if not rows:
+            return
+        yield rows
+        seen += len(rows)
+        last_id = rows[-1][0]
+        time.sleep(JOB_CHUNK_PAUSE)
+
+
+def requeue_simulated_anchors(anchor_queue, limit=None, chunk_size=None):
+    """
+    Put results whose hedera_txid is simulated (failed anchoring, or
+    anchored before credentials were configured) back on the anchor outbox.
+    Workers re-anchor them with their usual retries; the simulated id
+    stays until a real one replaces it. Does nothing while Hedera is not
+    configured, as anchoring would only simulate again.
+
+    Returns:
+        int: results requeued
+    """
+    if not hedera_configured():
+        return 0
+
+    # Range instead of LIKE so the hedera_txid index is used on every dialect
+    simulated = db.or_(
+        BurnoutResult.hedera_txid == SIMULATED_TXID,
+        db.and_(BurnoutResult.hedera_txid >= 'simulate', BurnoutResult.hedera_txid < 'simulatf')
+    )
+    query = db.select(BurnoutResult.id, AnchorOutbox.status) \
+        .outerjoin(AnchorOutbox, AnchorOutbox.result_id == BurnoutResult.id) \
+        .where(simulated)
+
+    requeued = 0
+    for rows in _chunks(query, BurnoutResult.id, limit, chunk_size):
+        now = datetime.utcnow()
+        # Rows already pending or processing are on their way
+        finished = [result_id for result_id, status in rows if status in ('done', 'failed')]
+        missing = [result_id for result_id, status in rows if status is None]
+        if finished:
+            AnchorOutbox.query.filter(
+                AnchorOutbox.result_id.in_(finished), AnchorOutbox.status.in_(('done', 'failed'))
+            ).update({'status': 'pending', 'attempts': 0, 'last_error': None,
+                      'next_attempt_at': now, 'updated_at': now}, synchronize_session=False)
+        if missing:
+            db.session.execute(db.insert(AnchorOutbox), [
+                {'result_id': result_id, 'status': 'pending', 'attempts': 0,
+                 'next_attempt_at': now, 'created_at': now, 'updated_at': now}
+                for result_id in missing
+            ])
+        db.session.commit()
+        requeued += len(finished) + len(missing)
+
+    if requeued:
+        anchor_queue.notify()
+    return requeued
+
+
+def sweep_pending_workflows(dispatcher, limit=None, chunk_size=None):
+    """
+    Settle results whose workflow was requested (orchestrate_requested_at)
+    more than WORKFLOW_STALE_AFTER ago and is still 'pending' (alerts lost
+    with a restarted process or dropped by a full queue):
+
+        below the dispatch threshold, no alert -> 'not_required'
+        requested over WORKFLOW_MAX_AGE ago     -> 'expired'
+        otherwise                               -> submitted to the dispatcher again
+
+    Results with an escalation alert (RiskAlert) were made 'pending' by
+    the alert (ALERT_DISPATCH), so they stay due below the threshold.
+
+    Age counts from the request, not the result's watson_timestamp, so a
+    bulk import of historical surveys is dispatched like any other.
+    Pending rows from before orchestrate_requested_at existed are stamped
+    now and resubmitted rather than expired.
+
+    Returns:
+        int: results settled or resubmitted
+    """
+    now = datetime.utcnow()
+    stale_before = now - timedelta(seconds=WORKFLOW_STALE_AFTER)
+    expired_before = now - timedelta(seconds=WORKFLOW_MAX_AGE)
+    query = db.select(
+        BurnoutResult.id, BurnoutResult.employee_id, Employee.name, BurnoutResult.risk_score,
+        BurnoutResult.label, BurnoutResult.watson_timestamp, BurnoutResult.orchestrate_requested_at,
+        db.exists().where(RiskAlert.result_id == BurnoutResult.id).label('escalated')
+    ).join(Employee, Employee.id == BurnoutResult.employee_id).where(
+        BurnoutResult.orchestrate_status == 'pending',
+        db.func.coalesce(BurnoutResult.orchestrate_requested_at, BurnoutResult.watson_timestamp) < stale_before
+    )
+
+    swept = 0
+    for rows in _chunks(query, BurnoutResult.id, limit, chunk_size):
+        statuses = {'not_required': [], 'expired': []}
+        unstamped, resubmit = [], []
+        for row in rows:
+            result_id, employee_id, name, risk_score, label, timestamp, requested_at, escalated = row
+            if not (escalated or dispatcher.should_dispatch(risk_score, label)):
+                statuses['not_required'].append(result_id)
+            elif requested_at is None:
+                unstamped.append(result_id)
+                resubmit.append(row)
+            elif requested_at < expired_before:
+                statuses['expired'].append(result_id)
+            else:
+                resubmit.append(row)
+
+        changed = False
+        for status, result_ids in statuses.items():
+            if result_ids:
+                BurnoutResult.query.filter(
+                    BurnoutResult.id.in_(result_ids), BurnoutResult.orchestrate_status == 'pending'
+                ).update({'orchestrate_status': status}, synchronize_session=False)
+                changed = True
+        if unstamped:
+            BurnoutResult.query.filter(BurnoutResult.id.in_(unstamped)).update(
+                {'orchestrate_requested_at': now}, synchronize_session=False)
+        if changed:
+            bump_data_version()
+        db.session.commit()
+        swept += len(statuses['not_required']) + len(statuses['expired'])
+
+        for result_id, employee_id, name, risk_score, label, timestamp, _, _ in resubmit:
+            if not dispatcher.submit({
+                'id': result_id,
+                'employee_id': employee_id,
+                'employee_name': name,
+                'risk_score': risk_score,
+                'label': label,
+                'timestamp': timestamp.isoformat()
+            }):
+                return swept  # queue full; the rest stay pending for the next run
+            swept += 1
+    return swept
+
+
+def reconcile_aggregates_job():
+    """
+    Rewrite the department aggregates only when two consecutive scans
+    report the same drift; drift that changes between scans comes from
+    surveys committed mid-scan and is left for the next run.
+
+    Returns:
+        int: drifted fields corrected
+    """
+    drift = reconcile_aggregates(apply=False)['drift']
+    if not drift:
+        return 0
+    if reconcile_aggregates(apply=False)['drift'] != drift:
+        logger.info("Aggregate drift changed between scans, retrying on the next run")
+        return 0
+
+    report = reconcile_aggregates(apply=True)
+    bump_data_version()
+    db.session.commit()
+    logger.warning("Corrected %d drifted department aggregate field(s)", len(report['drift']))
+    return len(report['drift'])
@@ -0,0 +1,73 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/merkle.py
+# Description: Merkle tree helpers for batch-anchoring burnout result hashes on Hedera
+# License: MIT
+
+import hashlib
+
+# Domain separation so a leaf can never be passed off as an interior node
+_LEAF_PREFIX = b'\x00'
+_NODE_PREFIX = b'\x01'
+
+
+def _leaf(record_hash):
+    return hashlib.sha256(_LEAF_PREFIX + bytes.fromhex(record_hash)).digest()
+
+
+def _node(left, right):
+    return hashlib.sha256(_NODE_PREFIX + left + right).digest()
+
+
+def build_tree(record_hashes):
+    """
+    Build every level of the tree from hex SHA-256 record hashes.
+
+    Returns:
+        list[list[bytes]]: levels[0] are the leaves, levels[-1] == [root].
+        An odd node at the end of a level is carried up unchanged.
+    """
+    if not record_hashes:
+        raise ValueError('Cannot build a Merkle tree with no leaves')
+    levels = [[_leaf(h) for h in record_hashes]]
+    while len(levels[-1]) > 1:
+        current = levels[-1]
+        parent = [_node(current[i], current[i + 1]) for i in range(0, len(current) - 1, 2)]
+        if len(current) % 2:
+            parent.append(current[-1])
+        levels.append(parent)
+    return levels
+
+
+def merkle_root(levels):
+    return levels[-1][0].hex()
+
+
+def inclusion_proof(levels, index):
+    """
+    Sibling path from leaf `index` up to the root.
+
+    Returns:
+        list[dict]: [{'side': 'left'|'right', 'hash': hex}, ...] bottom-up
+    """
+    path = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            path.append({'side': 'left' if sibling < index else 'right', 'hash': level[sibling].hex()})
+        index //= 2
+    return path
+
+
+def verify_proof(record_hash, path, root):
+    """Recompute the root from a record hash and its inclusion path"""
+    try:
+        current = _leaf(record_hash)
+        for step in path:
+            sibling = bytes.fromhex(step['hash'])
+            if step['side'] == 'left':
+                current = _node(sibling, current)
+            else:
+                current = _node(current, sibling)
+    except (KeyError, TypeError, ValueError):
+        return False
+    return current.hex() == root
@@ -0,0 +1,213 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/metrics.py
+# Description: Prometheus-style metrics (route latency, SQL per request, external calls) and opt-in profiling
+# License: MIT
+
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+def _label_str(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(f'{n}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+                     for n, v in zip(names, values))
+    return '{' + pairs + '}'
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for values, total in sorted(self._values.items()):
+                lines.append(f'{self.name}{_label_str(self.labels, values)} {total}')
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for values, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    labels = _label_str(self.labels + ('le',), values + (bound,))
+                    lines.append(f'{self.name}_bucket{labels} {count}')
+                lines.append(f'{self.name}_bucket{_label_str(self.labels + ("le",), values + ("+Inf",))} {series[-1]}')
+                lines.append(f'{self.name}_sum{_label_str(self.labels, values)} {round(series[-2], 6)}')
+                lines.append(f'{self.name}_count{_label_str(self.labels, values)} {series[-1]}')
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, *args, **kwargs):
+        metric = Counter(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, *args, **kwargs):
+        metric = Histogram(*args, **kwargs)
+        self._metrics.append(metric)
+        return metric
+
+    def register_gauges(self, collector):
+        """collector() -> iterable of (name, help, labels dict, value), read at scrape time"""
+        self._collectors.append(collector)
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+
+        gauges = {}
+        for collector in self._collectors:
+            try:
+                samples = list(collector())
+            except Exception:
+                continue
+            for name, help_text, labels, value in samples:
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                gauges.setdefault(name, (help_text, []))[1].append(
+                    f'{name}{_label_str(tuple(labels), tuple(labels.values()))} {value}')
+        for name, (help_text, samples) in gauges.items():
+            lines.extend([f'# HELP {name} {help_text}', f'# TYPE {name} gauge', *samples])
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+http_requests = registry.counter(
+    'wellmind_http_requests_total', 'HTTP requests by route and status', ('method', 'route', 'status'))
+http_latency = registry.histogram(
+    'wellmind_http_request_duration_seconds', 'HTTP request latency', ('method', 'route'))
+sql_queries = registry.histogram(
+    'wellmind_sql_queries_per_request', 'SQL statements executed per HTTP request', ('route',), COUNT_BUCKETS)
+sql_time = registry.histogram(
+    'wellmind_sql_time_per_request_seconds', 'Time spent in SQL per HTTP request', ('route',))
+sql_background = registry.histogram(
+    'wellmind_sql_query_duration_seconds', 'SQL statement latency outside HTTP requests', ('context',))
+external_latency = registry.histogram(
+    'wellmind_external_call_duration_seconds', 'Latency of calls to external services', ('service', 'operation'))
+external_errors = registry.counter(
+    'wellmind_external_call_errors_total', 'Failed calls to external services', ('service', 'operation'))
+
+
+@contextmanager
+def track_external(service, operation):
+    """Time a call to Hedera / watsonx / Orchestrate and count failures"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        external_errors.inc(service, operation)
+        raise
+    finally:
+        external_latency.observe(time.perf_counter() - started, service, operation)
+
+
+def _route_label():
+    rule = request.url_rule
+    return rule.rule if rule is not None else 'unmatched'
+
+
+def instrument_engine(engine):
+    """Count and time the SQL statements run on engine (per request, or per background thread)"""
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_start'].pop()
+        if has_request_context() and 'sql_count' in g:
+            g.sql_count += 1
+            g.sql_time += elapsed
+        else:
+            sql_background.observe(elapsed, threading.current_thread().name.rsplit('-', 1)[0])
+
+
+def init_metrics(app, engine):
+    """Install request timing, SQL hooks, the /metrics endpoint and opt-in profiling"""
+    profiling_enabled = os.getenv('PROFILING_ENABLED', '0') == '1'
+    instrument_engine(engine)
+
+    @app.before_request
+    def _start_timer():
+        g.request_started = time.perf_counter()
+        g.sql_count = 0
+        g.sql_time = 0.0
+        if profiling_enabled and request.args.get('_profile') == '1':
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+
+    @app.after_request
+    def _record(response):
+        if 'request_started' not in g:
+            return response
+        route = _route_label()
+        http_latency.observe(time.perf_counter() - g.request_started, request.method, route)
+        http_requests.inc(request.method, route, response.status_code)
+        sql_queries.observe(g.sql_count, route)
+        sql_time.observe(g.sql_time, route)
+        response.headers['Server-Timing'] = (
+            f'app;dur={(time.perf_counter() - g.request_started) * 1000:.1f}, '
+            f'db;dur={g.sql_time * 1000:.1f};desc="{g.sql_count} queries"'
+        )
+
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(40)
+            return Response(out.getvalue(), mimetype='text/plain')
+        return response
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """Prometheus text exposition of all collected metrics"""
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4')
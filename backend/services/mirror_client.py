@@ -0,0 +1,155 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/mirror_client.py
+# Description: Batched reads of anchored HCS messages from a Hedera mirror node (plus an in-memory stub)
+# License: MIT
+
+import base64
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+
+import requests
+
+from services.metrics import track_external
+
+logger = logging.getLogger(__name__)
+
+MIRROR_URLS = {
+    'mainnet': 'https://mainnet-public.mirrornode.hedera.com',
+    'testnet': 'https://testnet.mirrornode.hedera.com',
+    'previewnet': 'https://previewnet.mirrornode.hedera.com',
+}
+
+
+def parse_topic_txid(hedera_txid):
+    """
+    'topic:<topic id>:<payer>@<seconds>.<nanos>' -> (topic id, (payer, seconds, nanos)),
+    or None for file anchors, simulated ids and anything unparseable.
+    """
+    if not hedera_txid or not hedera_txid.startswith('topic:'):
+        return None
+    try:
+        _, topic_id, tx_id = hedera_txid.split(':', 2)
+        payer, valid_start = tx_id.split('@', 1)
+        seconds, _, nanos = valid_start.partition('.')
+        return topic_id, (payer, int(seconds), int(nanos or 0))
+    except ValueError:
+        return None
+
+
+def _decode(message):
+    try:
+        return json.loads(base64.b64decode(message))
+    except (ValueError, TypeError):
+        return None
+
+
+class MirrorNodeClient:
+    """
+    Reads topic messages from the mirror node REST API in batches.
+
+    Instead of one lookup per transaction, anchors are grouped by topic and
+    by time: every span of span_seconds is read with one paged range query
+    (/api/v1/topics/{id}/messages?timestamp=gte:..&timestamp=lte:..) and
+    messages are matched back to transaction ids via chunk_info.
+    """
+
+    def __init__(self, base_url=None, timeout=10, span_seconds=600, settle_seconds=60, page_limit=100):
+        network = os.getenv('NETWORK', 'testnet').lower()
+        self.base_url = (base_url or os.getenv('HEDERA_MIRROR_URL') or MIRROR_URLS.get(network, MIRROR_URLS['testnet'])).rstrip('/')
+        self.timeout = timeout
+        self.span_seconds = span_seconds
+        self.settle_seconds = settle_seconds  # consensus time trails valid start by a few seconds
+        self.page_limit = page_limit
+        self.session = requests.Session()
+
+    def fetch_messages(self, hedera_txids):
+        """
+        Returns:
+            dict: {hedera_txid: decoded JSON message, or None when not found};
+            transactions whose range query failed are left out
+        """
+        found = dict.fromkeys(hedera_txids)
+        by_topic = defaultdict(list)
+        for txid in hedera_txids:
+            parsed = parse_topic_txid(txid)
+            if parsed:
+                by_topic[parsed[0]].append((parsed[1], txid))
+
+        for topic_id, items in by_topic.items():
+            items.sort(key=lambda item: item[0][1:])
+            wanted = {key: txid for key, txid in items}
+            span = []
+            for key, txid in items:
+                if span and key[1] - span[0][1] > self.span_seconds:
+                    self._read_span_safely(topic_id, span, wanted, found)
+                    span = []
+                span.append(key)
+            if span:
+                self._read_span_safely(topic_id, span, wanted, found)
+        return found
+
+    def _read_span_safely(self, topic_id, keys, wanted, found):
+        """One failed span only drops its own unresolved transactions, not the rest of the batch"""
+        try:
+            self._read_span(topic_id, keys, wanted, found)
+        except Exception as e:
+            unresolved = [wanted[key] for key in keys if found.get(wanted[key]) is None]
+            for txid in unresolved:
+                found.pop(txid, None)
+            logger.warning("Mirror node read of topic %s failed, %d anchor(s) unresolved: %s",
+                           topic_id, len(unresolved), e)
+
+    def _read_span(self, topic_id, keys, wanted, found):
+        start = f'{keys[0][1]}.{keys[0][2]:09d}'
+        end = f'{keys[-1][1] + self.settle_seconds}.999999999'
+        url = (f'{self.base_url}/api/v1/topics/{topic_id}/messages'
+               f'?timestamp=gte:{start}&timestamp=lte:{end}&order=asc&limit={self.page_limit}')
+        remaining = len(keys)
+        while url and remaining:
+            with track_external('hedera_mirror', 'topic_messages'):
+                resp = self.session.get(url, timeout=self.timeout)
+                resp.raise_for_status()
+                data = resp.json()
+            for message in data.get('messages', []):
+                initial = (message.get('chunk_info') or {}).get('initial_transaction_id') or {}
+                seconds, _, nanos = str(initial.get('transaction_valid_start', '')).partition('.')
+                try:
+                    key = (initial.get('account_id'), int(seconds), int(nanos.ljust(9, '0')[:9] or 0))
+                except ValueError:
+                    continue
+                txid = wanted.get(key)
+                if txid and found.get(txid) is None:
+                    found[txid] = _decode(message.get('message'))
+                    remaining -= 1
+            next_link = (data.get('links') or {}).get('next')
+            url = f'{self.base_url}{next_link}' if next_link else None
+
+
+class StubMirrorClient:
+    """
+    In-memory mirror node for tests and local runs (HEDERA_MIRROR_URL=stub).
+    record() what an anchor stub "published"; fetch_messages() reads it back.
+    """
+
+    def __init__(self):
+        self._messages = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+
+    def record(self, hedera_txid, message):
+        with self._lock:
+            self._messages[hedera_txid] = json.loads(message) if isinstance(message, str) else message
+
+    def fetch_messages(self, hedera_txids):
+        with self._lock:
+            self.requests += 1
+            return {txid: self._messages.get(txid) for txid in hedera_txids}
+
+
+def get_mirror_client():
+    if os.getenv('HEDERA_MIRROR_URL', '').lower() == 'stub':
+        return StubMirrorClient()
+    return MirrorNodeClient()
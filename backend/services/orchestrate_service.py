@@ -4,9 +4,18 @@
 # Author: Ahmad Yasser (Technical Architecture)
 # License: MIT
 
+import logging
 import os
 import requests
 
+from services.log import SAMPLED
+from services.metrics import track_external
+
+logger = logging.getLogger(__name__)
+
+# Shared keep-alive connections for batched workflow calls
+_session = requests.Session()
+
 def trigger_workflow(record):
     """
     Trigger Watson Orchestrate workflow based on burnout risk level
@@ -22,34 +31,98 @@ def trigger_workflow(record):
     orchestrate_key = os.getenv('ORCHESTRATE_API_KEY')
     
     if not orchestrate_url or not orchestrate_key:
-        print("Orchestrate not configured, simulating workflow trigger")
+        logger.debug("Orchestrate not configured, simulating workflow trigger")
         return _simulate_workflow(record)
     
     try:
-        payload = {
-            'employee_id': record.get('employee_id'),
-            'employee_name': record.get('employee_name', 'Unknown'),
-            'risk_score': record.get('risk_score'),
-            'label': record.get('label'),
-            'timestamp': record.get('timestamp')
-        }
+        payload = _build_payload(record)
         
         headers = {
             'Authorization': f'Bearer {orchestrate_key}',
             'Content-Type': 'application/json'
         }
         
-        resp = requests.post(orchestrate_url, json=payload, headers=headers, timeout=10)
-        resp.raise_for_status()
+        with track_external('orchestrate', 'trigger'):
+            resp = requests.post(orchestrate_url, json=payload, headers=headers, timeout=10)
+            resp.raise_for_status()
         
         result = resp.json()
-        print(f"Orchestrate workflow triggered: {result}")
+        logger.debug("Orchestrate workflow triggered: %s", result, extra=SAMPLED)
         return result
         
     except Exception as e:
-        print(f"Orchestrate API error: {e}, falling back to simulation")
+        logger.warning("Orchestrate API error: %s, falling back to simulation", e)
         return _simulate_workflow(record)
 
+class WorkflowBatchError(Exception):
+    """A batch sent alert by alert stopped part-way; `sent` were delivered before the error"""
+
+    def __init__(self, error, sent):
+        super().__init__(str(error))
+        self.sent = sent
+
+def trigger_workflow_batch(records):
+    """
+    Trigger workflows for several alerts
+    
+    With ORCHESTRATE_BATCH_URL set, posts {'alerts': [payload, ...]} there
+    in one request. Otherwise each alert is posted to ORCHESTRATE_URL with
+    the single-alert payload trigger_workflow sends, which is all that
+    endpoint accepts. Unlike trigger_workflow, errors are raised so the
+    caller can retry; WorkflowBatchError.sent lists the alerts delivered
+    before an alert-by-alert send failed.
+    
+    Args:
+        records (list[dict]): BurnoutResult-like dicts
+    
+    Returns:
+        dict: { 'status': 'triggered'|'simulated', 'response': API response(s) or simulated results }
+    """
+    batch_url = os.getenv('ORCHESTRATE_BATCH_URL')
+    orchestrate_url = os.getenv('ORCHESTRATE_URL')
+    orchestrate_key = os.getenv('ORCHESTRATE_API_KEY')
+    
+    if not (batch_url or orchestrate_url) or not orchestrate_key:
+        return {'status': 'simulated', 'response': [_simulate_workflow(r) for r in records]}
+    
+    headers = {
+        'Authorization': f'Bearer {orchestrate_key}',
+        'Content-Type': 'application/json'
+    }
+    if batch_url:
+        with track_external('orchestrate', 'trigger_batch'):
+            resp = _session.post(
+                batch_url,
+                json={'alerts': [_build_payload(r) for r in records]},
+                headers=headers,
+                timeout=10
+            )
+            resp.raise_for_status()
+        return {'status': 'triggered', 'response': resp.json()}
+    
+    responses = []
+    for record in records:
+        try:
+            with track_external('orchestrate', 'trigger'):
+                resp = _session.post(orchestrate_url, json=_build_payload(record), headers=headers, timeout=10)
+                resp.raise_for_status()
+        except Exception as e:
+            raise WorkflowBatchError(e, records[:len(responses)]) from e
+        try:
+            responses.append(resp.json())
+        except ValueError:
+            responses.append(None)  # delivered; the body is informational only
+    return {'status': 'triggered', 'response': responses}
+
+def _build_payload(record):
+    return {
+        'employee_id': record.get('employee_id'),
+        'employee_name': record.get('employee_name', 'Unknown'),
+        'risk_score': record.get('risk_score'),
+        'label': record.get('label'),
+        'timestamp': record.get('timestamp')
+    }
+
 def _simulate_workflow(record):
     """Simulate workflow trigger for demo/testing"""
     risk_score = record.get('risk_score', 0)
@@ -0,0 +1,237 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/scheduler.py
+# Description: In-process periodic job scheduler with a database run lock per job, jitter and run history
+# License: MIT
+
+import logging
+import os
+import random
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+
+from database import db, current_tenant, each_tenant, JobRun, ScheduledJob
+
+logger = logging.getLogger(__name__)
+
+
+class Scheduler:
+    """
+    Runs registered maintenance jobs at fixed intervals in every worker
+    process, while each job executes in only one of them at a time.
+
+    Schedules live in the scheduled_job table. A worker runs a due job only
+    after winning it with a conditional UPDATE that sets locked_by and a
+    lease (same claim pattern as the anchor outbox), so several gunicorn
+    workers or hosts never duplicate a run; a lock left by a dead process
+    expires with its lease. The next run is interval seconds after the
+    previous one finished, +/- jitter, so workers do not wake in lockstep.
+    Every run is recorded in job_run (pruned after history_days).
+
+    Schedules, locks and history are kept per tenant: each poll runs the
+    due jobs of every tenant in turn, each inside its tenant context.
+
+    Jobs run inside an app context and return the number of rows they
+    processed; they should work in short committed chunks.
+    """
+
+    def __init__(self, poll_interval=None, jitter=None, lease=None, history_days=None):
+        self.poll_interval = poll_interval or float(os.getenv('SCHEDULER_POLL_INTERVAL', 15))
+        self.jitter = jitter if jitter is not None else float(os.getenv('SCHEDULER_JITTER', 0.1))
+        self.lease = lease or float(os.getenv('SCHEDULER_LEASE', 900))
+        self.history_days = history_days or float(os.getenv('SCHEDULER_HISTORY_DAYS', 30))
+        self.enabled = os.getenv('SCHEDULER_ENABLED', '1') == '1'
+
+        self.jobs = {}
+        self.app = None
+        self._thread = None
+        self._stopping = threading.Event()
+        self._synced = set()  # tenants whose schedule rows exist
+        self._stats = {'runs': 0, 'failures': 0, 'skipped': 0}
+        self._stats_lock = threading.Lock()
+
+    def register(self, name, func, interval):
+        """Add a job; interval <= 0 disables it"""
+        if interval > 0:
+            self.jobs[name] = {'func': func, 'interval': interval}
+
+    def init_app(self, app, start=True):
+        self.app = app
+        app.extensions['scheduler'] = self
+        if start and self.enabled and self.jobs:
+            self.start()
+
+    @property
+    def owner(self):
+        # Computed on use: gunicorn workers fork after the module is imported
+        return f'{socket.gethostname()}:{os.getpid()}'
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if self._thread:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name='scheduler', daemon=True)
+        self._thread.start()
+        logger.info("Scheduler started with %d job(s)", len(self.jobs))
+
+    def stop(self, timeout=10):
+        """Stop polling; a job that is running finishes its current run"""
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        # Spread the first poll of each worker over one poll interval
+        wait = random.uniform(0, self.poll_interval)
+        while not self._stopping.wait(wait):
+            for tenant in each_tenant():
+                if self._stopping.is_set():
+                    break
+                try:
+                    with self.app.app_context():
+                        self.run_due()
+                except Exception as e:
+                    logger.exception("Scheduler poll failed (%s): %s", tenant, e)
+            wait = self.poll_interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    # ------------------------------------------------------------------
+    # Running jobs
+    # ------------------------------------------------------------------
+
+    def run_due(self):
+        """Run every due job of the current tenant whose lock is free. Must run inside an app context."""
+        self._sync()
+        now = datetime.utcnow()
+        due = db.session.execute(
+            db.select(ScheduledJob.name).where(
+                ScheduledJob.name.in_(list(self.jobs)),
+                ScheduledJob.next_run_at <= now,
+                db.or_(ScheduledJob.locked_until.is_(None), ScheduledJob.locked_until < now)
+            ).order_by(ScheduledJob.next_run_at)
+        ).scalars().all()
+        db.session.commit()
+        for name in due:
+            if self._stopping.is_set():
+                break
+            self.run(name)
+
+    def run(self, name, force=False):
+        """
+        Run one job for the current tenant if this process wins its lock.
+
+        Args:
+            force (bool): run even if not yet due (CLI); still skipped while another worker holds the lock
+        Returns:
+            JobRun | None: the recorded run, or None when another worker had it
+        """
+        job = self.jobs[name]
+        self._sync()
+        owner = self.owner
+        now = datetime.utcnow()
+        conditions = [
+            ScheduledJob.name == name,
+            db.or_(ScheduledJob.locked_until.is_(None), ScheduledJob.locked_until < now)
+        ]
+        if not force:
+            conditions.append(ScheduledJob.next_run_at <= now)
+        claimed = ScheduledJob.query.filter(*conditions).update(
+            {'locked_by': owner, 'locked_until': now + timedelta(seconds=self.lease)}, synchronize_session=False)
+        db.session.commit()
+        if not claimed:
+            self._count('skipped')
+            return None
+
+        started, timer = datetime.utcnow(), time.perf_counter()
+        processed, error = None, None
+        try:
+            processed = job['func']()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            error = str(e)[:255]
+            logger.exception("Job %s failed: %s", name, e)
+        finished = datetime.utcnow()
+        status = 'error' if error else 'ok'
+
+        spread = job['interval'] * random.uniform(1 - self.jitter, 1 + self.jitter)
+        ScheduledJob.query.filter_by(name=name, locked_by=owner).update({
+            'locked_by': None, 'locked_until': None, 'last_status': status,
+            'last_started_at': started, 'last_finished_at': finished,
+            'next_run_at': finished + timedelta(seconds=spread)
+        }, synchronize_session=False)
+        run = JobRun(job_name=name, worker=owner, status=status, processed=processed, error=error,
+                     started_at=started, finished_at=finished,
+                     duration_ms=int((time.perf_counter() - timer) * 1000))
+        db.session.add(run)
+        JobRun.query.filter(
+            JobRun.job_name == name, JobRun.started_at < finished - timedelta(days=self.history_days)
+        ).delete(synchronize_session=False)
+        db.session.commit()
+
+        self._count('failures' if error else 'runs')
+        if processed:
+            logger.info("Job %s processed %s row(s) in %dms", name, processed, run.duration_ms)
+        return run
+
+    def _sync(self):
+        """Create the current tenant's schedule rows for jobs registered since the table was last seen"""
+        tenant = current_tenant()
+        if tenant in self._synced:
+            return
+        known = set(db.session.execute(db.select(ScheduledJob.name)).scalars())
+        now = datetime.utcnow()
+        for name, job in self.jobs.items():
+            if name in known:
+                continue
+            try:
+                with db.session.begin_nested():
+                    # First run within one jitter span of startup
+                    first = now + timedelta(seconds=job['interval'] * random.uniform(0, self.jitter))
+                    db.session.add(ScheduledJob(name=name, next_run_at=first))
+            except IntegrityError:
+                pass  # another worker registered it first
+        db.session.commit()
+        self._synced.add(tenant)
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def status(self, history=10):
+        """Schedule, lock holder and the most recent runs of every registered job of the current tenant"""
+        self._sync()
+        out = {}
+        for row in ScheduledJob.query.filter(ScheduledJob.name.in_(list(self.jobs))).order_by(ScheduledJob.name):
+            runs = JobRun.query.filter_by(job_name=row.name).order_by(JobRun.id.desc()).limit(history).all()
+            out[row.name] = {
+                'interval_seconds': self.jobs[row.name]['interval'],
+                'next_run_at': row.next_run_at.isoformat(),
+                'locked_by': row.locked_by,
+                'last_status': row.last_status,
+                'last_finished_at': row.last_finished_at.isoformat() if row.last_finished_at else None,
+                'runs': [{
+                    'worker': run.worker,
+                    'status': run.status,
+                    'processed': run.processed,
+                    'error': run.error,
+                    'started_at': run.started_at.isoformat(),
+                    'duration_ms': run.duration_ms
+                } for run in runs]
+            }
+        return out
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def stats(self):
+        with self._stats_lock:
+            return dict(self._stats, jobs=len(self.jobs))
@@ -0,0 +1,207 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/scoring.py
+# Description: Single source of truth for burnout risk heuristics, scoring one record or a NumPy batch
+# License: MIT
+
+import json
+import os
+
+import numpy as np
+
+
+class Term:
+    """
+    One weighted input of a linear risk model:
+    contribution = clip(value / scale * weight, floor, cap), where value is
+    replaced by (invert_from - value) for protective factors like sleep
+    """
+
+    def __init__(self, field, default, scale, weight, invert_from=None, floor=None, cap=None):
+        self.field = field
+        self.default = default
+        self.scale = scale
+        self.weight = weight
+        self.invert_from = invert_from
+        self.floor = floor
+        self.cap = cap
+
+    def contribution(self, values):
+        if self.invert_from is not None:
+            values = self.invert_from - values
+        out = values / self.scale * self.weight
+        if self.floor is not None or self.cap is not None:
+            out = np.clip(out, self.floor, self.cap)
+        return out
+
+
+class ScoringModel:
+    """
+    Linear burnout heuristic with label thresholds.
+
+    thresholds: [(score, label), ...] from highest to lowest; a score
+    at or above (inclusive=True) / strictly above the bound gets the label.
+    Scores below every bound get default_label.
+
+    falsy_is_missing: treat 0 / '' like an absent answer and use the term
+    default (the survey form's behaviour); otherwise only None is missing.
+    """
+
+    def __init__(self, name, terms, thresholds, default_label='Low', inclusive=True, clamp=None,
+                 falsy_is_missing=True):
+        self.name = name
+        self.terms = terms
+        self.thresholds = [(float(bound), label) for bound, label in thresholds]
+        self.default_label = default_label
+        self.inclusive = inclusive
+        self.clamp = clamp
+        self.falsy_is_missing = falsy_is_missing
+
+    @property
+    def fields(self):
+        return [term.field for term in self.terms]
+
+    def with_overrides(self, weights=None, thresholds=None):
+        """Copy of this model with some term weights and/or the thresholds replaced"""
+        weights = weights or {}
+        unknown = set(weights) - set(self.fields)
+        if unknown:
+            raise ValueError(f"Unknown scoring fields: {', '.join(sorted(unknown))}")
+        terms = [
+            Term(t.field, t.default, t.scale, float(weights.get(t.field, t.weight)), t.invert_from, t.floor, t.cap)
+            for t in self.terms
+        ]
+        return ScoringModel(self.name, terms, thresholds or self.thresholds,
+                            self.default_label, self.inclusive, self.clamp, self.falsy_is_missing)
+
+    # ------------------------------------------------------------------
+    # Input conversion
+    # ------------------------------------------------------------------
+
+    def columns_from_records(self, records):
+        """Turn a list of dicts into {field: int64 array}, applying per-field defaults"""
+        return {
+            term.field: np.fromiter(
+                (self._to_int(record.get(term.field), term.default) for record in records),
+                dtype=np.int64, count=len(records)
+            )
+            for term in self.terms
+        }
+
+    def columns_from_lists(self, columns, length):
+        """Validate caller-supplied columns; missing fields are filled with their default"""
+        out = {}
+        for term in self.terms:
+            values = columns.get(term.field)
+            if values is None:
+                out[term.field] = np.full(length, term.default, dtype=np.int64)
+                continue
+            if len(values) != length:
+                raise ValueError(f'Column {term.field} has {len(values)} values, expected {length}')
+            out[term.field] = np.fromiter((self._to_int(v, term.default) for v in values), dtype=np.int64, count=length)
+        return out
+
+    def _to_int(self, value, default):
+        if value is None or (self.falsy_is_missing and not value):
+            return default
+        try:
+            return int(value)
+        except (ValueError, TypeError):
+            return default
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    def score_columns(self, columns):
+        """
+        Score whole columns at once.
+
+        Args:
+            columns (dict): field -> NumPy array (all the same length)
+        Returns:
+            tuple: (int64 array of scores, object array of labels)
+        """
+        total = None
+        for term in self.terms:
+            part = term.contribution(columns[term.field].astype(np.float64))
+            total = part if total is None else total + part
+        if self.clamp:
+            total = np.clip(total, *self.clamp)
+        scores = np.rint(total).astype(np.int64)
+        return scores, self.labels_for(scores)
+
+    def labels_for(self, scores):
+        if self.inclusive:
+            conditions = [scores >= bound for bound, _ in self.thresholds]
+        else:
+            conditions = [scores > bound for bound, _ in self.thresholds]
+        labels = [label for _, label in self.thresholds]
+        return np.select(conditions, labels, default=self.default_label).astype(object)
+
+    def score_records(self, records):
+        return self.score_columns(self.columns_from_records(records))
+
+    def score(self, record):
+        """Score one record: { 'risk': int, 'label': str }"""
+        scores, labels = self.score_records([record])
+        return {'risk': int(scores[0]), 'label': str(labels[0])}
+
+    def label_for(self, score):
+        return str(self.labels_for(np.array([score]))[0])
+
+
+# Survey form model used by /api/survey, /api/predict and bulk import
+SURVEY_MODEL = ScoringModel(
+    'survey',
+    terms=[
+        Term('work_hours', default=40, scale=40, weight=50),
+        Term('stress', default=5, scale=10, weight=50),
+    ],
+    thresholds=[(70, 'High'), (40, 'Medium')],
+)
+
+# Fallback for watsonx.ai analysis of the extended questionnaire
+WEIGHTED_MODEL = ScoringModel(
+    'weighted',
+    terms=[
+        Term('work_hours', default=40, scale=40, weight=35, cap=35),
+        Term('stress', default=5, scale=10, weight=30),
+        Term('workload', default=5, scale=10, weight=20),
+        Term('support', default=5, scale=10, weight=10, invert_from=10, floor=0),
+        Term('sleep', default=7, scale=7, weight=5, invert_from=7, floor=0),
+    ],
+    thresholds=[(80, 'Urgent'), (60, 'High'), (40, 'Medium')],
+    inclusive=False,
+    clamp=(0, 100),
+    falsy_is_missing=False,
+)
+
+
+
+def _apply_env_overrides(model, prefix):
+    """e.g. SURVEY_SCORING_WEIGHTS='{"stress": 60}', SURVEY_SCORING_THRESHOLDS='[[75, "High"], [45, "Medium"]]'"""
+    weights = os.getenv(f'{prefix}_WEIGHTS')
+    thresholds = os.getenv(f'{prefix}_THRESHOLDS')
+    if not weights and not thresholds:
+        return model
+    return model.with_overrides(
+        json.loads(weights) if weights else None,
+        json.loads(thresholds) if thresholds else None
+    )
+
+
+SURVEY_MODEL = _apply_env_overrides(SURVEY_MODEL, 'SURVEY_SCORING')
+WEIGHTED_MODEL = _apply_env_overrides(WEIGHTED_MODEL, 'WEIGHTED_SCORING')
+
+MODELS = {model.name: model for model in (SURVEY_MODEL, WEIGHTED_MODEL)}
+
+
+def get_model(name=None, weights=None, thresholds=None):
+    """Look up a model by name, optionally with weight/threshold overrides"""
+    try:
+        model = MODELS[name or SURVEY_MODEL.name]
+    except KeyError:
+        raise ValueError(f"Unknown scoring model: {name}")
+    if weights or thresholds:
+        model = model.with_overrides(weights, thresholds)
+    return model
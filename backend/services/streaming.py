@@ -0,0 +1,27 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/streaming.py
+# Description: Chunked JSON responses that never hold the whole payload in memory
+# License: MIT
+
+import json
+
+
+def json_stream(envelope, key, items, chunk_size=200):
+    """
+    Yield a JSON object as text chunks: the envelope fields followed by
+    key: [items...], serializing chunk_size items per chunk.
+
+        {"employee": {...}, "submissions": [{...}, {...}]}
+    """
+    head = json.dumps(envelope)[:-1]
+    yield head + (', ' if envelope else '') + json.dumps(key) + ': ['
+
+    buffer, first = [], True
+    for item in items:
+        buffer.append(json.dumps(item))
+        if len(buffer) >= chunk_size:
+            yield ('' if first else ', ') + ', '.join(buffer)
+            buffer, first = [], False
+    if buffer:
+        yield ('' if first else ', ') + ', '.join(buffer)
+    yield ']}'
@@ -0,0 +1,99 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/survey_service.py
+# Description: Validation and risk scoring shared by single and bulk survey submission
+# License: MIT
+
+import time
+
+import numpy as np
+
+from database import db, BurnoutResult
+from services.scoring import SURVEY_MODEL
+
+REQUIRED_FIELDS = ('name', 'email', 'department')
+
+
+class SurveyValidationError(ValueError):
+    """Raised when a survey record is missing required data"""
+
+
+def parse_survey(data):
+    """
+    Validate a survey record and score it.
+
+    Args:
+        data (dict): name, email, department and optional work_hours, stress
+    Returns:
+        dict: normalized employee fields plus work_hours, stress_level, risk_score, label
+    Raises:
+        SurveyValidationError: when a required field is missing
+    """
+    if not data:
+        raise SurveyValidationError('No data provided')
+
+    for field in REQUIRED_FIELDS:
+        if not data.get(field):
+            raise SurveyValidationError(f'Missing required field: {field}')
+
+    # Calculate burnout risk with safe conversion
+    columns = SURVEY_MODEL.columns_from_records([data])
+    scores, labels = SURVEY_MODEL.score_columns(columns)
+
+    return {
+        'name': data.get('name'),
+        'email': data.get('email'),
+        'department': data.get('department'),
+        'work_hours': int(columns['work_hours'][0]),
+        'stress_level': int(columns['stress'][0]),
+        'risk_score': int(scores[0]),
+        'label': str(labels[0])
+    }
+
+
+def rescore_results(model=None, chunk_size=10000, apply=True):
+    """
+    Re-score stored results with the current (or an overridden) survey model.
+
+    Walks the current tenant's burnout_result rows in id order, scores
+    each chunk as NumPy columns and writes back only rows whose score or
+    label changed. Only work_hours and stress are stored, so other model
+    inputs use defaults. Department aggregates must be reconciled afterwards.
+
+    Returns:
+        dict: { 'scanned': int, 'changed': int, 'elapsed_seconds': float }
+    """
+    model = model or SURVEY_MODEL
+    started = time.perf_counter()
+    table = BurnoutResult.__table__
+    update = table.update().where(table.c.id == db.bindparam('rid')).values(
+        risk_score=db.bindparam('score'), label=db.bindparam('new_label'))
+
+    scanned = changed = 0
+    last_id = 0
+    while True:
+        # ORM columns so the scan is limited to the current tenant; the update goes by id
+        rows = db.session.execute(
+            db.select(BurnoutResult.id, BurnoutResult.work_hours, BurnoutResult.stress_level,
+                      BurnoutResult.risk_score, BurnoutResult.label)
+            .where(BurnoutResult.id > last_id).order_by(BurnoutResult.id).limit(chunk_size)
+        ).all()
+        if not rows:
+            break
+        ids, hours, stress, old_scores, old_labels = zip(*rows)
+        columns = model.columns_from_lists({'work_hours': hours, 'stress': stress}, len(rows))
+        scores, labels = model.score_columns(columns)
+
+        mask = (scores != np.asarray(old_scores)) | (labels != np.asarray(old_labels, dtype=object))
+        updates = [
+            {'rid': ids[i], 'score': int(scores[i]), 'new_label': str(labels[i])}
+            for i in np.flatnonzero(mask)
+        ]
+        if updates and apply:
+            db.session.execute(update, updates)
+            db.session.commit()
+
+        scanned += len(rows)
+        changed += len(updates)
+        last_id = ids[-1]
+
+    return {'scanned': scanned, 'changed': changed, 'elapsed_seconds': round(time.perf_counter() - started, 3)}
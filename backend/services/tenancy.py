@@ -0,0 +1,120 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/tenancy.py
+# Description: Tenant resolution per request, engine routing for database-per-tenant isolation, per-tenant CLI runs
+# License: MIT
+
+import functools
+import logging
+import os
+import threading
+
+import click
+from flask import g, jsonify, request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+
+from database import (
+    db, DEFAULT_TENANT, TENANTS, _current_tenant, _tune_sqlite, engine_options,
+    set_tenant_engine_resolver, tenant_context
+)
+from services.metrics import instrument_engine
+
+logger = logging.getLogger(__name__)
+
+TENANT_HEADER = 'X-Tenant-ID'
+
+# column: shared tables filtered by tenant_id (default)
+# database: each tenant in its own SQLite file, or PostgreSQL schema, on top of that
+TENANT_ISOLATION = os.getenv('TENANT_ISOLATION', 'column').lower()
+
+
+class TenantRouter:
+    """
+    Engine per tenant for TENANT_ISOLATION=database.
+
+    The default tenant keeps the configured database. On SQLite every other
+    tenant gets its own file in TENANT_SQLITE_DIR (instance/tenants), with
+    the same tuning and metrics hooks; on PostgreSQL it gets the schema
+    tenant_<id> through a schema_translate_map view of the main engine,
+    sharing its connection pool. Either way one tenant's scans and write
+    locks never touch another tenant's tables.
+    """
+
+    def __init__(self, sqlite_dir=None):
+        self.sqlite_dir = sqlite_dir or os.getenv('TENANT_SQLITE_DIR')
+        self.app = None
+        self._engines = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['tenant_router'] = self
+        self.sqlite_dir = self.sqlite_dir or os.path.join(app.root_path, 'instance', 'tenants')
+        set_tenant_engine_resolver(self.engine_for)
+
+    def engine_for(self, tenant):
+        if tenant == DEFAULT_TENANT:
+            return None
+        engine = self._engines.get(tenant)
+        if engine is None:
+            with self._lock:
+                engine = self._engines.get(tenant) or self._create(tenant)
+                self._engines[tenant] = engine
+        return engine
+
+    def _create(self, tenant):
+        base = db.engines[None]
+        if base.dialect.name != 'sqlite':
+            return base.execution_options(schema_translate_map={None: f'tenant_{tenant}'})
+
+        os.makedirs(self.sqlite_dir, exist_ok=True)
+        url = 'sqlite:///' + os.path.join(self.sqlite_dir, f'{tenant}.db')
+        engine = create_engine(url, **engine_options(url))
+        if os.getenv('SQLITE_TUNING', '1') != '0':
+            event.listen(engine, 'connect', _tune_sqlite)
+        instrument_engine(engine)
+        logger.info("Tenant %s uses %s", tenant, make_url(url))
+        return engine
+
+    def dispose(self):
+        for engine in self._engines.values():
+            if hasattr(engine, 'dispose'):
+                engine.dispose()
+
+
+def init_tenancy(app, router=None):
+    """
+    Resolve the tenant of every request from the X-Tenant-ID header (or
+    ?tenant=), defaulting to DEFAULT_TENANT; unknown tenants get 404.
+    """
+    if TENANT_ISOLATION == 'database':
+        (router or TenantRouter()).init_app(app)
+
+    @app.before_request
+    def _bind_tenant():
+        tenant = request.headers.get(TENANT_HEADER) or request.args.get('tenant') or DEFAULT_TENANT
+        if tenant not in TENANTS:
+            return jsonify({'error': f'Unknown tenant: {tenant}'}), 404
+        g.tenant_token = _current_tenant.set(tenant)
+
+    @app.teardown_request
+    def _unbind_tenant(exc):
+        token = g.pop('tenant_token', None)
+        if token is not None:
+            _current_tenant.reset(token)
+
+
+def tenant_command(f):
+    """CLI commands: run once per tenant (every tenant unless --tenant is given)"""
+    @click.option('--tenant', 'tenants', multiple=True, type=click.Choice(TENANTS),
+                  help='Tenant to run for (repeatable; default: all tenants)')
+    @functools.wraps(f)
+    def wrapper(*args, tenants=(), **kwargs):
+        for tenant in tenants or TENANTS:
+            with tenant_context(tenant):
+                if len(TENANTS) > 1:
+                    click.echo(f'[{tenant}]')
+                f(*args, **kwargs)
+            # A fresh session per tenant: ids repeat across tenant databases
+            db.session.remove()
+    return wrapper
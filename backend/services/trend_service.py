@@ -0,0 +1,156 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/trend_service.py
+# Description: Daily / weekly per-department risk rollups and the range queries behind /api/trends
+# License: MIT
+
+import math
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+
+from database import db, BurnoutResult, Employee, DepartmentRiskRollup
+from services.aggregate_service import label_bucket
+
+GRANULARITIES = ('day', 'week')
+ROLLUP_FIELDS = ('result_count', 'risk_sum', 'risk_sq_sum', 'high_count', 'medium_count', 'low_count')
+
+
+def bucket_start(timestamp, granularity):
+    """Day, or Monday of the week, containing timestamp"""
+    day = timestamp.date() if isinstance(timestamp, datetime) else timestamp
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def rollup_delta(risk_score, label):
+    """Rollup increments contributed by one result"""
+    risk = risk_score or 0
+    return {'result_count': 1, 'risk_sum': risk, 'risk_sq_sum': risk * risk, label_bucket(label): 1}
+
+
+def merge_rollup(deltas, department, timestamp, risk_score, label):
+    """Fold one result into a {(granularity, bucket, department): delta} accumulator for every granularity"""
+    delta = rollup_delta(risk_score, label)
+    for granularity in GRANULARITIES:
+        target = deltas.setdefault((granularity, bucket_start(timestamp, granularity), department), {})
+        for field, value in delta.items():
+            target[field] = target.get(field, 0) + value
+
+
+def _apply_bucket(granularity, start, department, delta):
+    """Same col = col + n update / savepoint insert as aggregate_service.apply_delta"""
+    model = DepartmentRiskRollup
+    changes = {getattr(model, k): getattr(model, k) + v for k, v in delta.items()}
+    changes[model.updated_at] = datetime.utcnow()
+
+    def _update():
+        return model.query.filter_by(
+            granularity=granularity, bucket_start=start, department=department
+        ).update(changes, synchronize_session=False)
+
+    if _update():
+        return
+    try:
+        with db.session.begin_nested():
+            row = {field: 0 for field in ROLLUP_FIELDS}
+            row.update(delta)
+            db.session.add(model(granularity=granularity, bucket_start=start, department=department, **row))
+    except IntegrityError:
+        _update()
+
+
+def apply_rollups(deltas):
+    """Apply accumulated rollup deltas inside the caller's transaction, one UPDATE per bucket"""
+    for (granularity, start, department), delta in deltas.items():
+        _apply_bucket(granularity, start, department, delta)
+
+
+def record_rollup(department, result):
+    deltas = {}
+    merge_rollup(deltas, department, result.watson_timestamp, result.risk_score, result.label)
+    apply_rollups(deltas)
+
+
+def backfill_rollups(chunk_size=10000):
+    """
+    Rebuild every rollup bucket from burnout_result in one streaming pass.
+
+    Memory is bounded by the number of buckets, not the number of results.
+    Like reconcile_aggregates, run it when writes are quiet.
+
+    Returns:
+        dict: { 'results': int, 'buckets': int }
+    """
+    deltas = {}
+    scanned = 0
+    rows = db.session.execute(
+        db.select(Employee.department, BurnoutResult.watson_timestamp, BurnoutResult.risk_score, BurnoutResult.label)
+        .join(Employee, Employee.id == BurnoutResult.employee_id)
+        .execution_options(yield_per=chunk_size)
+    )
+    for department, timestamp, risk_score, label in rows:
+        merge_rollup(deltas, department, timestamp, risk_score, label)
+        scanned += 1
+
+    db.session.query(DepartmentRiskRollup).delete(synchronize_session=False)
+    now = datetime.utcnow()
+    rows = []
+    for (granularity, start, department), delta in deltas.items():
+        row = {field: 0 for field in ROLLUP_FIELDS}
+        row.update(delta)
+        rows.append(dict(row, granularity=granularity, bucket_start=start, department=department, updated_at=now))
+    for i in range(0, len(rows), chunk_size):
+        db.session.execute(db.insert(DepartmentRiskRollup), rows[i:i + chunk_size])
+    db.session.commit()
+    return {'results': scanned, 'buckets': len(rows)}
+
+
+def _point(start, count, risk_sum, risk_sq_sum, high, medium, low):
+    """Mean and population standard deviation of risk from count / sum / sum of squares"""
+    count = int(count or 0)
+    mean = float(risk_sum) / count if count else None
+    variance = max(float(risk_sq_sum) / count - mean * mean, 0.0) if count else None
+    return {
+        'bucket_start': start.isoformat() if hasattr(start, 'isoformat') else str(start),
+        'count': count,
+        'mean_risk': round(mean, 2) if mean is not None else None,
+        'stddev_risk': round(math.sqrt(variance), 2) if variance is not None else None,
+        'high_count': int(high or 0),
+        'medium_count': int(medium or 0),
+        'low_count': int(low or 0)
+    }
+
+
+def department_trends(granularity, since, until, department=None):
+    """
+    Trend series for [since, until) read only from the rollup table.
+
+    Returns:
+        dict: { 'organisation': [point, ...], 'departments': {name: [point, ...]} },
+        each point carrying count, mean_risk, stddev_risk and label counts.
+    """
+    model = DepartmentRiskRollup
+    in_range = [
+        model.granularity == granularity,
+        model.bucket_start >= bucket_start(since, granularity),
+        model.bucket_start < until,
+    ]
+    if department:
+        in_range.append(model.department == department)
+
+    departments = {}
+    for row in db.session.query(
+        model.department, model.bucket_start, model.result_count, model.risk_sum,
+        model.risk_sq_sum, model.high_count, model.medium_count, model.low_count
+    ).filter(*in_range).order_by(model.department, model.bucket_start):
+        departments.setdefault(row[0], []).append(_point(*row[1:]))
+
+    organisation = [
+        _point(*row) for row in db.session.query(
+            model.bucket_start, db.func.sum(model.result_count), db.func.sum(model.risk_sum),
+            db.func.sum(model.risk_sq_sum), db.func.sum(model.high_count),
+            db.func.sum(model.medium_count), db.func.sum(model.low_count)
+        ).filter(*in_range).group_by(model.bucket_start).order_by(model.bucket_start)
+    ]
+    return {'organisation': organisation, 'departments': departments}
@@ -0,0 +1,295 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/verification_service.py
+# Description: Checks anchored record hashes against the mirror node, caches outcomes and re-verifies in the background
+# License: MIT
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+
+from database import db, each_tenant, AnchorVerification, BurnoutResult
+from services.anchor_queue import SIMULATED_TXID
+from services.hedera_service import anchor_hash_versions, hash_record
+from services.http_cache import bump_data_version
+from services.merkle import verify_proof
+from services.mirror_client import get_mirror_client, parse_topic_txid
+
+logger = logging.getLogger(__name__)
+
+
+def is_simulated_txid(hedera_txid):
+    """Ids produced without touching Hedera never count as verified"""
+    return bool(hedera_txid) and (hedera_txid == SIMULATED_TXID or hedera_txid.startswith('simulate'))
+
+
+class AnchorVerifier:
+    """
+    Verifies that anchored results still match what was written to Hedera.
+
+    For each result the audit hash is recomputed from to_dict() exactly as
+    at anchoring time (hash_record, in the hash_version the message
+    declares; messages without one are checked against the current and
+    the legacy hash) and compared with the anchored message:
+    the record hash for single anchors, or the Merkle root plus the stored
+    inclusion proof for batch anchors. Messages are fetched from the mirror
+    node in batches and the anchored hash is kept in anchor_verification,
+    so later checks of the same anchor only recompute the local hash.
+
+    Statuses: verified | mismatch | not_found | simulated | unverifiable (file anchors) | pending,
+    and error when the mirror node could not be read. An error is never
+    stored: the last recorded outcome is returned unchanged, and the sweep
+    tries again later.
+
+    A background sweep re-verifies rows older than recheck_after and picks
+    up newly anchored results. mirror.fetch_messages(txids) can be replaced
+    with services.mirror_client.StubMirrorClient.
+    """
+
+    def __init__(self, mirror=None, batch_size=None, sweep_interval=None, recheck_after=None):
+        self.mirror = mirror or get_mirror_client()
+        self.batch_size = batch_size or int(os.getenv('VERIFY_BATCH_SIZE', 500))
+        self.sweep_interval = sweep_interval if sweep_interval is not None else float(os.getenv('VERIFY_SWEEP_INTERVAL', 300))
+        self.recheck_after = recheck_after if recheck_after is not None else float(os.getenv('VERIFY_RECHECK_AFTER', 3600))
+
+        self.app = None
+        self._thread = None
+        self._stopping = threading.Event()
+        self._stats = {'checked': 0, 'verified': 0, 'mismatch': 0, 'mirror_lookups': 0, 'lookup_errors': 0, 'sweeps': 0}
+        self._stats_lock = threading.Lock()
+
+    def init_app(self, app, start=True):
+        self.app = app
+        app.extensions['anchor_verifier'] = self
+        if start and self.sweep_interval > 0:
+            self.start()
+
+    # ------------------------------------------------------------------
+    # Verification
+    # ------------------------------------------------------------------
+
+    def verify_ids(self, result_ids, refresh=False):
+        """
+        Verify results by id inside an app context, batch_size at a time.
+
+        Args:
+            refresh (bool): re-read anchored messages even when cached
+        Returns:
+            dict: {result_id: verification dict}; unknown ids are omitted
+        """
+        out = {}
+        result_ids = list(result_ids)
+        for i in range(0, len(result_ids), self.batch_size):
+            out.update(self._verify_batch(result_ids[i:i + self.batch_size], refresh))
+        return out
+
+    def verify_all(self, after_id=0, refresh=False):
+        """Walk every result in id order (auditor bulk check); returns a status -> count summary"""
+        started = time.perf_counter()
+        summary = {}
+        while True:
+            ids = db.session.execute(
+                db.select(BurnoutResult.id).where(BurnoutResult.id > after_id)
+                .order_by(BurnoutResult.id).limit(self.batch_size)
+            ).scalars().all()
+            if not ids:
+                break
+            for item in self._verify_batch(ids, refresh).values():
+                summary[item['status']] = summary.get(item['status'], 0) + 1
+            after_id = ids[-1]
+        summary['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+        return summary
+
+    def _verify_batch(self, result_ids, refresh):
+        results = BurnoutResult.query.options(joinedload(BurnoutResult.employee)) \
+            .filter(BurnoutResult.id.in_(result_ids)).all()
+        cached = {
+            row.result_id: row for row in
+            AnchorVerification.query.filter(AnchorVerification.result_id.in_(result_ids))
+        }
+
+        # Anchored message per transaction: reuse cached anchored hashes, fetch the rest in one batch
+        to_fetch = {
+            r.hedera_txid for r in results
+            if parse_topic_txid(r.hedera_txid) and (
+                refresh or r.id not in cached or cached[r.id].hedera_txid != r.hedera_txid
+                or cached[r.id].anchored_hash is None)
+        }
+        messages = {}
+        if to_fetch:
+            self._count('mirror_lookups')
+            try:
+                messages = self.mirror.fetch_messages(sorted(to_fetch))
+            except Exception as e:
+                logger.warning("Mirror node lookup for %d anchors failed: %s", len(to_fetch), e)
+        # Transactions the mirror node answered for (found or not); the others could not be read
+        fetched = to_fetch & messages.keys()
+        unreadable = to_fetch - fetched
+
+        now = datetime.utcnow()
+        out = {}
+        changed = False
+        for result in results:
+            row = cached.get(result.id)
+            if result.hedera_txid in unreadable:
+                # Keep the last recorded outcome rather than turning it into not_found
+                self._count('lookup_errors')
+                if row is not None and row.hedera_txid == result.hedera_txid:
+                    out[result.id] = self._as_dict(row)
+                else:
+                    out[result.id] = self._lookup_error(result)
+                continue
+            status, record_hash, anchored_hash = self._check(result, row, messages, fetched)
+            changed = changed or row is None or row.status != status or row.hedera_txid != result.hedera_txid
+            if row is None:
+                row = AnchorVerification(result_id=result.id)
+                db.session.add(row)
+            row.hedera_txid = result.hedera_txid
+            row.status = status
+            row.record_hash = record_hash
+            row.anchored_hash = anchored_hash
+            row.checked_at = now
+            if status == 'verified':
+                row.verified_at = now
+            elif row.verified_at is not None:
+                row.verified_at = None  # no longer verified (e.g. tampered or re-anchored)
+            out[result.id] = self._as_dict(row)
+            self._count('checked')
+            if status in ('verified', 'mismatch'):
+                self._count(status)
+
+        if changed:
+            bump_data_version()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # The sweep and a request verified the same new result concurrently; their outcomes agree
+            db.session.rollback()
+        return out
+
+    def _check(self, result, cached, messages, fetched):
+        """(status, record_hash, anchored_hash) for one result"""
+        txid = result.hedera_txid
+        if not txid:
+            return 'pending', None, None
+        if is_simulated_txid(txid):
+            return 'simulated', None, None
+        if not parse_topic_txid(txid):
+            return 'unverifiable', None, None
+
+        record = result.to_dict()
+        proof = json.loads(result.merkle_proof) if result.merkle_proof else None
+
+        if txid in fetched:
+            message = messages.get(txid)
+            if message is None:
+                return 'not_found', hash_record(record), None
+            anchored_hash = message.get('merkle_root') if proof else message.get('hash')
+            versions = anchor_hash_versions(message)
+            if not proof and message.get('record_id') not in (None, result.id):
+                return 'mismatch', hash_record(record, versions[0]), anchored_hash
+        else:
+            anchored_hash = cached.anchored_hash
+            versions = anchor_hash_versions()
+
+        # Records anchored before hash_version existed match the legacy hash
+        for version in versions:
+            record_hash = hash_record(record, version)
+            if proof:
+                ok = anchored_hash == proof.get('root') and verify_proof(record_hash, proof.get('path', []), proof.get('root'))
+            else:
+                ok = anchored_hash == record_hash
+            if ok:
+                return 'verified', record_hash, anchored_hash
+        return 'mismatch', hash_record(record, versions[0]), anchored_hash
+
+    @staticmethod
+    def _lookup_error(result):
+        """Outcome for a never-verified anchor whose message could not be read (not stored)"""
+        return {
+            'result_id': result.id,
+            'hedera_txid': result.hedera_txid,
+            'status': 'error',
+            'verified': False,
+            'record_hash': None,
+            'anchored_hash': None,
+            'checked_at': None
+        }
+
+    @staticmethod
+    def _as_dict(row):
+        return {
+            'result_id': row.result_id,
+            'hedera_txid': row.hedera_txid,
+            'status': row.status,
+            'verified': row.status == 'verified',
+            'record_hash': row.record_hash,
+            'anchored_hash': row.anchored_hash,
+            'checked_at': row.checked_at.isoformat() if row.checked_at else None
+        }
+
+    # ------------------------------------------------------------------
+    # Background re-verification
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if self._thread:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name='anchor-verifier', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=10):
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stopping.wait(self.sweep_interval):
+            for tenant in each_tenant():
+                try:
+                    with self.app.app_context():
+                        self.sweep_once()
+                except Exception as e:
+                    logger.exception("Verification sweep failed (%s): %s", tenant, e)
+
+    def sweep_once(self, limit=None):
+        """
+        Verify the current tenant's anchored results that were never
+        checked, whose anchor changed, or whose last check is older than
+        recheck_after.
+        Must run inside an app context. Returns the number checked.
+        """
+        limit = limit or self.batch_size * 10
+        cutoff = datetime.utcnow() - timedelta(seconds=self.recheck_after)
+        verification = db.aliased(AnchorVerification)
+        stale = db.or_(
+            verification.result_id.is_(None),
+            # NULL-safe: a result first checked as 'pending' (no txid) is re-checked once anchored
+            verification.hedera_txid.is_distinct_from(BurnoutResult.hedera_txid),
+            db.and_(verification.checked_at < cutoff, verification.status.notin_(('simulated', 'unverifiable')))
+        )
+        ids = db.session.execute(
+            db.select(BurnoutResult.id)
+            .outerjoin(verification, verification.result_id == BurnoutResult.id)
+            .where(BurnoutResult.hedera_txid.isnot(None), stale)
+            .order_by(BurnoutResult.id).limit(limit)
+        ).scalars().all()
+        if ids:
+            self.verify_ids(ids)
+        self._count('sweeps')
+        return len(ids)
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def stats(self):
+        with self._stats_lock:
+            return dict(self._stats)
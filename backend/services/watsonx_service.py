@@ -4,26 +4,128 @@
 # Author: Ahmad Yasser (Technical Architecture)
 # License: MIT
 
+import json
+import logging
 import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-def analyze_text_responses(responses):
+from services.cache import LRUCache
+from services.circuit_breaker import CircuitBreaker
+from services.metrics import track_external
+from services.scoring import WEIGHTED_MODEL
+
+logger = logging.getLogger(__name__)
+
+
+class WatsonxClient:
     """
-    Analyze employee survey responses using IBM watsonx.ai
-    
-    Args:
-        responses (dict): Survey responses with keys like work_hours, stress, workload, support
-    
-    Returns:
-        dict: { 'risk': int (0-100), 'label': str ('Low'|'Medium'|'High'|'Urgent') }
+    Pooled, cached client for the watsonx.ai scoring endpoint.
+
+    - one requests.Session with a keep-alive connection pool and
+      retries with backoff on 429/5xx
+    - LRU cache keyed by (model, normalized responses)
+    - concurrent identical requests are coalesced into one HTTP call
+    - a circuit breaker skips the endpoint while it keeps failing
+
+    Endpoint settings come from WATSONX_URL / WATSONX_API_KEY / WATSON_MODEL,
+    so tests can point it at a local HTTP stub server.
     """
-    
-    # Check if Watson API is configured
-    watson_url = os.getenv('WATSONX_URL')
-    watson_key = os.getenv('WATSONX_API_KEY')
-    watson_model = os.getenv('WATSON_MODEL', 'wellmind-burnout-detector')
-    
-    if watson_url and watson_key:
+
+    def __init__(self, pool_size=None, timeout=None, cache_size=None, max_concurrency=None,
+                 failure_threshold=None, reset_timeout=None):
+        self.pool_size = pool_size or int(os.getenv('WATSONX_POOL_SIZE', 10))
+        self.timeout = timeout or float(os.getenv('WATSONX_TIMEOUT', 10))
+        self.max_concurrency = max_concurrency or int(os.getenv('WATSONX_MAX_CONCURRENCY', 8))
+        self.cache = LRUCache(cache_size or int(os.getenv('WATSONX_CACHE_SIZE', 10000)))
+        self.breaker = CircuitBreaker(
+            failure_threshold=failure_threshold or int(os.getenv('WATSONX_BREAKER_THRESHOLD', 5)),
+            reset_timeout=reset_timeout or float(os.getenv('WATSONX_BREAKER_RESET', 30))
+        )
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._in_flight = {}  # cache key -> Future
+        self._in_flight_lock = threading.Lock()
+        self._stats = {'requests': 0, 'errors': 0, 'coalesced': 0, 'short_circuited': 0}
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 502, 503, 504),
+                                  allowed_methods=frozenset(['POST']), raise_on_status=False)
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size,
+                                          max_retries=retry)
+                    session = requests.Session()
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+        return self._session
+
+    def analyze(self, responses):
+        """Score one response dict; falls back to the heuristic when watsonx is unavailable"""
+        watson_url = os.getenv('WATSONX_URL')
+        watson_key = os.getenv('WATSONX_API_KEY')
+        watson_model = os.getenv('WATSON_MODEL', 'wellmind-burnout-detector')
+
+        if not (watson_url and watson_key):
+            return _heuristic_analysis(responses)
+
+        key = (watson_model, _normalize(responses))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return dict(cached)
+
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self._stats['coalesced'] += 1  # guarded by _in_flight_lock
+
+        if not owner:
+            return dict(future.result())
+
+        try:
+            result = self._call(watson_url, watson_key, watson_model, responses)
+            if result is not None:
+                self.cache.set(key, result)
+            else:
+                result = _heuristic_analysis(responses)
+            future.set_result(result)
+            return dict(result)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._in_flight_lock:
+                self._in_flight.pop(key, None)
+
+    def analyze_many(self, responses_list, max_concurrency=None):
+        """
+        Score many response dicts concurrently (bounded by max_concurrency).
+        Results keep the input order.
+        """
+        if not responses_list:
+            return []
+        workers = min(max_concurrency or self.max_concurrency, len(responses_list))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='watsonx') as pool:
+            return list(pool.map(self.analyze, responses_list))
+
+    def _call(self, watson_url, watson_key, watson_model, responses):
+        """One HTTP call; returns None (after recording the failure) when it fails or is short-circuited"""
+        if not self.breaker.allow():
+            self._count('short_circuited')
+            return None
+
+        self._count('requests')
         try:
             headers = {
                 'Authorization': f'Bearer {watson_key}',
@@ -33,53 +135,99 @@ def analyze_text_responses(responses):
                 'inputs': responses,
                 'model': watson_model
             }
-            resp = requests.post(watson_url, json=payload, headers=headers, timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
+            with track_external('watsonx', 'score'):
+                resp = self.session.post(watson_url, json=payload, headers=headers, timeout=self.timeout)
+                resp.raise_for_status()
+                data = resp.json()
             
             # Extract score from watsonx response
             score = round(data.get('score', 0.5) * 100)
             label = _get_risk_label(score)
-            
-            return {'risk': score, 'label': label}
         except Exception as e:
-            print(f"Watson API error: {e}, falling back to heuristic")
+            self._count('errors')
+            self.breaker.record_failure()
+            logger.warning("Watson API error: %s, falling back to heuristic", e)
+            return None
+
+        self.breaker.record_success()
+        return {'risk': score, 'label': label}
+
+    def _count(self, name):
+        with self._in_flight_lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        return dict(
+            self._stats,
+            cache_hits=self.cache.hits,
+            cache_misses=self.cache.misses,
+            cache_size=len(self.cache),
+            breaker_state=self.breaker.state
+        )
+
+    def reset(self):
+        """Forget cached results and breaker state and drop pooled connections"""
+        self.cache.clear()
+        self.breaker.reset()
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+
+
+def _normalize(responses):
+    """Stable cache key: sorted keys, trimmed strings, numeric strings as numbers"""
+    normalized = {}
+    for key, value in (responses or {}).items():
+        if isinstance(value, str):
+            value = value.strip()
+            try:
+                value = int(value)
+            except ValueError:
+                try:
+                    value = float(value)
+                except ValueError:
+                    pass
+        normalized[str(key)] = value
+    return json.dumps(normalized, sort_keys=True, default=str)
+
+
+_client = WatsonxClient()
+
+
+def get_watsonx_client():
+    return _client
+
+
+def analyze_text_responses(responses):
+    """
+    Analyze employee survey responses using IBM watsonx.ai
+    
+    Args:
+        responses (dict): Survey responses with keys like work_hours, stress, workload, support
     
-    # Fallback: Simple heuristic scoring
-    return _heuristic_analysis(responses)
+    Returns:
+        dict: { 'risk': int (0-100), 'label': str ('Low'|'Medium'|'High'|'Urgent') }
+    """
+    return _client.analyze(responses)
+
+
+def analyze_many_responses(responses_list, max_concurrency=None):
+    """
+    Analyze a list of survey responses concurrently; see analyze_text_responses
+    
+    Returns:
+        list[dict]: one result per input, in input order
+    """
+    return _client.analyze_many(responses_list, max_concurrency)
 
 def _heuristic_analysis(responses):
     """
     Fallback burnout risk scoring when watsonx.ai is unavailable
-    Uses weighted scoring of survey responses
+    Uses weighted scoring of survey responses (see services.scoring.WEIGHTED_MODEL)
     """
-    work_hours = int(responses.get('work_hours', 40))
-    stress = int(responses.get('stress', 5))
-    workload = int(responses.get('workload', 5))
-    support = int(responses.get('support', 5))
-    sleep = int(responses.get('sleep', 7))
-    
-    # Weighted scoring formula
-    hours_score = min((work_hours / 40) * 35, 35)
-    stress_score = (stress / 10) * 30
-    workload_score = (workload / 10) * 20
-    support_penalty = max(0, (10 - support) / 10 * 10)
-    sleep_penalty = max(0, (7 - sleep) / 7 * 5)
-    
-    risk = round(hours_score + stress_score + workload_score + support_penalty + sleep_penalty)
-    risk = min(max(risk, 0), 100)  # clamp 0-100
-    
-    label = _get_risk_label(risk)
-    
-    return {'risk': risk, 'label': label}
+    return WEIGHTED_MODEL.score(responses)
 
 def _get_risk_label(score):
     """Map risk score to label"""
-    if score > 80:
-        return 'Urgent'
-    elif score > 60:
-        return 'High'
-    elif score > 40:
-        return 'Medium'
-    else:
-        return 'Low'
+    return WEIGHTED_MODEL.label_for(score)
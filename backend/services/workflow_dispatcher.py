@@ -0,0 +1,234 @@
+# WellMind – VorteX HR Automation
+# File: backend/services/workflow_dispatcher.py
+# Description: Fire-and-forget dispatcher that batches, deduplicates and retries Orchestrate workflow alerts
+# License: MIT
+
+import heapq
+import logging
+import os
+import queue
+import random
+import threading
+import time
+
+from database import db, current_tenant, tenant_context, BurnoutResult
+from services.http_cache import bump_data_version
+from services.orchestrate_service import WorkflowBatchError, trigger_workflow_batch
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowDispatcher:
+    """
+    Sends HR workflow alerts to watsonx Orchestrate off the request path.
+
+    submit() only puts the alert on an in-memory queue. A background thread
+    groups queued alerts into batches (batch_size or flush_interval,
+    whichever comes first), drops repeat alerts for an employee inside
+    dedup_window, retries failed batches with exponential backoff and then
+    writes the final orchestrate_status of the whole batch in one UPDATE:
+
+        triggered | simulated (Orchestrate not configured) | deduplicated | failed
+
+    Records carry the tenant they were submitted in, so statuses are
+    written (and repeat alerts recognised) per tenant. Repeat alerts are
+    recognised from this dispatcher's own sends only: with several worker
+    processes each one deduplicates its own alerts, so an employee can get
+    up to one workflow per worker inside dedup_window.
+
+    Alerts still queued when the process dies, or still retrying when it
+    shuts down, stay 'pending' in the database until the
+    sweep-pending-workflows job (services.maintenance_jobs) picks them up
+    again.
+
+    send_fn(records) -> {'status': ...} can be replaced with a stub.
+    """
+
+    def __init__(self, send_fn=None, batch_size=None, flush_interval=None, dedup_window=None,
+                 max_attempts=None, retry_delay=None, min_risk=None, max_queue=10000):
+        self.send_fn = send_fn or trigger_workflow_batch
+        self.batch_size = batch_size or int(os.getenv('ORCHESTRATE_BATCH_SIZE', 50))
+        self.flush_interval = flush_interval or float(os.getenv('ORCHESTRATE_FLUSH_INTERVAL', 2))
+        self.dedup_window = dedup_window if dedup_window is not None else float(os.getenv('ORCHESTRATE_DEDUP_WINDOW', 3600))
+        self.max_attempts = max_attempts or int(os.getenv('ORCHESTRATE_MAX_ATTEMPTS', 5))
+        self.retry_delay = retry_delay or float(os.getenv('ORCHESTRATE_RETRY_DELAY', 2))
+        self.min_risk = min_risk if min_risk is not None else int(os.getenv('ORCHESTRATE_MIN_RISK', 70))
+
+        self.app = None
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._retries = []  # heap of (due_at, seq, attempts, records)
+        self._seq = 0
+        self._last_sent = {}  # (tenant, employee_id) -> monotonic time of last triggered alert (this process)
+        self._thread = None
+        self._stopping = threading.Event()
+        self._stats = {'submitted': 0, 'dropped': 0, 'batches': 0, 'sent': 0,
+                       'deduplicated': 0, 'retries': 0, 'failed': 0}
+        self._stats_lock = threading.Lock()
+
+    def init_app(self, app, start=True):
+        self.app = app
+        app.extensions['workflow_dispatcher'] = self
+        if start:
+            self.start()
+
+    def should_dispatch(self, risk_score, label):
+        """Only high-risk results start an HR workflow"""
+        return label in ('High', 'Urgent') or (risk_score or 0) >= self.min_risk
+
+    # ------------------------------------------------------------------
+    # Producer side
+    # ------------------------------------------------------------------
+
+    def submit(self, record):
+        """
+        Queue an alert without blocking. record needs id, employee_id,
+        employee_name, risk_score, label and timestamp; it is tagged with
+        the current tenant.
+        """
+        record.setdefault('tenant', current_tenant())
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self._count('dropped')
+            logger.warning("Workflow queue full, result %s left pending", record.get('id'))
+            return False
+        self._count('submitted')
+        return True
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if self._thread:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name='workflow-dispatcher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=10):
+        """Stop after sending whatever is already queued"""
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch:
+                self._dispatch(batch, attempts=0)
+            self._run_due_retries()
+            if self._stopping.is_set() and self._queue.empty():
+                return
+
+    def _collect(self):
+        """Block for the first alert, then gather more until the batch is full or flush_interval passes"""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0 or (self._stopping.is_set() and self._queue.empty()):
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run_due_retries(self):
+        now = time.monotonic()
+        while self._retries and (self._retries[0][0] <= now or self._stopping.is_set()):
+            _, _, attempts, records = heapq.heappop(self._retries)
+            self._dispatch(records, attempts)
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    def _dispatch(self, records, attempts):
+        if attempts == 0:
+            records = self._deduplicate(records)
+            if not records:
+                return
+
+        try:
+            response = self.send_fn(records)
+        except Exception as e:
+            sent = e.sent if isinstance(e, WorkflowBatchError) else []
+            if sent:
+                # Alert-by-alert delivery stopped part-way: only the rest is retried
+                self._delivered(sent, 'triggered')
+                records = records[len(sent):]
+            attempts += 1
+            if attempts >= self.max_attempts:
+                self._count('failed', len(records))
+                logger.error("Workflow batch of %d failed after %d attempts: %s", len(records), attempts, e)
+                self._set_status(records, 'failed')
+            elif self._stopping.is_set():
+                # Cut off by shutdown, not failed: the sweep resubmits them from the database
+                logger.warning("Workflow batch of %d left pending at shutdown: %s", len(records), e)
+            else:
+                self._count('retries')
+                delay = min(300, self.retry_delay * (2 ** (attempts - 1)))
+                self._seq += 1
+                heapq.heappush(self._retries, (time.monotonic() + random.uniform(delay / 2, delay),
+                                               self._seq, attempts, records))
+                logger.warning("Workflow batch of %d failed (attempt %d), retrying: %s", len(records), attempts, e)
+            return
+
+        self._count('batches')
+        self._delivered(records, (response or {}).get('status', 'triggered'))
+        logger.info("Workflow batch of %d alerts dispatched", len(records))
+
+    def _delivered(self, records, status):
+        now = time.monotonic()
+        for record in records:
+            self._last_sent[record['tenant'], record['employee_id']] = now
+        self._count('sent', len(records))
+        self._set_status(records, status)
+
+    def _deduplicate(self, records):
+        """Keep the newest alert per employee and skip employees alerted within dedup_window"""
+        now = time.monotonic()
+        if len(self._last_sent) > 10000:
+            self._last_sent = {k: t for k, t in self._last_sent.items() if now - t < self.dedup_window}
+
+        newest = {}
+        for record in records:
+            newest[record['tenant'], record['employee_id']] = record
+        keep, duplicates = [], [r for r in records if newest[r['tenant'], r['employee_id']] is not r]
+        for key, record in newest.items():
+            last = self._last_sent.get(key)
+            if last is not None and now - last < self.dedup_window:
+                duplicates.append(record)
+            else:
+                keep.append(record)
+
+        if duplicates:
+            self._count('deduplicated', len(duplicates))
+            self._set_status(duplicates, 'deduplicated')
+        return keep
+
+    def _set_status(self, records, status):
+        """Move the records' results out of 'pending' with one UPDATE per tenant"""
+        by_tenant = {}
+        for record in records:
+            by_tenant.setdefault(record['tenant'], []).append(record['id'])
+        for tenant, result_ids in by_tenant.items():
+            try:
+                with tenant_context(tenant), self.app.app_context():
+                    BurnoutResult.query.filter(BurnoutResult.id.in_(result_ids)).update(
+                        {'orchestrate_status': status[:20]}, synchronize_session=False)
+                    bump_data_version()
+                    db.session.commit()
+            except Exception as e:
+                logger.error("Could not update workflow status for %d results of %s: %s", len(result_ids), tenant, e)
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def stats(self):
+        with self._stats_lock:
+            return dict(self._stats, queued=self._queue.qsize(), retry_batches=len(self._retries))
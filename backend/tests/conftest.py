@@ -0,0 +1,65 @@
+# WellMind – VorteX HR Automation
+# File: backend/tests/conftest.py
+# Description: Shared fixtures: an app on a throwaway SQLite database and helpers to add results
+# License: MIT
+
+import itertools
+
+import pytest
+
+from database import db, BurnoutResult, Employee
+from services.mirror_client import StubMirrorClient
+
+_emails = itertools.count(1)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """App with no background threads on a fresh SQLite file, inside an app context"""
+    monkeypatch.setenv('DATABASE_URL', f"sqlite:///{tmp_path / 'wellmind.db'}")
+    import app as app_module
+    from app import create_app, prepare_database
+
+    # Endpoints verify against an in-memory mirror node
+    monkeypatch.setattr(app_module.anchor_verifier, 'mirror', StubMirrorClient())
+    # Data versions restart with every database; never replay another test's bodies
+    app_module.dashboard_cache.invalidate()
+    app_module.response_cache.clear()
+    app = create_app(start_background=False)
+    with app.app_context():
+        prepare_database()
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def mirror(app):
+    """The stub mirror node behind the app's anchor verifier"""
+    from app import anchor_verifier
+    return anchor_verifier.mirror
+
+
+@pytest.fixture
+def add_result(app):
+    """add_result(queue=None, **fields) -> BurnoutResult, committed (and on queue's outbox if given)"""
+    def add(queue=None, **fields):
+        n = next(_emails)
+        employee = Employee(name=f'Employee {n}', email=f'employee{n}@test.local', department='Engineering')
+        db.session.add(employee)
+        db.session.flush()
+        result = BurnoutResult(employee_id=employee.id, **dict(
+            {'risk_score': 80, 'label': 'High', 'work_hours': 60, 'stress_level': 8,
+             'orchestrate_status': 'not_required'}, **fields))
+        db.session.add(result)
+        db.session.flush()
+        if queue is not None:
+            queue.enqueue(result)
+        db.session.commit()
+        return result
+    return add
@@ -0,0 +1,111 @@
+# WellMind – VorteX HR Automation
+# File: backend/tests/test_anchor_queue.py
+# Description: Outbox claiming, leases, retry backoff and the SIMULATED_TX fallback
+# License: MIT
+
+from datetime import datetime, timedelta
+
+from database import db, AnchorOutbox, BurnoutResult
+from services.anchor_queue import AnchorQueue, SIMULATED_TXID
+
+
+def _queue(anchor_fn=None, **kwargs):
+    return AnchorQueue(anchor_fn=anchor_fn or (lambda record: f"tx-{record['id']}"), workers=0,
+                       mode=kwargs.pop('mode', 'single'), **kwargs)
+
+
+def _outbox(result):
+    return AnchorOutbox.query.filter_by(result_id=result.id).one()
+
+
+def _fail(record):
+    raise ConnectionError('network down')
+
+
+def test_drain_anchors_due_rows(add_result):
+    anchored = []
+    queue = _queue(lambda record: anchored.append(record['id']) or f"tx-{record['id']}")
+    results = [add_result(queue) for _ in range(3)]
+
+    assert queue.drain_once() == 3
+    assert anchored == [r.id for r in results]
+    for result in results:
+        assert db.session.get(BurnoutResult, result.id).hedera_txid == f'tx-{result.id}'
+        entry = _outbox(result)
+        assert (entry.status, entry.attempts, entry.last_error) == ('done', 1, None)
+    assert queue.drain_once() == 0
+
+
+def test_claim_is_exclusive_until_the_lease_expires(add_result):
+    queue = _queue(lease_seconds=60)
+    result = add_result(queue)
+    entry_id = _outbox(result).id
+
+    assert queue._claim(10) == [entry_id]
+    # A second worker (or process) finds the row leased
+    assert _queue(lease_seconds=60)._claim(10) == []
+
+    # A worker that died mid-anchor leaves the row 'processing'; once the lease runs out it is claimed again
+    AnchorOutbox.query.filter_by(id=entry_id).update({'updated_at': datetime.utcnow() - timedelta(seconds=61)})
+    db.session.commit()
+    assert _queue(lease_seconds=60)._claim(10) == [entry_id]
+
+
+def test_failure_is_retried_with_backoff(add_result):
+    queue = _queue(_fail, retry_delay=10, max_attempts=5)
+    result = add_result(queue)
+
+    before = datetime.utcnow()
+    assert queue.drain_once() == 1
+    entry = _outbox(result)
+    assert entry.status == 'pending'
+    assert entry.attempts == 1
+    assert entry.last_error == 'network down'
+    # First retry waits between retry_delay / 2 and retry_delay (jitter)
+    assert before + timedelta(seconds=5) <= entry.next_attempt_at <= datetime.utcnow() + timedelta(seconds=10)
+    assert db.session.get(BurnoutResult, result.id).hedera_txid is None
+
+    # Not due yet
+    assert queue.drain_once() == 0
+
+
+def test_backoff_grows_and_is_capped():
+    queue = _queue(retry_delay=2, max_retry_delay=30)
+    for attempts, ceiling in [(1, 2), (2, 4), (3, 8), (4, 16), (5, 30), (10, 30)]:
+        delay = queue._backoff(attempts)
+        assert ceiling / 2 <= delay <= ceiling
+
+
+def test_simulated_txid_after_max_attempts(add_result):
+    queue = _queue(_fail, max_attempts=3)
+    result = add_result(queue)
+
+    for attempt in range(3):
+        AnchorOutbox.query.filter_by(result_id=result.id).update({'next_attempt_at': datetime.utcnow()})
+        db.session.commit()
+        assert queue.drain_once() == 1
+
+    entry = _outbox(result)
+    assert (entry.status, entry.attempts) == ('failed', 3)
+    assert db.session.get(BurnoutResult, result.id).hedera_txid == SIMULATED_TXID
+    assert queue.drain_once() == 0
+
+
+def test_recovers_before_max_attempts(add_result):
+    calls = []
+
+    def flaky(record):
+        calls.append(record['id'])
+        if len(calls) == 1:
+            raise TimeoutError('slow consensus node')
+        return 'tx-ok'
+
+    queue = _queue(flaky, max_attempts=3)
+    result = add_result(queue)
+    queue.drain_once()
+    AnchorOutbox.query.filter_by(result_id=result.id).update({'next_attempt_at': datetime.utcnow()})
+    db.session.commit()
+    queue.drain_once()
+
+    assert db.session.get(BurnoutResult, result.id).hedera_txid == 'tx-ok'
+    assert (_outbox(result).status, _outbox(result).attempts) == ('done', 2)
@@ -0,0 +1,169 @@
+# WellMind – VorteX HR Automation
+# File: backend/tests/test_bulk_ingest.py
+# Description: Chunked NDJSON / CSV survey import, per-row errors and workflow dispatch after each chunk commits
+# License: MIT
+
+import io
+import json
+
+import pytest
+
+from database import db, AnchorOutbox, BurnoutResult, Employee
+from services.bulk_ingest import BulkIngestor, iter_csv, iter_ndjson
+from services.workflow_dispatcher import WorkflowDispatcher
+
+LOW = {'work_hours': 20, 'stress': 1}       # risk 30, Low
+MEDIUM = {'work_hours': 40, 'stress': 2}    # risk 60, Medium
+HIGH = {'work_hours': 55, 'stress': 7}      # High
+
+
+def _survey(n, timestamp=None, **answers):
+    record = dict({'name': f'Employee {n}', 'email': f'bulk{n}@test.local', 'department': 'Engineering'},
+                  **(answers or HIGH))
+    if timestamp:
+        record['timestamp'] = timestamp
+    return record
+
+
+def _ndjson(*lines):
+    return io.StringIO('\n'.join(line if isinstance(line, str) else json.dumps(line) for line in lines) + '\n')
+
+
+class RecordingDispatcher(WorkflowDispatcher):
+    """Dispatcher (min_risk 70) that records submissions and whether their rows were committed by then"""
+
+    def __init__(self, capacity=None):
+        super().__init__(min_risk=70)
+        self.capacity = capacity
+        self.submitted = []
+        self.committed = []
+
+    def submit(self, record):
+        if self.capacity is not None and len(self.submitted) >= self.capacity:
+            return False
+        self.submitted.append(record['id'])
+        # A separate connection only sees committed rows
+        with db.engine.connect() as connection:
+            self.committed.append(connection.execute(
+                db.text('SELECT count(*) FROM burnout_result WHERE id = :id'), {'id': record['id']}).scalar())
+        return True
+
+
+@pytest.fixture
+def dispatcher(app):
+    return RecordingDispatcher()
+
+
+def _status_by_email():
+    rows = db.session.query(Employee.email, BurnoutResult.orchestrate_status, BurnoutResult.orchestrate_requested_at) \
+        .join(BurnoutResult, BurnoutResult.employee_id == Employee.id).order_by(BurnoutResult.id)
+    return [(email, status, requested_at is not None) for email, status, requested_at in rows]
+
+
+def test_ndjson_is_written_in_chunks(app):
+    records = [_survey(n) for n in range(5)] + [_survey(0, timestamp='2026-01-02T09:00:00Z')]
+    summary = BulkIngestor(chunk_size=2).ingest(iter_ndjson(_ndjson(*records)))
+
+    assert (summary['processed'], summary['inserted'], summary['chunks']) == (6, 6, 3)
+    assert summary['employees_created'] == 5
+    assert (summary['failed'], summary['errors']) == (0, [])
+    assert Employee.query.count() == 5
+    assert AnchorOutbox.query.count() == 6
+    # The historical row imported last does not replace the employee's newer latest result
+    employee = Employee.query.filter_by(email='bulk0@test.local').one()
+    first = BurnoutResult.query.filter_by(employee_id=employee.id).order_by(BurnoutResult.id).first()
+    assert employee.latest_result_id == first.id
+
+
+def test_bad_rows_are_reported_by_line(app):
+    stream = _ndjson(
+        _survey(1),
+        '{not json',
+        '[1, 2]',
+        {'name': 'No Email', 'department': 'Engineering'},
+        _survey(2, timestamp='yesterday'),
+        '',
+        _survey(3),
+    )
+    summary = BulkIngestor(chunk_size=3).ingest(iter_ndjson(stream))
+
+    assert (summary['inserted'], summary['failed']) == (2, 4)
+    assert [(e['line'], e['error'].split(':')[0]) for e in summary['errors']] == [
+        (2, 'Invalid JSON'), (3, 'Expected a JSON object'), (4, 'Missing required field'), (5, 'Invalid timestamp')
+    ]
+
+
+def test_error_list_is_capped(app):
+    summary = BulkIngestor(max_errors=2).ingest(iter_ndjson(_ndjson('x', 'y', 'z')))
+    assert summary['failed'] == 3
+    assert len(summary['errors']) == 2 and summary['errors_truncated']
+
+
+def test_csv_rows_use_their_line_numbers(app):
+    stream = io.StringIO(
+        'name,email,department,work_hours,stress\r\n'
+        'Ada,ada@test.local,Engineering,50,6\r\n'
+        'Bob,,Sales,40,3\r\n'
+    )
+    summary = BulkIngestor().ingest(iter_csv(stream))
+    assert summary['inserted'] == 1
+    assert summary['errors'] == [{'line': 3, 'error': 'Missing required field: email'}]
+
+
+# ---------------------------------------------------------------------------
+# Workflow dispatch
+# ---------------------------------------------------------------------------
+
+def test_workflows_are_dispatched_after_their_chunk_commits(dispatcher):
+    records = [_survey(1), _survey(2, **LOW), _survey(3), _survey(4)]
+    summary = BulkIngestor(chunk_size=2, dispatcher=dispatcher).ingest(iter_ndjson(_ndjson(*records)))
+
+    assert summary['workflows_queued'] == 3
+    assert dispatcher.committed == [1, 1, 1]
+    assert _status_by_email() == [
+        ('bulk1@test.local', 'pending', True),
+        ('bulk2@test.local', 'not_required', False),
+        ('bulk3@test.local', 'pending', True),
+        ('bulk4@test.local', 'pending', True),
+    ]
+    pending = BurnoutResult.query.filter_by(orchestrate_status='pending').order_by(BurnoutResult.id)
+    assert dispatcher.submitted == [r.id for r in pending]
+
+
+@pytest.mark.parametrize('alert_dispatch, status', [(True, 'pending'), (False, 'not_required')])
+def test_escalations_below_the_threshold_start_a_workflow(dispatcher, alert_dispatch, status):
+    records = [_survey(1, timestamp='2026-01-01T09:00:00', **LOW), _survey(1, timestamp='2026-01-08T09:00:00', **MEDIUM)]
+    summary = BulkIngestor(dispatcher=dispatcher, alert_dispatch=alert_dispatch).ingest(iter_ndjson(_ndjson(*records)))
+
+    assert summary['alerts'] == 1
+    assert [s for _, s, _ in _status_by_email()] == ['not_required', status]
+    assert summary['workflows_queued'] == (1 if alert_dispatch else 0)
+
+
+def test_full_queue_leaves_the_rest_pending(app):
+    dispatcher = RecordingDispatcher(capacity=1)
+    summary = BulkIngestor(dispatcher=dispatcher).ingest(iter_ndjson(_ndjson(_survey(1), _survey(2))))
+
+    assert summary['workflows_queued'] == 1
+    assert [s for _, s, _ in _status_by_email()] == ['pending', 'pending']
+
+
+def test_without_a_dispatcher_rows_are_left_for_the_sweep(app):
+    summary = BulkIngestor().ingest(iter_ndjson(_ndjson(_survey(1, **LOW))))
+    assert summary['workflows_queued'] == 0
+    assert _status_by_email() == [('bulk1@test.local', 'pending', True)]
+
+
+# ---------------------------------------------------------------------------
+# POST /api/survey/bulk
+# ---------------------------------------------------------------------------
+
+def test_endpoint_reads_ndjson_and_csv(client):
+    body = '\n'.join(json.dumps(_survey(n)) for n in range(3))
+    summary = client.post('/api/survey/bulk', data=body, content_type='application/x-ndjson').get_json()
+    assert (summary['inserted'], summary['failed']) == (3, 0)
+
+    csv_body = 'name,email,department,work_hours,stress\nAda,ada@test.local,Engineering,50,6\n'
+    assert client.post('/api/survey/bulk', data=csv_body, content_type='text/csv').get_json()['inserted'] == 1
+    assert client.post('/api/survey/bulk?format=csv', data=csv_body).get_json()['inserted'] == 1
+    assert Employee.query.count() == 4
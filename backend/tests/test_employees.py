@@ -0,0 +1,143 @@
+# WellMind – VorteX HR Automation
+# File: backend/tests/test_employees.py
+# Description: Keyset paging of /api/employees and the streamed employee history (X-Next-Cursor, bad params)
+# License: MIT
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from database import db, BurnoutResult, Employee
+from services.http_cache import bump_data_version
+
+_START = datetime(2026, 3, 1, 9, 0)
+
+
+def _employees(count, start=0, department='Engineering'):
+    employees = [Employee(name=f'Employee {n}', email=f'paged{n}@test.local', department=department)
+                 for n in range(start, start + count)]
+    db.session.add_all(employees)
+    bump_data_version()
+    db.session.commit()
+    return [e.id for e in employees]
+
+
+def _pages(client, url, cursor=None):
+    """Follow X-Next-Cursor to the end; returns the JSON bodies"""
+    pages = []
+    while True:
+        separator = '&' if '?' in url else '?'
+        response = client.get(url + (f'{separator}cursor={cursor}' if cursor else ''))
+        assert response.status_code == 200
+        pages.append(response.get_json())
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            return pages
+
+
+# ---------------------------------------------------------------------------
+# GET /api/employees
+# ---------------------------------------------------------------------------
+
+def test_pages_follow_the_cursor_to_the_end(client):
+    ids = _employees(5)
+    pages = _pages(client, '/api/employees?limit=2')
+    assert [[e['id'] for e in page] for page in pages] == [ids[:2], ids[2:4], ids[4:]]
+
+
+def test_exact_last_page_has_no_cursor(client):
+    _employees(4)
+    assert 'X-Next-Cursor' in client.get('/api/employees?limit=2').headers
+    assert 'X-Next-Cursor' not in client.get('/api/employees?limit=4').headers
+
+
+def test_cursor_is_stable_across_inserts(client):
+    ids = _employees(4)
+    first = client.get('/api/employees?limit=2')
+    cursor = first.headers['X-Next-Cursor']
+
+    # New employees land after the cursor instead of shifting the pages already read
+    added = _employees(2, start=10)
+    rest = _pages(client, '/api/employees?limit=2', cursor)
+    seen = [e['id'] for e in first.get_json()] + [e['id'] for page in rest for e in page]
+    assert seen == ids + added
+
+
+def test_filters_apply_before_paging(client):
+    engineering = _employees(3)
+    _employees(3, start=10, department='Sales')
+    pages = _pages(client, '/api/employees?limit=2&department=Engineering')
+    assert [e['id'] for page in pages for e in page] == engineering
+
+
+def test_non_integer_limit_is_rejected(client):
+    assert client.get('/api/employees?limit=ten').status_code == 400
+
+
+# ---------------------------------------------------------------------------
+# GET /api/employee/<id>/history
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def history(app):
+    """An employee with six results, two of them sharing a timestamp; returns (employee id, ids newest first)"""
+    employee = Employee(name='Sam', email='sam@test.local', department='Engineering')
+    db.session.add(employee)
+    db.session.flush()
+    days = [0, 1, 2, 2, 3, 4]
+    results = [BurnoutResult(employee_id=employee.id, risk_score=50 + day, label='Medium', work_hours=45,
+                             stress_level=5, watson_timestamp=_START + timedelta(days=day)) for day in days]
+    db.session.add_all(results)
+    bump_data_version()
+    db.session.commit()
+    newest_first = sorted(results, key=lambda r: (r.watson_timestamp, r.id), reverse=True)
+    return employee.id, [r.id for r in newest_first]
+
+
+def _submission_ids(pages):
+    return [s['id'] for page in pages for s in page['submissions']]
+
+
+def test_history_pages_cover_every_submission_once(client, history):
+    employee_id, ids = history
+    pages = _pages(client, f'/api/employee/{employee_id}/history?limit=2')
+    assert len(pages) == 3
+    assert _submission_ids(pages) == ids
+    assert pages[0]['employee']['id'] == employee_id
+
+
+def test_history_cursor_is_stable_across_new_submissions(client, history):
+    employee_id, ids = history
+    first = client.get(f'/api/employee/{employee_id}/history?limit=3')
+    cursor = first.headers['X-Next-Cursor']
+
+    db.session.add(BurnoutResult(employee_id=employee_id, risk_score=90, label='High', work_hours=60,
+                                 stress_level=8, watson_timestamp=_START + timedelta(days=30)))
+    bump_data_version()
+    db.session.commit()
+
+    rest = _pages(client, f'/api/employee/{employee_id}/history?limit=3', cursor)
+    assert _submission_ids([first.get_json()]) + _submission_ids(rest) == ids
+
+
+def test_history_range_is_since_inclusive_until_exclusive(client, history):
+    employee_id, ids = history
+    since, until = (_START + timedelta(days=1)).isoformat(), (_START + timedelta(days=3)).isoformat() + 'Z'
+    body = client.get(f'/api/employee/{employee_id}/history?since={since}&until={until}').get_json()
+    assert [s['id'] for s in body['submissions']] == ids[2:5]
+
+
+@pytest.mark.parametrize('query, error', [
+    ('since=yesterday', 'Invalid timestamp: yesterday'),
+    ('until=2026-13-01', 'Invalid timestamp: 2026-13-01'),
+    ('cursor=not-a-cursor', 'Invalid cursor: not-a-cursor'),
+    ('cursor=2026-03-01T09:00:00,x', 'Invalid cursor: 2026-03-01T09:00:00,x'),
+])
+def test_bad_history_parameters_are_rejected(client, history, query, error):
+    response = client.get(f'/api/employee/{history[0]}/history?{query}')
+    assert response.status_code == 400
+    assert response.get_json() == {'error': error}
+
+
+def test_history_of_an_unknown_employee(client, app):
+    assert client.get('/api/employee/999/history').status_code == 404
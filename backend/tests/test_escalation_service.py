@@ -0,0 +1,85 @@
+# WellMind – VorteX HR Automation
+# File: backend/tests/test_escalation_service.py
+# Description: record_escalation: state steps, stale results, locked reads and the concurrent first insert
+# License: MIT
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql
+
+from database import db, BurnoutResult, EmployeeRiskState, RiskAlert
+from services.escalation_service import record_escalation
+
+_START = datetime(2026, 1, 1, 9, 0)
+
+
+@pytest.fixture
+def employee_id(add_result):
+    return add_result().employee_id
+
+
+def _submit(employee_id, risk_score, label, day):
+    result = BurnoutResult(employee_id=employee_id, risk_score=risk_score, label=label, work_hours=45,
+                           stress_level=5, watson_timestamp=_START + timedelta(days=day))
+    db.session.add(result)
+    db.session.flush()
+    alert = record_escalation(employee_id, result)
+    db.session.commit()
+    return alert
+
+
+def _state(employee_id):
+    db.session.expire_all()
+    return db.session.get(EmployeeRiskState, employee_id)
+
+
+def test_results_advance_the_state_and_raise_alerts(employee_id):
+    assert _submit(employee_id, 20, 'Low', day=1) is None
+    alert = _submit(employee_id, 85, 'High', day=2)
+
+    assert (alert.reason, alert.previous_label, alert.label) == ('label_jump', 'Low', 'High')
+    state = _state(employee_id)
+    assert (state.samples, state.last_label, state.last_risk) == (2, 'High', 85)
+
+
+def test_older_results_do_not_move_the_state(employee_id):
+    _submit(employee_id, 20, 'Low', day=5)
+    assert _submit(employee_id, 90, 'Urgent', day=1) is None
+    assert (_state(employee_id).samples, _state(employee_id).last_label) == (1, 'Low')
+
+
+def test_state_is_read_for_update(employee_id):
+    statements = []
+
+    @event.listens_for(db.session(), 'do_orm_execute')
+    def capture(orm_execute_state):
+        statements.append(str(orm_execute_state.statement.compile(dialect=postgresql.dialect())))
+
+    _submit(employee_id, 20, 'Low', day=1)
+    assert any('employee_risk_state' in sql and 'FOR UPDATE' in sql for sql in statements)
+
+
+def test_concurrent_first_insert_advances_the_winners_state(employee_id, monkeypatch):
+    get = db.session.get
+    raced = []
+
+    def racing_get(entity, ident, **kwargs):
+        # Another submission creates the state between our read and our insert
+        if entity is EmployeeRiskState and not raced:
+            raced.append(ident)
+            db.session.execute(db.insert(EmployeeRiskState), [{
+                'employee_id': ident, 'ewma': 20.0, 'slope': 0.0, 'last_risk': 20, 'last_label': 'Low',
+                'last_result_id': 0, 'last_timestamp': _START, 'samples': 1
+            }])
+            return None
+        return get(entity, ident, **kwargs)
+
+    monkeypatch.setattr(db.session, 'get', racing_get)
+    alert = _submit(employee_id, 85, 'High', day=2)
+
+    assert raced == [employee_id]
+    assert alert is not None and alert.previous_label == 'Low'
+    assert (_state(employee_id).samples, _state(employee_id).last_label) == (2, 'High')
+    assert RiskAlert.query.filter_by(employee_id=employee_id).count() == 1
@@ -0,0 +1,84 @@
+# WellMind – VorteX HR Automation
+# File: backend/tests/test_hedera_service.py
+# Description: HederaClientPool reuse, replacement after failures or max_age, and the max_size limit
+# License: MIT
+
+import itertools
+import threading
+
+import pytest
+
+from services.hedera_service import HederaClientPool
+
+CONFIG = {'network': 'testnet'}
+
+
+class FakeClient:
+    def __init__(self, number):
+        self.number = number
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pool():
+    numbers = itertools.count(1)
+    return lambda **kwargs: HederaClientPool(client_factory=lambda config: FakeClient(next(numbers)), **kwargs)
+
+
+def _use(pool, fail=False):
+    with pool.acquire(CONFIG) as client:
+        if fail:
+            raise ConnectionError('channel reset')
+        return client
+
+
+def test_idle_clients_are_reused(pool):
+    pool = pool(max_size=2)
+    first = _use(pool)
+    assert _use(pool) is first
+    assert (pool.stats()['hits'], pool.stats()['misses']) == (1, 1)
+
+
+def test_failed_client_is_closed_and_older_idle_clients_replaced(pool):
+    pool = pool(max_size=2)
+    with pool.acquire(CONFIG) as older, pool.acquire(CONFIG) as other:
+        pass
+    assert pool.stats()['idle'] == 2
+
+    with pytest.raises(ConnectionError):
+        with pool.acquire(CONFIG) as failing:
+            raise ConnectionError('channel reset')
+    assert failing.closed
+
+    # The remaining idle client predates the failure, so it is not trusted either
+    fresh = _use(pool)
+    assert fresh not in (older, other) and (older.closed or other.closed)
+    assert pool.stats()['stale'] == 1
+    assert _use(pool) is fresh
+
+
+def test_clients_past_max_age_are_replaced(pool):
+    pool = pool(max_age=0.000001)
+    first = _use(pool)
+    second = _use(pool)
+    assert second is not first and first.closed
+    assert pool.stats()['expired'] == 1
+
+
+def test_max_size_limits_clients_in_use(pool):
+    pool = pool(max_size=1, acquire_timeout=0.05)
+    released = threading.Event()
+
+    with pool.acquire(CONFIG):
+        with pytest.raises(TimeoutError):
+            with pool.acquire(CONFIG):
+                pass
+        waiter = threading.Thread(target=lambda: _use(pool) and released.set())
+        pool.acquire_timeout = 5
+        waiter.start()
+    waiter.join(5)
+    assert released.is_set()
+    assert pool.stats()['timeouts'] == 1
@@ -0,0 +1,146 @@
+# WellMind – VorteX HR Automation
+# File: backend/tests/test_http_cache.py
+# Description: TTL / LRU eviction, data-version keyed dashboard cache, ETag revalidation and the response LRU
+# License: MIT
+
+import threading
+import time
+
+import pytest
+
+from database import db
+from services.cache import LRUCache, TTLCache
+from services.http_cache import bump_data_version, current_data_version
+
+
+def _survey(client, email='sam@test.local', **headers):
+    return client.post('/api/survey', headers=headers, json={
+        'name': 'Sam', 'email': email, 'department': 'Engineering', 'work_hours': 50, 'stress': 6
+    })
+
+
+# ---------------------------------------------------------------------------
+# TTLCache / LRUCache
+# ---------------------------------------------------------------------------
+
+def test_ttl_entries_expire_and_are_dropped():
+    cache = TTLCache(ttl=0.05)
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+
+    time.sleep(0.06)
+    assert cache.get('a') is None
+    cache.set('b', 2)
+    # Superseded versioned keys do not pile up
+    assert list(cache._data) == ['b']
+
+
+def test_ttl_get_or_set_computes_once_for_concurrent_callers():
+    cache = TTLCache(ttl=60)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return 'value'
+
+    threads = [threading.Thread(target=cache.get_or_set, args=('key', compute)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 1
+    assert cache.get_or_set('key', compute) == 'value'
+
+
+def test_lru_evicts_the_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)  # evicts b
+
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == (1, None, 3)
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_lru_bounds_total_size():
+    cache = LRUCache(max_entries=10, max_bytes=10)
+    cache.set('a', 'x' * 4)
+    cache.set('b', 'x' * 4)
+    cache.set('c', 'x' * 4)  # 12 bytes: evicts a
+    assert (cache.get('a'), len(cache), cache.size_bytes) == (None, 2, 8)
+
+    cache.set('huge', 'x' * 11)  # never stored
+    assert cache.get('huge') is None and len(cache) == 2
+
+
+# ---------------------------------------------------------------------------
+# Data version and the dashboard cache
+# ---------------------------------------------------------------------------
+
+def test_data_version_counts_writes(app):
+    assert current_data_version() == 0
+    bump_data_version()
+    bump_data_version()
+    db.session.commit()
+    assert current_data_version() == 2
+
+
+def test_dashboard_is_rebuilt_when_the_data_version_moves(client, add_result):
+    assert client.get('/api/dashboard').get_json()['recent_submissions'] == []
+
+    # A write that does not bump the version keeps serving the cached body (within DASHBOARD_CACHE_TTL)
+    add_result()
+    assert client.get('/api/dashboard').get_json()['recent_submissions'] == []
+
+    bump_data_version()
+    db.session.commit()
+    assert len(client.get('/api/dashboard').get_json()['recent_submissions']) == 1
+
+    _survey(client)
+    assert client.get('/api/dashboard').get_json()['summary']['total_surveys'] == 1
+
+
+# ---------------------------------------------------------------------------
+# Conditional GET
+# ---------------------------------------------------------------------------
+
+def test_matching_if_none_match_gets_304(client):
+    first = client.get('/api/dashboard')
+    etag = first.headers['ETag']
+    assert first.headers['Cache-Control'] == 'no-cache'
+
+    revalidated = client.get('/api/dashboard', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.data == b''
+    assert revalidated.headers['ETag'] == etag
+
+
+def test_writes_change_the_etag(client):
+    etag = client.get('/api/dashboard').headers['ETag']
+    _survey(client)
+
+    response = client.get('/api/dashboard', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert response.get_json()['summary']['total_surveys'] == 1
+
+
+@pytest.mark.parametrize('other', ['/api/employees?limit=1', '/api/trends'])
+def test_etags_differ_per_path(client, other):
+    assert client.get('/api/employees').headers['ETag'] != client.get(other).headers['ETag']
+
+
+def test_response_bodies_are_replayed_with_their_cursor(client):
+    from app import response_cache
+    for n in range(3):
+        _survey(client, email=f'sam{n}@test.local')
+
+    first = client.get('/api/employees?limit=2')
+    hits = response_cache.stats()['hits']
+    replayed = client.get('/api/employees?limit=2')
+
+    assert response_cache.stats()['hits'] == hits + 1
+    assert replayed.data == first.data
+    assert replayed.headers['X-Next-Cursor'] == first.headers['X-Next-Cursor']
@@ -0,0 +1,91 @@
+# WellMind – VorteX HR Automation
+# File: backend/tests/test_maintenance_jobs.py
+# Description: sweep-pending-workflows decisions: resubmit, not_required, expired, escalations and legacy rows
+# License: MIT
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from database import db, BurnoutResult, RiskAlert
+from services import maintenance_jobs
+from services.maintenance_jobs import sweep_pending_workflows
+from services.workflow_dispatcher import WorkflowDispatcher
+
+
+@pytest.fixture
+def dispatcher(monkeypatch):
+    """Dispatcher (min_risk 70) that records submitted alerts instead of queueing them"""
+    monkeypatch.setattr(maintenance_jobs, 'JOB_CHUNK_PAUSE', 0)
+    dispatcher = WorkflowDispatcher(min_risk=70)
+    dispatcher.submitted = []
+    dispatcher.submit = lambda record: dispatcher.submitted.append(record['id']) or True
+    return dispatcher
+
+
+def _pending(add_result, requested_ago, risk_score=90, label='High', timestamp_ago=None):
+    now = datetime.utcnow()
+    return add_result(
+        risk_score=risk_score, label=label, orchestrate_status='pending',
+        orchestrate_requested_at=now - requested_ago if requested_ago is not None else None,
+        watson_timestamp=now - (timestamp_ago if timestamp_ago is not None else requested_ago or timedelta(0))
+    )
+
+
+def _status(result):
+    db.session.expire_all()
+    return db.session.get(BurnoutResult, result.id).orchestrate_status
+
+
+def test_lost_alerts_are_resubmitted(add_result, dispatcher):
+    lost = _pending(add_result, timedelta(hours=1))
+    fresh = _pending(add_result, timedelta(minutes=1))
+
+    assert sweep_pending_workflows(dispatcher) == 1
+    assert dispatcher.submitted == [lost.id]
+    assert _status(fresh) == 'pending'
+
+
+def test_low_risk_results_are_not_required(add_result, dispatcher):
+    low = _pending(add_result, timedelta(hours=1), risk_score=30, label='Low')
+
+    sweep_pending_workflows(dispatcher)
+    assert _status(low) == 'not_required'
+    assert dispatcher.submitted == []
+
+
+def test_escalated_results_below_the_threshold_are_resubmitted(add_result, dispatcher):
+    escalated = _pending(add_result, timedelta(hours=1), risk_score=55, label='Medium')
+    db.session.add(RiskAlert(employee_id=escalated.employee_id, result_id=escalated.id, reason='label_jump',
+                             previous_label='Low', label='Medium', risk_score=55))
+    db.session.commit()
+
+    sweep_pending_workflows(dispatcher)
+    assert dispatcher.submitted == [escalated.id]
+    assert _status(escalated) == 'pending'
+
+
+def test_alerts_undelivered_for_max_age_expire(add_result, dispatcher):
+    undelivered = _pending(add_result, timedelta(days=8))
+
+    sweep_pending_workflows(dispatcher)
+    assert _status(undelivered) == 'expired'
+    assert dispatcher.submitted == []
+
+
+def test_historical_bulk_imports_age_from_the_request(add_result, dispatcher):
+    # Surveyed a year ago, imported (and requested) an hour ago
+    imported = _pending(add_result, timedelta(hours=1), timestamp_ago=timedelta(days=365))
+
+    sweep_pending_workflows(dispatcher)
+    assert dispatcher.submitted == [imported.id]
+    assert _status(imported) == 'pending'
+
+
+def test_legacy_rows_are_stamped_and_resubmitted(add_result, dispatcher):
+    legacy = _pending(add_result, None, timestamp_ago=timedelta(days=30))
+
+    sweep_pending_workflows(dispatcher)
+    assert dispatcher.submitted == [legacy.id]
+    db.session.expire_all()
+    assert db.session.get(BurnoutResult, legacy.id).orchestrate_requested_at is not None
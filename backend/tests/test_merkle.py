@@ -0,0 +1,191 @@
+# WellMind – VorteX HR Automation
+# File: backend/tests/test_merkle.py
+# Description: Merkle trees and proofs, batch anchoring, versioned audit hashes and the proof verify endpoint
+# License: MIT
+
+import hashlib
+import json
+
+import pytest
+
+from database import db, AnchorOutbox, BurnoutResult
+from services.anchor_queue import AnchorQueue, SIMULATED_TXID
+from services.hedera_service import (
+    ANCHOR_HASH_VERSION, anchor_hash_versions, build_batch_message, build_record_message, hash_record
+)
+from services.merkle import build_tree, inclusion_proof, merkle_root, verify_proof
+
+
+def _hashes(count):
+    return [hashlib.sha256(str(i).encode()).hexdigest() for i in range(count)]
+
+
+@pytest.mark.parametrize('count', [1, 2, 3, 4, 5, 7, 8, 9, 16, 33])
+def test_every_leaf_proves_inclusion(count):
+    hashes = _hashes(count)
+    levels = build_tree(hashes)
+    root = merkle_root(levels)
+    for index, record_hash in enumerate(hashes):
+        assert verify_proof(record_hash, inclusion_proof(levels, index), root)
+
+
+def test_proof_rejects_other_leaves_and_roots():
+    hashes = _hashes(5)
+    levels = build_tree(hashes)
+    root = merkle_root(levels)
+    proof = inclusion_proof(levels, 2)
+
+    assert not verify_proof(hashes[3], proof, root)
+    assert not verify_proof(hashes[2], proof, merkle_root(build_tree(_hashes(6))))
+    flipped = [dict(step, side='left' if step['side'] == 'right' else 'right') for step in proof]
+    assert not verify_proof(hashes[2], flipped, root)
+
+
+def test_interior_node_is_not_a_leaf():
+    levels = build_tree(_hashes(4))
+    # Domain separation: an interior node presented as a leaf does not verify
+    assert not verify_proof(levels[1][0].hex(), inclusion_proof(levels[1:], 0), merkle_root(levels))
+
+
+def test_malformed_proofs_fail_closed():
+    hashes = _hashes(2)
+    root = merkle_root(build_tree(hashes))
+    assert not verify_proof(hashes[0], [{'side': 'right', 'hash': 'not hex'}], root)
+    assert not verify_proof(hashes[0], [{'side': 'right'}], root)
+    assert not verify_proof('zz', [], root)
+
+
+def test_empty_tree_is_rejected():
+    with pytest.raises(ValueError):
+        build_tree([])
+
+
+# ---------------------------------------------------------------------------
+# Batch anchoring
+# ---------------------------------------------------------------------------
+
+def _batch_queue(anchor_root_fn, **kwargs):
+    return AnchorQueue(workers=0, mode='batch', anchor_root_fn=anchor_root_fn, **kwargs)
+
+
+def _fail(root, record_ids):
+    raise ConnectionError('network down')
+
+
+@pytest.mark.parametrize('count', [1, 2, 5, 8])
+def test_merkle_batch_proofs_verify(add_result, count):
+    roots = []
+
+    def anchor_root(root, record_ids):
+        roots.append((root, record_ids))
+        return 'tx-batch'
+
+    queue = _batch_queue(anchor_root, merkle_batch_size=count)
+    results = [add_result(queue) for _ in range(count)]
+
+    assert queue.drain_once() == count
+    [(root, record_ids)] = roots
+    assert record_ids == [r.id for r in results]
+
+    for index, result in enumerate(results):
+        result = db.session.get(BurnoutResult, result.id)
+        proof = json.loads(result.merkle_proof)
+        assert result.hedera_txid == 'tx-batch'
+        assert (proof['root'], proof['leaf_index'], proof['leaf_count']) == (root, index, count)
+        assert verify_proof(hash_record(result.to_dict()), proof['path'], root)
+
+        tampered = dict(result.to_dict(), risk_score=result.risk_score - 1)
+        assert not verify_proof(hash_record(tampered), proof['path'], root)
+
+
+def test_merkle_batch_waits_for_size_or_window(add_result):
+    queue = _batch_queue(lambda root, ids: 'tx-batch', merkle_batch_size=3, batch_window=3600)
+    for _ in range(2):
+        add_result(queue)
+
+    assert queue.drain_once() == 0
+    # Shutdown / flush ignores the window
+    assert queue.flush() == 2
+
+
+def test_merkle_batch_failure_fails_every_row(add_result):
+    queue = _batch_queue(_fail, merkle_batch_size=2, max_attempts=1)
+    results = [add_result(queue) for _ in range(2)]
+
+    assert queue.drain_once() == 2
+    for result in results:
+        assert AnchorOutbox.query.filter_by(result_id=result.id).one().status == 'failed'
+        assert db.session.get(BurnoutResult, result.id).hedera_txid == SIMULATED_TXID
+        assert db.session.get(BurnoutResult, result.id).merkle_proof is None
+
+
+# ---------------------------------------------------------------------------
+# Audit hash versions
+# ---------------------------------------------------------------------------
+
+def test_current_hash_ignores_anchor_and_workflow_fields(add_result):
+    record = add_result().to_dict()
+    anchored = dict(record, hedera_txid='tx-1', orchestrate_status='triggered')
+
+    assert hash_record(anchored) == hash_record(record)
+    assert hash_record(dict(record, risk_score=record['risk_score'] + 1)) != hash_record(record)
+
+
+def test_legacy_hash_is_the_original_full_record_hash(add_result):
+    record = add_result().to_dict()
+    # The inline anchoring hashed to_dict() right after insert: no txid, workflow still pending
+    original = dict(record, hedera_txid=None, orchestrate_status='pending')
+    expected = hashlib.sha256(json.dumps(original, sort_keys=True).encode()).hexdigest()
+
+    assert hash_record(dict(record, hedera_txid='tx-1', orchestrate_status='triggered'), version=1) == expected
+    assert hash_record(record, version=1) != hash_record(record)
+
+
+def test_messages_declare_their_hash_version(add_result):
+    record = add_result().to_dict()
+    single = json.loads(build_record_message(record))
+    batch = json.loads(build_batch_message('ab' * 32, [1, 2]))
+
+    assert single['hash'] == hash_record(record)
+    assert single['hash_version'] == batch['hash_version'] == ANCHOR_HASH_VERSION
+    assert anchor_hash_versions(single) == (ANCHOR_HASH_VERSION,)
+    # Unversioned (legacy) messages are checked against the current hash, then the original one
+    assert anchor_hash_versions({'hash': 'x'}) == (ANCHOR_HASH_VERSION, 1)
+
+
+# ---------------------------------------------------------------------------
+# GET /api/results/<id>/verify
+# ---------------------------------------------------------------------------
+
+def test_verify_endpoint_checks_the_inclusion_proof(client, add_result):
+    queue = _batch_queue(lambda root, ids: 'tx-batch', merkle_batch_size=3)
+    results = [add_result(queue) for _ in range(3)]
+    queue.drain_once()
+
+    body = client.get(f'/api/results/{results[1].id}/verify').get_json()
+    assert body['mode'] == 'merkle'
+    assert (body['leaf_index'], body['leaf_count']) == (1, 3)
+    assert body['record_hash'] == hash_record(results[1].to_dict())
+    assert body['proof_valid']
+
+    tampered = db.session.get(BurnoutResult, results[1].id)
+    tampered.stress_level = 1
+    db.session.commit()
+    assert not client.get(f'/api/results/{results[1].id}/verify').get_json()['proof_valid']
+
+
+def test_verify_endpoint_reports_the_legacy_hash(client, add_result, mirror):
+    result = add_result(hedera_txid='topic:0.0.4242:0.0.2@1600000000.000000001')
+    legacy = hash_record(result.to_dict(), version=1)
+    message = json.loads(build_record_message(result.to_dict(), legacy))
+    del message['hash_version']
+    mirror.record(result.hedera_txid, message)
+
+    body = client.get(f'/api/results/{result.id}/verify').get_json()
+    assert body['mode'] == 'single'
+    assert body['verified']
+    assert body['record_hash'] == legacy
+
+
+def test_verify_endpoint_unknown_result(client):
+    assert client.get('/api/results/999/verify').status_code == 404
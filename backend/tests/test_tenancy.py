@@ -0,0 +1,140 @@
+# WellMind – VorteX HR Automation
+# File: backend/tests/test_tenancy.py
+# Description: Tenant scoping of queries and writes, per-tenant emails, request resolution and database routing
+# License: MIT
+
+import os
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+import database
+from database import db, tenant_context, ensure_schema, DEFAULT_TENANT, Employee
+from services import tenancy
+from services.tenancy import TenantRouter
+
+OTHER = 'acme'
+
+
+@pytest.fixture
+def tenants(app, monkeypatch):
+    """Serve OTHER next to the default tenant (TENANTS is read at import)"""
+    monkeypatch.setattr(tenancy, 'TENANTS', (DEFAULT_TENANT, OTHER))
+    return tenancy.TENANTS
+
+
+def _employee(tenant, email='sam@test.local', department='Engineering'):
+    with tenant_context(tenant):
+        employee = Employee(name='Sam', email=email, department=department)
+        db.session.add(employee)
+        db.session.commit()
+        return employee.id
+
+
+def _survey(client, tenant, email):
+    return client.post('/api/survey', headers={'X-Tenant-ID': tenant}, json={
+        'name': 'Sam', 'email': email, 'department': 'Engineering', 'work_hours': 50, 'stress': 6
+    })
+
+
+def test_new_rows_take_the_current_tenant(app):
+    _employee(OTHER)
+    row = db.session.execute(db.text('SELECT tenant_id FROM employee')).one()
+    assert row.tenant_id == OTHER
+
+
+def test_queries_only_see_the_current_tenant(app):
+    mine, theirs = _employee(DEFAULT_TENANT), _employee(OTHER, department='Sales')
+    db.session.expire_all()
+
+    with tenant_context(DEFAULT_TENANT):
+        assert [e.id for e in Employee.query.all()] == [mine]
+        assert Employee.query.filter_by(id=theirs).first() is None
+        assert Employee.query.filter_by(department='Sales').count() == 0
+    with tenant_context(OTHER):
+        assert [e.id for e in Employee.query.all()] == [theirs]
+
+
+def test_bulk_updates_and_deletes_stay_in_the_current_tenant(app):
+    _employee(DEFAULT_TENANT)
+    theirs = _employee(OTHER)
+
+    with tenant_context(OTHER):
+        db.session.execute(db.update(Employee).values(department='Finance'))
+        db.session.commit()
+    with tenant_context(DEFAULT_TENANT):
+        db.session.execute(db.delete(Employee))
+        db.session.commit()
+
+    rows = db.session.execute(db.text('SELECT id, department FROM employee')).all()
+    assert [tuple(row) for row in rows] == [(theirs, 'Finance')]
+
+
+def test_emails_are_unique_per_tenant(app):
+    _employee(DEFAULT_TENANT)
+    _employee(OTHER)  # the same person in another business unit
+
+    with pytest.raises(IntegrityError):
+        _employee(OTHER)
+    db.session.rollback()
+
+
+# ---------------------------------------------------------------------------
+# Request resolution
+# ---------------------------------------------------------------------------
+
+def test_requests_are_scoped_by_the_tenant_header(client, tenants):
+    assert _survey(client, OTHER, 'sam@test.local').status_code == 200
+    assert _survey(client, DEFAULT_TENANT, 'sam@test.local').status_code == 200
+    assert _survey(client, OTHER, 'kim@test.local').status_code == 200
+
+    assert len(client.get('/api/employees', headers={'X-Tenant-ID': OTHER}).get_json()) == 2
+    assert len(client.get('/api/employees').get_json()) == 1
+    assert len(client.get(f'/api/employees?tenant={OTHER}').get_json()) == 2
+
+
+def test_unknown_tenant_is_not_found(client, tenants):
+    response = client.get('/api/employees', headers={'X-Tenant-ID': 'globex'})
+    assert response.status_code == 404
+    assert response.get_json() == {'error': 'Unknown tenant: globex'}
+    assert client.get('/api/employees?tenant=globex').status_code == 404
+
+
+# ---------------------------------------------------------------------------
+# TENANT_ISOLATION=database
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def router(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(database, '_tenant_engine', None)
+    router = TenantRouter(sqlite_dir=str(tmp_path / 'tenants'))
+    router.init_app(app)
+    with tenant_context(OTHER):
+        ensure_schema()
+    db.session.remove()
+    yield router
+    db.session.remove()
+    router.dispose()
+
+
+def test_session_routes_each_tenant_to_its_own_database(router, tmp_path):
+    with tenant_context(OTHER):
+        assert db.session.get_bind() is router.engine_for(OTHER)
+    with tenant_context(DEFAULT_TENANT):
+        assert db.session.get_bind() is db.engines[None]
+    assert os.path.exists(tmp_path / 'tenants' / f'{OTHER}.db')
+
+
+def test_tenant_databases_hold_their_own_rows(router):
+    theirs = _employee(OTHER)
+    db.session.remove()
+    mine = _employee(DEFAULT_TENANT)
+    db.session.remove()
+
+    # Ids repeat across tenant databases; each sees only its own row
+    assert mine == theirs
+    with tenant_context(OTHER):
+        assert db.session.execute(db.text('SELECT count(*) FROM employee')).scalar() == 1
+    db.session.remove()
+    with tenant_context(DEFAULT_TENANT):
+        assert db.session.execute(db.text('SELECT count(*) FROM employee')).scalar() == 1
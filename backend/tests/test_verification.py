@@ -0,0 +1,198 @@
+# WellMind – VorteX HR Automation
+# File: backend/tests/test_verification.py
+# Description: AnchorVerifier statuses against an in-memory mirror node
+# License: MIT
+
+import itertools
+import json
+
+import pytest
+
+from database import db, AnchorVerification, BurnoutResult
+from services.anchor_queue import AnchorQueue, SIMULATED_TXID
+from services.hedera_service import build_batch_message, build_record_message, hash_record
+from services.mirror_client import StubMirrorClient
+from services.verification_service import AnchorVerifier
+
+_valid_start = itertools.count(1700000000)
+
+
+def _txid():
+    return f'topic:0.0.4242:0.0.2@{next(_valid_start)}.000000001'
+
+
+class FlakyMirror(StubMirrorClient):
+    """Stub mirror node that can be taken offline"""
+
+    def __init__(self):
+        super().__init__()
+        self.offline = False
+
+    def fetch_messages(self, hedera_txids):
+        if self.offline:
+            raise ConnectionError('mirror node unreachable')
+        return super().fetch_messages(hedera_txids)
+
+
+@pytest.fixture
+def mirror():
+    return FlakyMirror()
+
+
+@pytest.fixture
+def anchor(mirror):
+    """AnchorQueue whose anchors are "published" to the stub mirror node"""
+    def publish(record):
+        txid = _txid()
+        mirror.record(txid, build_record_message(record))
+        return txid
+    return AnchorQueue(anchor_fn=publish, workers=0, mode='single')
+
+
+@pytest.fixture
+def verifier(mirror):
+    return AnchorVerifier(mirror=mirror, sweep_interval=0)
+
+
+def _status(verifier, result, **kwargs):
+    return verifier.verify_ids([result.id], **kwargs)[result.id]['status']
+
+
+def test_anchored_result_verifies(add_result, anchor, verifier):
+    result = add_result(anchor)
+    anchor.drain_once()
+
+    outcome = verifier.verify_ids([result.id])[result.id]
+    assert outcome['status'] == 'verified' and outcome['verified']
+    assert outcome['record_hash'] == outcome['anchored_hash'] == hash_record(result.to_dict())
+
+
+def test_workflow_status_change_keeps_verification(add_result, anchor, verifier):
+    result = add_result(anchor)
+    anchor.drain_once()
+    result.orchestrate_status = 'triggered'
+    db.session.commit()
+
+    assert _status(verifier, result, refresh=True) == 'verified'
+
+
+def test_tampered_result_is_a_mismatch(add_result, anchor, verifier):
+    result = add_result(anchor)
+    anchor.drain_once()
+    assert _status(verifier, result) == 'verified'
+
+    result.risk_score = 10
+    db.session.commit()
+    # The anchored hash is cached: no second mirror lookup is needed to notice
+    lookups = verifier.stats()['mirror_lookups']
+    assert _status(verifier, result) == 'mismatch'
+    assert verifier.stats()['mirror_lookups'] == lookups
+
+
+def test_message_for_another_record_is_a_mismatch(add_result, mirror, verifier):
+    result, other = add_result(), add_result()
+    txid = _txid()
+    mirror.record(txid, build_record_message(other.to_dict()))
+    result.hedera_txid = txid
+    db.session.commit()
+
+    assert _status(verifier, result) == 'mismatch'
+
+
+def test_missing_message_is_not_found(add_result, verifier):
+    result = add_result(hedera_txid=_txid())
+    assert _status(verifier, result) == 'not_found'
+
+
+@pytest.mark.parametrize('txid, status', [
+    (SIMULATED_TXID, 'simulated'),
+    ('simulated-tx-17', 'simulated'),
+    ('file:0.0.5005', 'unverifiable'),
+    (None, 'pending'),
+])
+def test_unanchored_statuses(add_result, verifier, txid, status):
+    result = add_result(hedera_txid=txid)
+    assert _status(verifier, result) == status
+
+
+def test_legacy_anchor_without_hash_version(add_result, mirror, verifier):
+    result = add_result()
+    txid = _txid()
+    message = json.loads(build_record_message(result.to_dict(), hash_record(result.to_dict(), version=1)))
+    del message['hash_version']
+    mirror.record(txid, message)
+    result.hedera_txid = txid
+    db.session.commit()
+
+    assert _status(verifier, result) == 'verified'
+
+
+def test_merkle_batch_anchor_verifies(add_result, mirror, verifier):
+    def anchor_root(root, record_ids):
+        txid = _txid()
+        mirror.record(txid, build_batch_message(root, record_ids))
+        return txid
+
+    queue = AnchorQueue(workers=0, mode='batch', anchor_root_fn=anchor_root, merkle_batch_size=3)
+    results = [add_result(queue) for _ in range(3)]
+    queue.drain_once()
+
+    outcomes = verifier.verify_ids([r.id for r in results])
+    assert {o['status'] for o in outcomes.values()} == {'verified'}
+
+    tampered = db.session.get(BurnoutResult, results[1].id)
+    tampered.label = 'Low'
+    db.session.commit()
+    outcomes = verifier.verify_ids([r.id for r in results], refresh=True)
+    assert [outcomes[r.id]['status'] for r in results] == ['verified', 'mismatch', 'verified']
+
+
+def test_unreachable_mirror_keeps_recorded_outcome(add_result, anchor, mirror, verifier):
+    checked, unchecked = add_result(anchor), add_result(anchor)
+    anchor.drain_once()
+    assert _status(verifier, checked) == 'verified'
+
+    mirror.offline = True
+    outcomes = verifier.verify_ids([checked.id, unchecked.id], refresh=True)
+    assert outcomes[checked.id]['status'] == 'verified'
+    assert outcomes[unchecked.id]['status'] == 'error'
+    # Errors are never stored; the next sweep tries again
+    assert db.session.get(AnchorVerification, unchecked.id) is None
+    assert verifier.stats()['lookup_errors'] == 2
+
+
+def test_sweep_checks_new_and_changed_anchors(add_result, anchor, verifier):
+    results = [add_result(anchor) for _ in range(2)]
+    anchor.drain_once()
+
+    assert verifier.sweep_once() == 2
+    assert verifier.sweep_once() == 0
+
+    results[0].hedera_txid = SIMULATED_TXID
+    db.session.commit()
+    assert verifier.sweep_once() == 1
+    assert db.session.get(AnchorVerification, results[0].id).status == 'simulated'
+
+
+def test_sweep_rechecks_a_pending_result_once_anchored(add_result, anchor, mirror):
+    verifier = AnchorVerifier(mirror=mirror, sweep_interval=0, recheck_after=3600)
+    result = add_result(anchor)
+    assert verifier.sweep_once() == 0  # not anchored yet
+    verifier.verify_ids([result.id])
+    assert db.session.get(AnchorVerification, result.id).status == 'pending'
+
+    anchor.drain_once()
+    assert verifier.sweep_once() == 1
+    assert db.session.get(AnchorVerification, result.id).status == 'verified'
+
+
+def test_mismatch_clears_verified_at(add_result, anchor, verifier):
+    result = add_result(anchor)
+    anchor.drain_once()
+    verifier.verify_ids([result.id])
+    assert db.session.get(AnchorVerification, result.id).verified_at is not None
+
+    result.risk_score = 5
+    db.session.commit()
+    assert _status(verifier, result) == 'mismatch'
+    assert db.session.get(AnchorVerification, result.id).verified_at is None
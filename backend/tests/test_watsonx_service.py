@@ -0,0 +1,208 @@
+# WellMind – VorteX HR Automation
+# File: backend/tests/test_watsonx_service.py
+# Description: WatsonxClient against a local HTTP stub: request coalescing, LRU cache and circuit breaker
+# License: MIT
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from services.scoring import WEIGHTED_MODEL
+from services.watsonx_service import WatsonxClient, _heuristic_analysis
+
+SURVEY = {'work_hours': 55, 'stress': 7, 'workload': 8, 'support': 3}
+
+
+class StubWatsonx(ThreadingHTTPServer):
+    """Scoring endpoint stub: counts requests, can fail or hold responses until released"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.requests = []
+        self.status = 200
+        self.score = 0.82
+        self.release = threading.Event()
+        self.release.set()
+        self._lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_port}/score'
+
+    def hits(self):
+        with self._lock:
+            return len(self.requests)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with self.server._lock:
+            self.server.requests.append(body)
+        self.server.release.wait(5)
+        payload = json.dumps({'score': self.server.score}).encode()
+        self.send_response(self.server.status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    server = StubWatsonx()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    monkeypatch.setenv('WATSONX_URL', server.url)
+    monkeypatch.setenv('WATSONX_API_KEY', 'test-key')
+    monkeypatch.setenv('NO_PROXY', '127.0.0.1')
+    yield server
+    server.release.set()
+    server.shutdown()
+    server.server_close()
+
+
+def _client(**kwargs):
+    return WatsonxClient(timeout=5, **kwargs)
+
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def test_scores_through_the_endpoint(server):
+    assert _client().analyze(SURVEY) == {'risk': 82, 'label': WEIGHTED_MODEL.label_for(82)}
+    assert server.requests[0] == {'inputs': SURVEY, 'model': 'wellmind-burnout-detector'}
+    assert server.hits() == 1
+
+
+def test_concurrent_identical_requests_are_coalesced(server):
+    client = _client()
+    server.release.clear()
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        futures = [pool.submit(client.analyze, dict(SURVEY)) for _ in range(5)]
+        # Hold the one upstream call until every other caller is waiting on it
+        _wait_for(lambda: client.stats()['coalesced'] == 4)
+        server.release.set()
+        results = [f.result(timeout=5) for f in futures]
+
+    assert server.hits() == 1
+    assert all(r == results[0] for r in results)
+    assert results[0]['risk'] == 82
+
+
+def test_different_requests_are_not_coalesced(server):
+    client = _client()
+    surveys = [dict(SURVEY, stress=s) for s in range(1, 6)]
+    results = client.analyze_many(surveys, max_concurrency=5)
+
+    assert len(results) == 5
+    assert server.hits() == 5
+    assert client.stats()['coalesced'] == 0
+
+
+def test_lru_cache_hits_and_evicts(server):
+    client = _client(cache_size=2)
+    a, b, c = (dict(SURVEY, stress=s) for s in (2, 4, 6))
+
+    client.analyze(a)
+    client.analyze(b)
+    # Equivalent after normalization (trimmed numeric string) -> cache hit, and a becomes most recent
+    client.analyze(dict(a, stress=' 2 '))
+    assert server.hits() == 2
+
+    client.analyze(c)  # evicts b
+    client.analyze(a)
+    assert server.hits() == 3
+    client.analyze(b)
+    assert server.hits() == 4
+
+    stats = client.stats()
+    assert (stats['cache_hits'], stats['cache_size']) == (2, 2)
+
+
+def test_cached_results_are_copies(server):
+    client = _client()
+    client.analyze(SURVEY)['risk'] = -1
+    assert client.analyze(SURVEY)['risk'] == 82
+
+
+def test_breaker_opens_then_half_open_trial_closes_it(server):
+    client = _client(failure_threshold=2, reset_timeout=0.3)
+    server.status = 500
+
+    # Failures fall back to the heuristic and are not cached
+    for stress in (1, 2):
+        assert client.analyze(dict(SURVEY, stress=stress)) == _heuristic_analysis(dict(SURVEY, stress=stress))
+    assert client.breaker.state == 'open'
+    assert server.hits() == 2
+
+    # Open: no upstream calls
+    client.analyze(dict(SURVEY, stress=3))
+    assert server.hits() == 2
+    assert client.stats()['short_circuited'] == 1
+
+    # After reset_timeout one trial call goes through; its success closes the breaker
+    _wait_for(lambda: client.breaker.state == 'half-open')
+    server.status = 200
+    assert client.analyze(dict(SURVEY, stress=4))['risk'] == 82
+    assert server.hits() == 3
+    assert client.breaker.state == 'closed'
+
+
+def test_failed_half_open_trial_reopens_the_breaker(server):
+    client = _client(failure_threshold=1, reset_timeout=0.3)
+    server.status = 500
+
+    client.analyze(dict(SURVEY, stress=1))
+    assert client.breaker.state == 'open'
+
+    _wait_for(lambda: client.breaker.state == 'half-open')
+    client.analyze(dict(SURVEY, stress=2))
+    assert server.hits() == 2
+    assert client.breaker.state == 'open'
+
+    client.analyze(dict(SURVEY, stress=3))
+    assert server.hits() == 2
+
+
+def test_half_open_lets_a_single_trial_through(server):
+    client = _client(failure_threshold=1, reset_timeout=0.3)
+    server.status = 500
+    client.analyze(dict(SURVEY, stress=1))
+    _wait_for(lambda: client.breaker.state == 'half-open')
+
+    server.status = 200
+    server.release.clear()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        trial = pool.submit(client.analyze, dict(SURVEY, stress=2))
+        _wait_for(lambda: server.hits() == 2)
+        # Other callers are short-circuited to the heuristic while the trial is in flight
+        others = [pool.submit(client.analyze, dict(SURVEY, stress=s)) for s in (3, 4, 5)]
+        for future, stress in zip(others, (3, 4, 5)):
+            assert future.result(timeout=5) == _heuristic_analysis(dict(SURVEY, stress=stress))
+        server.release.set()
+        assert trial.result(timeout=5)['risk'] == 82
+
+    assert server.hits() == 2
+    assert client.breaker.state == 'closed'
+
+
+def test_heuristic_without_endpoint(monkeypatch):
+    monkeypatch.delenv('WATSONX_URL', raising=False)
+    monkeypatch.delenv('WATSONX_API_KEY', raising=False)
+    client = _client()
+    assert client.analyze(SURVEY) == _heuristic_analysis(SURVEY)
+    assert client.stats()['requests'] == 0
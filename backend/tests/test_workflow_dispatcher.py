@@ -0,0 +1,167 @@
+# WellMind – VorteX HR Automation
+# File: backend/tests/test_workflow_dispatcher.py
+# Description: Orchestrate batch delivery, dispatcher statuses, retries, dedup and shutdown
+# License: MIT
+
+import pytest
+
+from database import db, DEFAULT_TENANT, BurnoutResult
+from services import orchestrate_service
+from services.orchestrate_service import WorkflowBatchError, trigger_workflow_batch
+from services.workflow_dispatcher import WorkflowDispatcher
+
+
+class _Response:
+    def __init__(self, status=200):
+        self.status_code = status
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise ConnectionError(f'HTTP {self.status_code}')
+
+    def json(self):
+        return {'ok': True}
+
+
+class _Session:
+    """Records what the Orchestrate session would post, as (url, json); fail_on fails that request"""
+
+    def __init__(self):
+        self.posts = []
+        self.fail_on = None
+
+    def post(self, url, json=None, **kwargs):
+        self.posts.append((url, json))
+        return _Response(500 if len(self.posts) - 1 == self.fail_on else 200)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    session = _Session()
+    monkeypatch.setattr(orchestrate_service, '_session', session)
+    monkeypatch.setenv('ORCHESTRATE_URL', 'https://orchestrate.test/workflows/burnout')
+    monkeypatch.setenv('ORCHESTRATE_API_KEY', 'test-key')
+    monkeypatch.delenv('ORCHESTRATE_BATCH_URL', raising=False)
+    return session
+
+
+def _record(result_id, employee_id=None, risk_score=90):
+    return {'id': result_id, 'employee_id': employee_id or result_id, 'employee_name': f'Employee {result_id}',
+            'risk_score': risk_score, 'label': 'High', 'timestamp': '2026-01-01T00:00:00', 'tenant': DEFAULT_TENANT}
+
+
+def test_single_alert_payloads_without_a_batch_url(session):
+    response = trigger_workflow_batch([_record(1), _record(2)])
+    posts = session.posts
+
+    assert response['status'] == 'triggered'
+    assert [url for url, _ in posts] == ['https://orchestrate.test/workflows/burnout'] * 2
+    assert [body['employee_id'] for _, body in posts] == [1, 2]
+    assert 'alerts' not in posts[0][1]
+
+
+def test_batch_payload_only_with_a_batch_url(session, monkeypatch):
+    monkeypatch.setenv('ORCHESTRATE_BATCH_URL', 'https://orchestrate.test/workflows/batch')
+    trigger_workflow_batch([_record(1), _record(2)])
+
+    [(url, body)] = session.posts
+    assert url == 'https://orchestrate.test/workflows/batch'
+    assert [alert['employee_id'] for alert in body['alerts']] == [1, 2]
+
+
+def test_partial_delivery_reports_what_was_sent(session):
+    session.fail_on = 1
+    records = [_record(1), _record(2), _record(3)]
+    with pytest.raises(WorkflowBatchError) as info:
+        trigger_workflow_batch(records)
+    assert info.value.sent == records[:1]
+
+
+def test_simulated_without_credentials(monkeypatch):
+    monkeypatch.delenv('ORCHESTRATE_URL', raising=False)
+    monkeypatch.delenv('ORCHESTRATE_BATCH_URL', raising=False)
+    assert trigger_workflow_batch([_record(1)])['status'] == 'simulated'
+
+
+def test_explicit_zero_min_risk_dispatches_everything(monkeypatch):
+    monkeypatch.setenv('ORCHESTRATE_MIN_RISK', '70')
+    assert WorkflowDispatcher(min_risk=0).should_dispatch(0, 'Low')
+    assert not WorkflowDispatcher().should_dispatch(10, 'Low')
+
+
+# ---------------------------------------------------------------------------
+# Dispatcher statuses
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def dispatcher(app):
+    def make(send_fn, **kwargs):
+        dispatcher = WorkflowDispatcher(send_fn=send_fn, retry_delay=0.01, **kwargs)
+        dispatcher.init_app(app, start=False)
+        return dispatcher
+    return make
+
+
+def _pending(add_result, count):
+    return [add_result(orchestrate_status='pending') for _ in range(count)]
+
+
+def _statuses(results):
+    db.session.expire_all()
+    return [db.session.get(BurnoutResult, r.id).orchestrate_status for r in results]
+
+
+def _records(results):
+    return [_record(r.id, r.employee_id) for r in results]
+
+
+def test_delivered_batch_is_triggered(add_result, dispatcher):
+    results = _pending(add_result, 2)
+    dispatcher(lambda records: {'status': 'triggered'})._dispatch(_records(results), attempts=0)
+    assert _statuses(results) == ['triggered', 'triggered']
+
+
+def test_partial_delivery_retries_only_the_rest(add_result, dispatcher):
+    results = _pending(add_result, 3)
+    records = _records(results)
+
+    def send(batch):
+        raise WorkflowBatchError(ConnectionError('reset'), batch[:1])
+
+    d = dispatcher(send)
+    d._dispatch(records, attempts=0)
+    assert _statuses(results) == ['triggered', 'pending', 'pending']
+    [(_, _, attempts, retry)] = d._retries
+    assert (attempts, [r['id'] for r in retry]) == (1, [r.id for r in results[1:]])
+
+
+def test_failed_after_max_attempts(add_result, dispatcher):
+    results = _pending(add_result, 1)
+
+    def send(batch):
+        raise ConnectionError('down')
+
+    d = dispatcher(send, max_attempts=2)
+    d._dispatch(_records(results), attempts=1)
+    assert _statuses(results) == ['failed']
+
+
+def test_batch_cut_off_by_shutdown_stays_pending(add_result, dispatcher):
+    results = _pending(add_result, 2)
+
+    def send(batch):
+        raise ConnectionError('down')
+
+    d = dispatcher(send, max_attempts=5)
+    d._stopping.set()
+    d._dispatch(_records(results), attempts=0)
+    assert _statuses(results) == ['pending', 'pending']
+    assert d._retries == []
+
+
+def test_repeat_alerts_inside_the_window_are_deduplicated(add_result, dispatcher):
+    first, repeat = _pending(add_result, 2)
+    d = dispatcher(lambda records: {'status': 'triggered'}, dedup_window=3600)
+    d._dispatch([_record(first.id, employee_id=7)], attempts=0)
+    d._dispatch([_record(repeat.id, employee_id=7)], attempts=0)
+    assert _statuses([first, repeat]) == ['triggered', 'deduplicated']
@@ -0,0 +1,8 @@
+# WellMind – VorteX HR Automation
+# File: backend/wsgi.py
+# Description: WSGI entry point for multi-worker servers (gunicorn -c gunicorn.conf.py wsgi:app)
+# License: MIT
+
+from app import create_app
+
+app = create_app()
@@ -3,6 +3,8 @@
  * Sends alerts to HR when high stress levels are detected
  */
 
+import { fetchAllEmployees } from './employees';
+
 interface Employee {
   id: string;
   name: string;
@@ -118,17 +120,8 @@ export async function checkAndNotifyHighRiskEmployees(): Promise<{
   try {
     console.log('🔍 Checking employees for automated notifications...');
 
-    // Fetch all employees
-    const response = await fetch('/api/employees', {
-      method: 'GET',
-      cache: 'no-store',
-    });
-
-    if (!response.ok) {
-      throw new Error('Failed to fetch employees');
-    }
-
-    const employees: Employee[] = await response.json();
+    // Fetch all employees, page by page
+    const employees = await fetchAllEmployees<Employee>();
     
     let notified = 0;
     let skipped = 0;
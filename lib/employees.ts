@@ -0,0 +1,26 @@
+// lib/employees.ts
+
+// /api/employees returns one keyset page per request; the cursor for the next one comes back in X-Next-Cursor
+const PAGE_SIZE = 1000
+
+/**
+ * Fetch every employee by following X-Next-Cursor until the last page.
+ * baseUrl is only needed outside the browser (e.g. 'http://localhost:3000' in route handlers).
+ */
+export async function fetchAllEmployees<T = any>(baseUrl: string = ''): Promise<T[]> {
+  const employees: T[] = []
+  let cursor: string | null = null
+  do {
+    const query = new URLSearchParams({ limit: String(PAGE_SIZE) })
+    if (cursor) {
+      query.set('cursor', cursor)
+    }
+    const res = await fetch(`${baseUrl}/api/employees?${query}`, { cache: 'no-store' })
+    if (!res.ok) {
+      throw new Error(`Failed to fetch employees (${res.status})`)
+    }
+    employees.push(...(await res.json()))
+    cursor = res.headers.get('X-Next-Cursor')
+  } while (cursor)
+  return employees
+}